@@ -0,0 +1,232 @@
+"""Benchmarks the rendering paths of the generators on synthetic schemas.
+
+External commands (npx, flutter, curl) are replaced by a no-op, so only the
+Python side of the generation is measured. Example:
+
+    python3 benchmarks/bench_generators.py --entities 50,200 --columns 12
+    python3 benchmarks/bench_generators.py --save-baseline
+    python3 benchmarks/bench_generators.py --compare
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from generators.backend_generator import BackendGenerator
+from generators.frontend_generator import FrontendGenerator
+from generators.mobile_generator import MobileGenerator
+from manifest import GenerationManifest
+from schema import parse_schema
+
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, "benchmarks", "baseline.json")
+COLUMN_TYPES = ["string", "number", "decimal", "boolean", "date", "datetime", "uuid", "json", "enum", "text"]
+MIN_REGRESSION_SECONDS = 0.02
+
+PROJECT_CONFIG = {
+    "app": "app",
+    "name": "bench_app",
+    "backend": "backend",
+    "frontend": "frontend",
+    "backend_package": "com.example.bench",
+    "mobile_app": "bench_mobile",
+}
+
+
+def _synthesize_column(j):
+    column_type = COLUMN_TYPES[j % len(COLUMN_TYPES)]
+    column = {"name": f"field{j}", "type": column_type}
+    if column_type == "enum":
+        column["values"] = ["LOW", "MEDIUM", "HIGH"]
+    elif column_type == "decimal":
+        column.update(precision=12, scale=2)
+    return column
+
+
+def synthesize_entities(entity_count, column_count):
+    """Builds an entities.json-style dict with entity_count entities of column_count columns.
+
+    Entities form a parent/children chain and rotate through cache, keyset pagination and
+    summaries, so every optional rendering path is part of the measurement.
+    """
+    entities = []
+    for i in range(entity_count):
+        columns = [{"name": "id", "type": "number"}]
+        columns.extend(_synthesize_column(j) for j in range(1, column_count))
+        entity = {"name": f"Entity{i}", "columns": columns, "relations": []}
+        if i > 0:
+            entity["relations"].append({"name": "parent", "type": "many-to-one", "target": f"Entity{i - 1}"})
+        if i < entity_count - 1:
+            entity["relations"].append({"name": "children", "type": "one-to-many",
+                                        "target": f"Entity{i + 1}", "mapped_by": "parent"})
+        if i % 4 == 0:
+            entity["cache"] = True
+        if i % 3 == 0:
+            entity["pagination"] = {"keyset": True}
+        if column_count > 2:
+            entity["summary"] = ["field1", "field2"]
+        entities.append(entity)
+    return {"entities": entities}
+
+
+def _render_backend(root_dir, schema):
+    generator = BackendGenerator(root_dir, schema, PROJECT_CONFIG, GenerationManifest(root_dir))
+    generator._generate_entities_and_services(os.path.join(root_dir, PROJECT_CONFIG["backend"]))
+    generator.output.flush()
+
+
+def _render_frontend(root_dir, schema):
+    generator = FrontendGenerator(root_dir, schema, PROJECT_CONFIG, GenerationManifest(root_dir))
+    app_path = os.path.join(root_dir, PROJECT_CONFIG["frontend"], PROJECT_CONFIG["app"])
+    os.makedirs(os.path.join(app_path, "src", "app"), exist_ok=True)
+    generator._generate_app_component(app_path)
+    generator._generate_components(app_path)
+    generator._update_app_config(app_path, schema.entities)
+    generator._generate_translation_files(app_path)
+    generator.output.flush()
+
+
+def _render_mobile(root_dir, schema):
+    generator = MobileGenerator(root_dir, schema, PROJECT_CONFIG, GenerationManifest(root_dir))
+    generator._generate_flutter_files()
+    generator.output.flush()
+
+
+RENDERERS = {
+    "backend": _render_backend,
+    "frontend": _render_frontend,
+    "mobile": _render_mobile,
+}
+
+
+def _tree_stats(path):
+    files = 0
+    size = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            if filename == GenerationManifest.FILE_NAME:
+                continue
+            files += 1
+            size += os.path.getsize(os.path.join(dirpath, filename))
+    return files, size
+
+
+def _render_once(target, schema, trace_memory=False):
+    """Renders one target into a temporary directory; returns (seconds, files, bytes, peak)."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root_dir = os.path.join(tmp_dir, PROJECT_CONFIG["name"])
+        os.makedirs(root_dir)
+
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        with mock.patch("generators.frontend_generator.run_cmd", return_value=""), \
+                mock.patch("generators.mobile_generator.run_cmd", return_value=""), \
+                mock.patch("builtins.print"):
+            RENDERERS[target](root_dir, schema)
+        elapsed = time.perf_counter() - start
+        peak = 0
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        files, size = _tree_stats(root_dir)
+    return elapsed, files, size, peak
+
+
+def run_case(target, entity_count, column_count, repeat=3):
+    """Measures one target; the fastest of `repeat` runs is kept.
+
+    Peak memory comes from a separate run, since tracemalloc slows rendering down.
+    """
+    schema = parse_schema(synthesize_entities(entity_count, column_count))
+    elapsed, files, size, _ = min(_render_once(target, schema) for _ in range(repeat))
+    _, _, _, peak = _render_once(target, schema, trace_memory=True)
+
+    return {
+        "target": target,
+        "entities": entity_count,
+        "columns": column_count,
+        "seconds": round(elapsed, 4),
+        "files": files,
+        "files_per_sec": round(files / elapsed, 1) if elapsed else None,
+        "bytes": size,
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def case_key(result):
+    return f"{result['target']}:{result['entities']}x{result['columns']}"
+
+
+def compare(results, baseline, tolerance):
+    """Returns the cases that got slower than the baseline by more than tolerance."""
+    regressions = []
+    for result in results:
+        previous = baseline.get(case_key(result))
+        if previous is None:
+            continue
+        # The absolute floor keeps millisecond-level jitter on tiny cases from failing the run.
+        limit = max(previous["seconds"] * (1 + tolerance), previous["seconds"] + MIN_REGRESSION_SECONDS)
+        if result["seconds"] > limit:
+            regressions.append((case_key(result), previous["seconds"], result["seconds"]))
+    return regressions
+
+
+def print_report(results):
+    header = f"{'case':<26}{'seconds':>10}{'files':>8}{'files/s':>10}{'bytes':>12}{'peak KB':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{case_key(r):<26}{r['seconds']:>10.4f}{r['files']:>8}{r['files_per_sec']:>10}{r['bytes']:>12}{r['peak_memory_kb']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the generator rendering paths.")
+    parser.add_argument("--entities", default="10,100", help="Comma-separated entity counts.")
+    parser.add_argument("--columns", default="10", help="Comma-separated column counts per entity.")
+    parser.add_argument("--targets", default=",".join(RENDERERS), help="Comma-separated generators to run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the fastest one is kept.")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file.")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, help="Store the results as the baseline.")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="Compare against a stored baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown before a case counts as a regression.")
+    args = parser.parse_args()
+
+    results = []
+    for target in args.targets.split(","):
+        for entity_count in (int(n) for n in args.entities.split(",")):
+            for column_count in (int(n) for n in args.columns.split(",")):
+                results.append(run_case(target, entity_count, column_count, args.repeat))
+
+    print_report(results)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({case_key(r): r for r in results}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for key, before, after in regressions:
+            print(f"REGRESSION {key}: {before:.4f}s -> {after:.4f}s")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import json
+import os
+from utils import run_cmds
+
+# Versions installed by the generators. Pinned so repeated generations resolve the
+# same dependency tree and can be served from a warm cache; override them with
+# "tooling": {"versions": {...}} in project.json.
+PINNED_VERSIONS = {
+    "@angular/cli": "17.3.8",
+    "@angular/animations": "~17.3.0",
+    "@angular/forms": "~17.3.0",
+    "primeng": "17.18.0",
+    "primeicons": "7.0.0",
+    "@ngx-translate/core": "15.0.0",
+    "@ngx-translate/http-loader": "8.0.0",
+    "@ngxs/store": "3.8.2",
+    "@ngxs/logger-plugin": "3.8.2",
+    "@ngxs/devtools-plugin": "3.8.2",
+    "@storybook/angular": "8.1.11",
+    "@storybook/cli": "8.1.11",
+    "@angular-eslint/schematics": "17.5.3",
+    "prettier": "3.3.3",
+    "cypress": "13.13.1",
+    "tailwindcss": "3.4.6",
+    "@compodoc/compodoc": "1.1.25",
+}
+
+
+class ToolBootstrap:
+    """Decides whether the external scaffolding tools need to run, and how.
+
+    Reads the optional "tooling" section of project.json:
+      versions     - overrides for PINNED_VERSIONS
+      npm_cache    - shared npm cache directory (npm_config_cache)
+      pub_cache    - shared Flutter package cache (PUB_CACHE)
+      maven_repo   - shared local Maven repository (maven.repo.local)
+      command_timeout   - seconds before a scaffold/install command is killed
+      storybook_timeout - seconds allowed for `storybook init`
+    The top-level "offline" flag makes npm, pub and Maven use only those caches.
+    """
+
+    def __init__(self, versions=None, npm_cache=None, pub_cache=None, maven_repo=None, offline=False,
+                 command_timeout=1800, storybook_timeout=600):
+        self.versions = dict(PINNED_VERSIONS)
+        self.versions.update(versions or {})
+        self.npm_cache = npm_cache
+        self.pub_cache = pub_cache
+        self.maven_repo = maven_repo
+        self.offline = offline
+        self.command_timeout = command_timeout
+        self.storybook_timeout = storybook_timeout
+
+    @classmethod
+    def from_config(cls, project_config):
+        tooling = project_config.get("tooling", {})
+        return cls(
+            versions=tooling.get("versions"),
+            npm_cache=tooling.get("npm_cache"),
+            pub_cache=tooling.get("pub_cache"),
+            maven_repo=tooling.get("maven_repo"),
+            offline=project_config.get("offline", False),
+            command_timeout=tooling.get("command_timeout", 1800),
+            storybook_timeout=tooling.get("storybook_timeout", 600),
+        )
+
+    def pin(self, package):
+        version = self.versions.get(package)
+        return f"{package}@{version}" if version else package
+
+    def npm_env(self):
+        env = {}
+        if self.npm_cache:
+            env["npm_config_cache"] = os.path.abspath(self.npm_cache)
+        return env
+
+    def npm_flags(self):
+        flags = ["--save-exact", "--no-audit", "--no-fund"]
+        flags.append("--offline" if self.offline else "--prefer-offline")
+        return " ".join(flags)
+
+    def flutter_env(self):
+        env = {}
+        if self.pub_cache:
+            env["PUB_CACHE"] = os.path.abspath(self.pub_cache)
+        return env
+
+    def flutter_flags(self):
+        return "--offline" if self.offline else ""
+
+    def maven_config(self):
+        """Contents for .mvn/maven.config, or None when no Maven options are set."""
+        options = []
+        if self.maven_repo:
+            options.append(f"-Dmaven.repo.local={os.path.abspath(self.maven_repo)}")
+        if self.offline:
+            options.append("--offline")
+        return "\n".join(options) + "\n" if options else None
+
+    def warm_npm_cache(self, limit=4):
+        """Fetches every pinned npm package into the npm cache, several at a time."""
+        commands = [
+            {"cmd": f"npm cache add {self.pin(package)}", "env": self.npm_env(), "timeout": self.command_timeout, "echo": False}
+            for package in self.versions
+        ]
+        results = run_cmds(commands, limit=limit)
+        return [result for result in results if not result.ok]
+
+    def is_angular_scaffolded(self, app_path):
+        return all(os.path.exists(os.path.join(app_path, name)) for name in ("angular.json", "package.json"))
+
+    def is_flutter_scaffolded(self, app_path):
+        return os.path.exists(os.path.join(app_path, "pubspec.yaml"))
+
+    def missing_npm_packages(self, app_path, packages):
+        """Returns the packages not yet declared in package.json and installed in node_modules."""
+        try:
+            with open(os.path.join(app_path, "package.json"), "r") as f:
+                package_json = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return list(packages)
+
+        declared = {}
+        declared.update(package_json.get("dependencies", {}))
+        declared.update(package_json.get("devDependencies", {}))
+
+        missing = []
+        for package in packages:
+            installed = os.path.isdir(os.path.join(app_path, "node_modules", *package.split("/")))
+            pinned = self.versions.get(package, "")
+            # Exact pins are saved verbatim (--save-exact); ranges only need to be present.
+            outdated = pinned[:1].isdigit() and declared.get(package) != pinned
+            if package not in declared or not installed or outdated:
+                missing.append(package)
+        return missing
@@ -1,12 +1,47 @@
-import os
 import json
-from utils import run_cmd
+import os
+from bootstrap import ToolBootstrap
+from instrumentation import timed
+import migrations
+from manifest import GenerationManifest
+from output_tree import OutputTree
+from starter_cache import SpringStarterCache, add_missing_dependencies, set_java_version, write_fallback_skeleton
+
+STARTER_TYPE = "maven-project"
+STARTER_DEPENDENCIES = ["web", "data-jpa", "postgresql", "lombok", "actuator", "prometheus", "flyway"]
+# Not Initializr ids, so they are added to pom.xml after the starter is extracted.
+EXTRA_DEPENDENCIES = ["flyway-postgresql"]
+# Added to pom.xml only when an entity sets "cache".
+CACHE_DEPENDENCIES = ["cache", "caffeine", "caffeine-jcache", "hibernate-jcache"]
+
+# Defaults for the "performance" section of project.json. jdbc_batch_size is also the
+# allocation size of the id sequences, so one sequence call covers a whole batch.
+DEFAULT_PERFORMANCE = {
+    "jdbc_batch_size": 50,
+    "max_batch_items": 1000,
+    "pool_size": 20,
+    "min_idle": 5,
+    "connection_timeout_ms": 30000,
+    "idle_timeout_ms": 600000,
+    "max_lifetime_ms": 1800000,
+    "prepare_threshold": 3,
+    "batch_fetch_size": 32,
+    "export_fetch_size": 500,
+    "virtual_threads": True,
+}
 
 class BackendGenerator:
-    def __init__(self, root_dir, entities_file, project_config):
+    def __init__(self, root_dir, schema, project_config, manifest=None, output=None):
         self.root_dir = root_dir
-        self.entities_file = entities_file
+        self.schema = schema
         self.project_config = project_config
+        self.manifest = manifest or GenerationManifest(root_dir)
+        # Without a shared tree, the generator flushes its own at the end of generate().
+        self.owns_output = output is None
+        self.output = output or OutputTree(root_dir, self.manifest)
+        self.starter_cache = SpringStarterCache.from_config(project_config)
+        self.bootstrap = ToolBootstrap.from_config(project_config)
+        self.performance = {**DEFAULT_PERFORMANCE, **project_config.get("performance", {})}
 
     def generate(self):
         backend_path = os.path.join(self.root_dir, self.project_config["backend"])
@@ -15,113 +50,506 @@ class BackendGenerator:
         # Step 1: Create Spring Boot base structure and configuration
         self._create_basic_structure(backend_path)
         self._generate_application_properties(backend_path)
+        self._generate_cache_config(backend_path)
+        self._generate_web_config(backend_path)
+        self._generate_migrations(backend_path)
+        self._generate_maven_config(backend_path)
 
         # Step 2: Generate entities, repositories, services, and controllers
         self._generate_entities_and_services(backend_path)
 
-    def _create_basic_structure(self, path):
-        """Downloads and unzips the base Spring Boot project."""
-        self._log("Creating Spring Boot base structure...")
-        run_cmd("curl 'https://start.spring.io/starter.zip?type=maven-project&dependencies=web,data-jpa,postgresql,lombok,actuator,prometheus' -o app.zip", cwd=path)
-        run_cmd("unzip app.zip -d .", cwd=path)
-        os.remove(os.path.join(path, "app.zip"))
+        if self.owns_output:
+            self.output.flush()
+
+    def seed_starter_cache(self):
+        """Downloads the Spring starter archive into the local cache for offline use."""
+        self.starter_cache.fetch(STARTER_TYPE, STARTER_DEPENDENCIES)
+        self._log(f"Spring starter cached in {self.starter_cache.cache_dir}")
 
+    @timed("backend.starter")
+    def _create_basic_structure(self, path):
+        """Extracts the base Spring Boot project from the starter cache."""
+        pom_path = os.path.join(path, "pom.xml")
+        if os.path.exists(pom_path):
+            # Re-extracting would reset the starter files and their mtimes on every run.
+            self._log("Spring Boot project already present, skipping the starter.")
+        else:
+            self._log("Creating Spring Boot base structure...")
+            # Only offline mode falls back to the skeleton; a failed download fails the step.
+            archive = self.starter_cache.load(STARTER_TYPE, STARTER_DEPENDENCIES, check=True)
+            if archive is not None:
+                self.starter_cache.extract(archive, path, self.output)
+            else:
+                self._log("Falling back to the bundled Spring Boot skeleton.")
+                write_fallback_skeleton(path, STARTER_DEPENDENCIES, self.output)
+
+        dependencies = STARTER_DEPENDENCIES + EXTRA_DEPENDENCIES
+        if self._cached_entities():
+            dependencies += CACHE_DEPENDENCIES
+        pom_content = self.output.read(pom_path)
+        updated_pom = set_java_version(add_missing_dependencies(pom_content, dependencies))
+        if updated_pom != pom_content:
+            self._log("Updating the dependencies and Java version of pom.xml.")
+            self.output.write(pom_path, updated_pom)
+
+    def _cached_entities(self):
+        return [entity for entity in self.schema.entities if entity.cache]
+
+    @timed("backend.properties")
     def _generate_application_properties(self, path):
-        """Generates the application.properties file for PostgreSQL configuration."""
-        properties_path = os.path.join(path, "src", "main", "resources", "application.properties")
-
-        properties_content = """spring.datasource.url=jdbc:postgresql://localhost:5432/mydatabase
-spring.datasource.username=myuser
-spring.datasource.password=mypassword
-spring.jpa.hibernate.ddl-auto=update
-spring.jpa.show-sql=true
+        """Generates the shared, dev and prod Spring profiles for PostgreSQL."""
+        resources_path = os.path.join(path, "src", "main", "resources")
+        perf = self.performance
+
+        # reWriteBatchedInserts turns the JDBC batches into multi-row INSERTs.
+        datasource_url = (
+            "jdbc:postgresql://${DB_HOST:localhost}:${DB_PORT:5432}/${DB_NAME:mydatabase}"
+            f"?reWriteBatchedInserts=true&prepareThreshold={perf['prepare_threshold']}"
+        )
+
+        properties_content = f"""spring.profiles.default=dev
+# Java 21 virtual threads serve requests, so blocking JDBC calls do not hold platform threads.
+spring.threads.virtual.enabled=${{VIRTUAL_THREADS:{str(perf['virtual_threads']).lower()}}}
+spring.datasource.url={datasource_url}
+spring.datasource.username=${{DB_USER:myuser}}
+spring.datasource.password=${{DB_PASSWORD:mypassword}}
 spring.jpa.properties.hibernate.dialect=org.hibernate.dialect.PostgreSQLDialect
+# The schema is owned by the Flyway migrations in db/migration; Hibernate only checks it.
+spring.jpa.hibernate.ddl-auto=validate
+spring.jpa.properties.hibernate.jdbc.batch_size={perf['jdbc_batch_size']}
+spring.jpa.properties.hibernate.order_inserts=true
+spring.jpa.properties.hibernate.order_updates=true
+"""
+
+        dev_properties_content = """spring.jpa.show-sql=true
+"""
+
+        prod_properties_content = f"""spring.jpa.show-sql=false
+spring.jpa.open-in-view=false
+spring.jpa.properties.hibernate.query.in_clause_parameter_padding=true
+spring.datasource.hikari.pool-name=app-pool
+spring.datasource.hikari.maximum-pool-size={perf['pool_size']}
+spring.datasource.hikari.minimum-idle={perf['min_idle']}
+spring.datasource.hikari.connection-timeout={perf['connection_timeout_ms']}
+spring.datasource.hikari.idle-timeout={perf['idle_timeout_ms']}
+spring.datasource.hikari.max-lifetime={perf['max_lifetime_ms']}
+logging.level.org.hibernate.SQL=WARN
 """
 
-        with open(properties_path, "w") as f:
-            f.write(properties_content)
+        if any(entity.relations for entity in self.schema.entities):
+            # Lazy associations touched outside an @EntityGraph load in IN batches, not one query per row.
+            properties_content += f"""spring.jpa.properties.hibernate.default_batch_fetch_size={perf['batch_fetch_size']}
+"""
 
+        if self._cached_entities():
+            properties_content += """spring.jpa.properties.hibernate.cache.use_second_level_cache=true
+spring.jpa.properties.hibernate.cache.region.factory_class=jcache
+spring.jpa.properties.hibernate.javax.cache.provider=com.github.benmanes.caffeine.jcache.spi.CaffeineCachingProvider
+spring.jpa.properties.hibernate.javax.cache.missing_cache_strategy=create
+spring.jpa.properties.jakarta.persistence.sharedCache.mode=ENABLE_SELECTIVE
+"""
+
+        self.output.write(os.path.join(resources_path, "application.properties"), properties_content)
+        self.output.write(os.path.join(resources_path, "application-dev.properties"), dev_properties_content)
+        self.output.write(os.path.join(resources_path, "application-prod.properties"), prod_properties_content)
+
+    def _service_relations(self, entity, package_name):
+        """Repositories and the applyRelations() helper that resolve a DTO's relation ids.
+
+        Returns the parts for the class body and the call to paste where a DTO is
+        applied to an entity, as a format string taking the DTO variable and indent.
+        """
+        parts = {"imports": "", "fields": "", "method": ""}
+        relations = entity.many_to_one_relations + entity.many_to_many_relations
+        if not relations:
+            return parts, ""
+
+        def repository(relation):
+            return "repository" if relation.target is entity else f"{relation.target.lower}Repository"
+
+        imports = []
+        fields = []
+        for relation in relations:
+            target = relation.target
+            if target is not entity and f"{target.name}Repository" not in imports:
+                imports.append(f"{target.name}Repository")
+                fields.append(f"""
+    @Autowired
+    private {target.name}Repository {target.lower}Repository;
+""")
+        parts["imports"] = "".join(f"import {package_name}.repository.{name};\n" for name in imports)
+        parts["fields"] = "".join(fields)
+
+        lines = []
+        if entity.many_to_one_relations:
+            lines.append("        // getReferenceById returns a proxy without a SELECT; the foreign key checks the id.")
+        for relation in entity.many_to_one_relations:
+            getter = f"dto.get{relation.id_field[0].upper()}{relation.id_field[1:]}()"
+            lines.append(f"        entity.set{relation.capitalized}({getter} != null ? {repository(relation)}.getReferenceById({getter}) : null);")
+        for relation in entity.many_to_many_relations:
+            getter = f"dto.get{relation.id_field[0].upper()}{relation.id_field[1:]}()"
+            lines.append(f"""        if ({getter} != null) {{
+            entity.get{relation.capitalized}().clear();
+            entity.get{relation.capitalized}().addAll({repository(relation)}.findAllById({getter}));
+        }}""")
+        lines_str = "\n".join(lines)
+        parts["method"] = f"""
+    private void applyRelations({entity.name}Dto dto, {entity.name} entity) {{
+{lines_str}
+    }}
+"""
+        return parts, "{indent}applyRelations({dto}, entity);\n"
+
+    def _service_cache_annotations(self, entity):
+        """Spring Cache annotations for the service methods; empty unless the entity sets "cache"."""
+        names = ["imports", "find_all", "find_summaries", "find_by_id", "save", "delete", "batch"]
+        if not entity.cache:
+            return dict.fromkeys(names, "")
+
+        items = f'"{entity.plural}"'
+        pages = f'"{entity.plural}-pages"'
+        return {
+            "imports": "import org.springframework.cache.annotation.*;\n",
+            "find_all": f'    @Cacheable(cacheNames = {pages}, key = "{{#filter, #pageable}}")\n',
+            "find_summaries": f'    @Cacheable(cacheNames = {pages}, key = "{{\'summary\', #filter, #pageable}}")\n',
+            "find_by_id": f'    @Cacheable(cacheNames = {items}, key = "#id", unless = "#result == null")\n',
+            "save": f'    @Caching(put = @CachePut(cacheNames = {items}, key = "#result.id"),\n'
+                    f'            evict = @CacheEvict(cacheNames = {pages}, allEntries = true))\n',
+            "delete": f'    @Caching(evict = {{@CacheEvict(cacheNames = {items}, key = "#id"),\n'
+                      f'            @CacheEvict(cacheNames = {pages}, allEntries = true)}})\n',
+            "batch": f"    @CacheEvict(cacheNames = {{{items}, {pages}}}, allEntries = true)\n",
+        }
+
+    @timed("backend.cache_config")
+    def _generate_cache_config(self, path):
+        """Generates the Caffeine caches of the entities that set "cache"."""
+        cached = self._cached_entities()
+        if not cached:
+            return
+
+        package_name = self.project_config["backend_package"]
+        config_path = os.path.join(path, "src", "main", "java", *package_name.split("."), "config")
+
+        registrations = []
+        region_configs = []
+        for entity in cached:
+            cache = entity.cache
+            # A ttl_seconds of 0 keeps entries until they are evicted by size or by a write.
+            expiry = ""
+            region_expiry = ""
+            if cache["ttl_seconds"]:
+                expiry = f"\n                .expireAfterWrite(Duration.ofSeconds({cache['ttl_seconds']}))"
+                region_expiry = f"\n      eager-expiration.after-write = {cache['ttl_seconds']}s"
+            for cache_name in (entity.plural, f"{entity.plural}-pages"):
+                registrations.append(f"""        cacheManager.registerCustomCache("{cache_name}", Caffeine.newBuilder()
+                .maximumSize({cache["max_size"]}){expiry}
+                .recordStats()
+                .build());""")
+            # Hibernate names the second-level cache region after the entity class.
+            region_configs.append(f"""  "{package_name}.model.{entity.name}" {{
+    policy {{
+      maximum.size = {cache["max_size"]}{region_expiry}
+    }}
+  }}""")
+        registrations_str = "\n".join(registrations)
+        region_configs_str = "\n".join(region_configs)
+
+        self.output.write(os.path.join(config_path, "CacheConfig.java"), f'''
+package {package_name}.config;
+
+import com.github.benmanes.caffeine.cache.Caffeine;
+import org.springframework.cache.CacheManager;
+import org.springframework.cache.annotation.EnableCaching;
+import org.springframework.cache.caffeine.CaffeineCacheManager;
+import org.springframework.context.annotation.Bean;
+import org.springframework.context.annotation.Configuration;
+
+import java.time.Duration;
+
+@Configuration
+@EnableCaching
+public class CacheConfig {{
+
+    @Bean
+    public CacheManager cacheManager() {{
+        CaffeineCacheManager cacheManager = new CaffeineCacheManager();
+        // Every cache is bounded in size and age; caches not listed here use this spec.
+        cacheManager.setCacheSpecification("maximumSize=1000,expireAfterWrite=600s");
+{registrations_str}
+        return cacheManager;
+    }}
+}}
+''')
+
+        # Caffeine's JCache provider (Hibernate second-level cache) reads application.conf.
+        self.output.write(os.path.join(path, "src", "main", "resources", "application.conf"), f"""caffeine.jcache {{
+  default {{
+    policy {{
+      maximum.size = 1000
+      eager-expiration.after-write = 600s
+    }}
+  }}
+{region_configs_str}
+}}
+""")
+
+    @timed("backend.web_config")
+    def _generate_web_config(self, path):
+        """Registers a shallow ETag filter so unchanged API responses are answered with 304."""
+        package_name = self.project_config["backend_package"]
+        config_path = os.path.join(path, "src", "main", "java", *package_name.split("."), "config")
+
+        self.output.write(os.path.join(config_path, "WebConfig.java"), f'''
+package {package_name}.config;
+
+import org.springframework.boot.web.servlet.FilterRegistrationBean;
+import org.springframework.context.annotation.Bean;
+import org.springframework.context.annotation.Configuration;
+import org.springframework.web.filter.ShallowEtagHeaderFilter;
+
+@Configuration
+public class WebConfig {{
+
+    // Hashes the response body into an ETag; responses that already carry one are left alone.
+    @Bean
+    public FilterRegistrationBean<ShallowEtagHeaderFilter> etagFilter() {{
+        FilterRegistrationBean<ShallowEtagHeaderFilter> registration = new FilterRegistrationBean<>(new ShallowEtagHeaderFilter());
+        registration.addUrlPatterns("/api/*");
+        return registration;
+    }}
+}}
+''')
+
+    @timed("backend.migrations")
+    def _generate_migrations(self, path):
+        """Writes a Flyway migration for the schema changes since the previous generation."""
+        current = migrations.build_snapshot(self.schema, self.performance["jdbc_batch_size"])
+        previous = migrations.load_snapshot(self.output, path)
+        statements = migrations.plan_migration(previous, current)
+        if not statements:
+            self._log("Database schema unchanged, no new migration.")
+            return
+
+        migration_path = os.path.join(path, migrations.MIGRATION_DIR)
+        version = migrations.next_version(migration_path)
+        description = "update_schema" if previous["tables"] else "initial_schema"
+        migration_file = os.path.join(migration_path, f"V{version}__{description}.sql")
+        self._log(f"Writing migration {os.path.basename(migration_file)}")
+
+        self.output.write(migration_file, "\n\n".join(statements) + "\n")
+        self.output.write(os.path.join(path, migrations.SNAPSHOT_FILE), json.dumps(current, indent=2, sort_keys=True))
+
+    @timed("backend.maven_config")
+    def _generate_maven_config(self, path):
+        """Points Maven at the shared local repository and offline mode, if configured."""
+        maven_config = self.bootstrap.maven_config()
+        if maven_config is None:
+            return
+
+        mvn_path = os.path.join(path, ".mvn")
+        self.output.write(os.path.join(mvn_path, "maven.config"), maven_config)
+
+    @timed("backend.entities")
     def _generate_entities_and_services(self, path):
         """Genera entità JPA, repository, controller, e service da entities.json"""
-        with open(self.entities_file, "r") as f:
-            entities = json.load(f)["entities"]
-
         src_path = os.path.join(path, "src", "main", "java", *self.project_config["backend_package"].split("."))
-        os.makedirs(src_path, exist_ok=True)
 
-        for entity in entities:
-            entity_name = entity["name"]
-            entity_name_lower = entity_name.lower()
+        if any(entity.keyset for entity in self.schema.entities):
+            self._generate_cursor_page(src_path)
+        self._generate_projection_queries(src_path)
+        self._generate_export_writer(src_path)
+
+        context = self.manifest.render_context(self.project_config, __file__, migrations.__file__)
+        for entity in self.schema.entities:
+            entity_name = entity.name
+            entity_name_lower = entity.lower
+
+            fingerprint = self.manifest.fingerprint(entity.raw, context)
+            if self.manifest.is_entity_current("backend", entity_name, fingerprint):
+                self._log(f"{entity_name} unchanged, skipping.")
+                continue
 
-            # Generate Entity, DTO, and Mapper
-            self._generate_entity(entity, src_path, entity_name, entity_name_lower)
-            self._generate_dto(entity, src_path, entity_name)
-            self._generate_mapper(entity, src_path, entity_name)
+            with self.manifest.rendering("backend", entity_name, fingerprint):
+                # Generate Entity, DTO, and Mapper
+                for col in entity.columns:
+                    if col.type == "enum":
+                        self._generate_enum(col, src_path)
+                self._generate_entity(entity, src_path, entity_name, entity_name_lower)
+                self._generate_dto(entity, src_path, entity_name)
+                if entity.summary is not None:
+                    self._generate_summary(entity, src_path, entity_name)
+                self._generate_filter(entity, src_path, entity_name)
+                self._generate_mapper(entity, src_path, entity_name)
 
-            # Generate Repository
-            self._generate_repository(entity, src_path, entity_name, entity_name_lower)
+                # Generate Repository
+                self._generate_repository(entity, src_path, entity_name, entity_name_lower)
 
-            # Creazione Service
-            self._generate_service(entity, src_path, entity_name, entity_name_lower)
+                # Creazione Service
+                self._generate_service(entity, src_path, entity_name, entity_name_lower)
 
-            # Creazione Controller
-            self._generate_controller(entity, src_path, entity_name, entity_name_lower)
+                # Creazione Controller
+                self._generate_controller(entity, src_path, entity_name, entity_name_lower)
 
     def _generate_entity(self, entity, src_path, entity_name, entity_name_lower):
         """Generates a JPA Entity class for the given entity."""
         entity_path = os.path.join(src_path, "model")
-        os.makedirs(entity_path, exist_ok=True)
 
         entity_fields = []
-        for col in entity["columns"]:
-            if col['name'].lower() == 'id':
+        hibernate_imports = ""
+        for col in entity.columns:
+            if col.is_id:
                 continue
-            java_type = self._map_type(col['type'])
-            entity_fields.append(f"    private {java_type} {col['name']};")
+            entity_fields.append(f"{self._column_annotations(col)}    private {col.java_type} {col.name};")
+            if col.type == "json" or col.is_pg_enum:
+                hibernate_imports = "import org.hibernate.annotations.JdbcTypeCode;\nimport org.hibernate.type.SqlTypes;\n"
+        java_imports = {col.java_import for col in entity.columns if col.java_import and not col.is_id}
+
+        relation_imports = ""
+        to_string_import = ""
+        if entity.relations:
+            relation_imports = "import lombok.EqualsAndHashCode;\n"
+            to_string_import = "import lombok.ToString;\n"
+            relation_fields = "\n\n".join(self._relation_field(relation) for relation in entity.relations)
+            entity_fields.append("\n    // Associations are lazy; the mappers only read ids and the repository's "
+                                 f"@EntityGraph finders fetch collections.\n{relation_fields}")
+        if any(relation.type != "many-to-one" for relation in entity.relations):
+            java_imports.update(("java.util.HashSet", "java.util.Set"))
+        java_imports_str = self._java_imports(java_imports)
 
         entity_fields_str = "\n".join(entity_fields)
 
-        with open(os.path.join(entity_path, f"{entity_name}.java"), "w") as f:
-            f.write(f"""
+        table_args = f'name = "{entity.table}"'
+        if entity.indexes:
+            index_lines = []
+            for index in entity.indexes:
+                unique = ", unique = true" if index.unique else ""
+                index_lines.append(f'        @Index(name = "{index.name}", columnList = "{", ".join(index.columns)}"{unique})')
+            index_lines_str = ",\n".join(index_lines)
+            table_args += f", indexes = {{\n{index_lines_str}\n}}"
+
+        cache_imports = ""
+        cache_annotations = ""
+        if entity.cache:
+            cache_imports = """import org.hibernate.annotations.Cache;
+import org.hibernate.annotations.CacheConcurrencyStrategy;
+"""
+            cache_annotations = """@Cacheable
+@Cache(usage = CacheConcurrencyStrategy.READ_WRITE)
+"""
+
+        self.output.write(os.path.join(entity_path, f"{entity_name}.java"), f"""
 package {self.project_config["backend_package"]}.model;
 
 import jakarta.persistence.*;
 import lombok.AllArgsConstructor;
 import lombok.Data;
-import lombok.NoArgsConstructor;
-
+{relation_imports}import lombok.NoArgsConstructor;
+{to_string_import}{cache_imports}{hibernate_imports}{java_imports_str}
 @Data
 @NoArgsConstructor
 @AllArgsConstructor
 @Entity
-@Table(name = "{entity_name_lower}s")
-public class {entity_name} {{
+@Table({table_args})
+{cache_annotations}public class {entity_name} {{
+    // A pooled sequence (not IDENTITY) lets Hibernate batch inserts.
     @Id
-    @GeneratedValue(strategy = GenerationType.IDENTITY)
+    @GeneratedValue(strategy = GenerationType.SEQUENCE, generator = "{entity_name_lower}_seq")
+    @SequenceGenerator(name = "{entity_name_lower}_seq", sequenceName = "{entity_name_lower}s_seq", allocationSize = {self.performance["jdbc_batch_size"]})
     private Long id;
 
+    // Bumped on every update; used for optimistic locking and as the ETag of GET /{{id}}.
+    @Version
+    private Long version;
+
 {entity_fields_str}
 }}
 """)
 
+    def _column_annotations(self, col):
+        if col.type == "decimal":
+            return f"    @Column(precision = {col.precision}, scale = {col.scale})\n"
+        if col.type == "json":
+            return "    @JdbcTypeCode(SqlTypes.JSON)\n"
+        if col.is_pg_enum:
+            return f"""    @Enumerated(EnumType.STRING)
+    @JdbcTypeCode(SqlTypes.NAMED_ENUM)
+    @Column(columnDefinition = "{col.sql_type}")
+"""
+        if col.type == "enum":
+            return "    @Enumerated(EnumType.ORDINAL)\n"
+        return ""
+
+    def _enum_imports(self, columns):
+        package_name = self.project_config["backend_package"]
+        names = sorted(col.java_type for col in columns if col.type == "enum")
+        return "".join(f"import {package_name}.model.{name};\n" for name in names)
+
+    @staticmethod
+    def _java_imports(names):
+        """Renders java.* imports as the trailing import block of a class."""
+        if not names:
+            return ""
+        return "\n" + "".join(f"import {name};\n" for name in sorted(names))
+
+    def _generate_enum(self, col, src_path):
+        """Generates the Java enum of an enum column."""
+        comment = ""
+        if col.enum_storage == "ordinal":
+            comment = "// Stored as the ordinal: append new values, never reorder or remove them.\n"
+        values = ",\n".join(f"    {value}" for value in col.enum_values)
+
+        self.output.write(os.path.join(src_path, "model", f"{col.java_type}.java"), f"""
+package {self.project_config["backend_package"]}.model;
+
+{comment}public enum {col.java_type} {{
+{values}
+}}
+""")
+
+    def _relation_field(self, relation):
+        target = relation.target.name
+        if relation.type == "many-to-one":
+            annotations = f"""    @ManyToOne(fetch = FetchType.LAZY)
+    @JoinColumn(name = "{relation.join_column}")"""
+            declaration = f"private {target} {relation.name};"
+        elif relation.type == "one-to-many":
+            annotations = f'    @OneToMany(mappedBy = "{relation.mapped_by}")'
+            declaration = f"private Set<{target}> {relation.name} = new HashSet<>();"
+        else:
+            annotations = f"""    @ManyToMany
+    @JoinTable(name = "{relation.join_table}",
+            joinColumns = @JoinColumn(name = "{relation.owner_column}"),
+            inverseJoinColumns = @JoinColumn(name = "{relation.inverse_column}"))"""
+            declaration = f"private Set<{target}> {relation.name} = new HashSet<>();"
+        # Lombok's toString/equals would otherwise walk into the lazy association (and back).
+        return f"""{annotations}
+    @ToString.Exclude
+    @EqualsAndHashCode.Exclude
+    {declaration}"""
+
     def _generate_dto(self, entity, src_path, entity_name):
         """Generates a DTO class for the given entity."""
         dto_path = os.path.join(src_path, "dto")
-        os.makedirs(dto_path, exist_ok=True)
 
         dto_fields = []
-        for col in entity["columns"]:
-            java_type = self._map_type(col['type'])
-            dto_fields.append(f"    private {java_type} {col['name']};")
+        for col in entity.columns:
+            dto_fields.append(f"    private {col.java_type} {col.name};")
+        dto_fields.append("    private Long version;")
+        for relation in entity.many_to_one_relations:
+            dto_fields.append(f"    private Long {relation.id_field};")
+        for relation in entity.many_to_many_relations:
+            dto_fields.append(f"    private List<Long> {relation.id_field};")
 
         dto_fields_str = "\n".join(dto_fields)
+        java_imports = {col.java_import for col in entity.columns if col.java_import}
+        if entity.many_to_many_relations:
+            java_imports.add("java.util.List")
 
-        with open(os.path.join(dto_path, f"{entity_name}Dto.java"), "w") as f:
-            f.write(f'''
+        self.output.write(os.path.join(dto_path, f"{entity_name}Dto.java"), f'''
 package {self.project_config["backend_package"]}.dto;
 
-import lombok.Data;
-
+{self._enum_imports(entity.columns)}import lombok.Data;
+{self._java_imports(java_imports)}
 @Data
 public class {entity_name}Dto {{
 {dto_fields_str}
@@ -131,27 +559,48 @@ public class {entity_name}Dto {{
     def _generate_mapper(self, entity, src_path, entity_name):
         """Generates a Mapper class for the given entity and its DTO."""
         mapper_path = os.path.join(src_path, "mapper")
-        os.makedirs(mapper_path, exist_ok=True)
 
         package_name = self.project_config["backend_package"]
 
         to_dto_mappings = []
         to_entity_mappings = []
-        for col in entity["columns"]:
-            col_name = col["name"]
-            cap_col_name = col_name[0].upper() + col_name[1:]
+        update_mappings = []
+        for col in entity.columns:
+            cap_col_name = col.capitalized
             to_dto_mappings.append(f"        dto.set{cap_col_name}(entity.get{cap_col_name}());")
             to_entity_mappings.append(f"        entity.set{cap_col_name}(dto.get{cap_col_name}());")
+            if not col.is_id:
+                update_mappings.append(f"        entity.set{cap_col_name}(dto.get{cap_col_name}());")
+        to_dto_mappings.append("        dto.setVersion(entity.getVersion());")
+        to_entity_mappings.append("        entity.setVersion(dto.getVersion());")
+        # The service resolves the associations of incoming DTOs; the mapper never touches lazy state.
+        relation_imports = []
+        if entity.many_to_one_relations:
+            to_dto_mappings.append("        // getId() on a lazy proxy does not load the referenced row.")
+        for relation in entity.many_to_one_relations:
+            getter = f"entity.get{relation.capitalized}()"
+            to_dto_mappings.append(f"        dto.set{relation.id_field[0].upper()}{relation.id_field[1:]}({getter} != null ? {getter}.getId() : null);")
+        for relation in entity.many_to_many_relations:
+            getter = f"entity.get{relation.capitalized}()"
+            target = relation.target.name
+            if target != entity_name:
+                relation_imports.append(f"import {package_name}.model.{target};")
+            to_dto_mappings.append(f"""        if (Hibernate.isInitialized({getter})) {{
+            dto.set{relation.id_field[0].upper()}{relation.id_field[1:]}({getter}.stream().map({target}::getId).collect(Collectors.toList()));
+        }}""")
+        if entity.many_to_many_relations:
+            relation_imports.append("import org.hibernate.Hibernate;\n\nimport java.util.stream.Collectors;")
+        relation_imports_str = "".join(f"\n{line}" for line in dict.fromkeys(relation_imports))
 
         to_dto_mappings_str = "\n".join(to_dto_mappings)
         to_entity_mappings_str = "\n".join(to_entity_mappings)
+        update_mappings_str = "\n".join(update_mappings)
 
-        with open(os.path.join(mapper_path, f"{entity_name}Mapper.java"), "w") as f:
-            f.write(f'''
+        self.output.write(os.path.join(mapper_path, f"{entity_name}Mapper.java"), f'''
 package {package_name}.mapper;
 
 import {package_name}.dto.{entity_name}Dto;
-import {package_name}.model.{entity_name};
+import {package_name}.model.{entity_name};{relation_imports_str}
 
 public class {entity_name}Mapper {{
 
@@ -174,97 +623,660 @@ public class {entity_name}Mapper {{
 {to_entity_mappings_str}
         return entity;
     }}
+
+    public static void updateEntity({entity_name}Dto dto, {entity_name} entity) {{
+{update_mappings_str}
+    }}
 }}
 ''')
 
     def _generate_repository(self, entity, src_path, entity_name, entity_name_lower):
         """Genera un repository JPA per l'entità"""
         repo_path = os.path.join(src_path, "repository")
-        os.makedirs(repo_path, exist_ok=True)
 
-        with open(os.path.join(repo_path, f"{entity_name}Repository.java"), "w") as f:
-            f.write(f"""
+        keyset_imports = ""
+        keyset_methods = ""
+        if entity.keyset:
+            keyset_imports = """import org.springframework.data.domain.Pageable;
+import org.springframework.data.domain.Slice;
+"""
+            keyset_methods = f"""
+    // Keyset pagination: a Slice skips the count query, and the id index serves the range scan.
+    Slice<{entity_name}> findByIdGreaterThan(Long id, Pageable pageable);
+"""
+
+        graph_import = ""
+        java_imports = {"java.util.stream.Stream"}
+        graph_methods = ""
+        if entity.many_to_many_relations:
+            paths = ", ".join(f'"{relation.name}"' for relation in entity.many_to_many_relations)
+            graph_import = "import org.springframework.data.jpa.repository.EntityGraph;\n"
+            java_imports.update(("java.util.Collection", "java.util.List", "java.util.Optional"))
+            graph_methods = f"""
+    // Fetch the collections in the same query, so mapping the ids does not issue one query per row.
+    @EntityGraph(attributePaths = {{{paths}}})
+    Optional<{entity_name}> findWithRelationsById(Long id);
+
+    @EntityGraph(attributePaths = {{{paths}}})
+    List<{entity_name}> findWithRelationsByIdIn(Collection<Long> ids);
+"""
+
+        # The second-level cache would otherwise take in every exported row.
+        cache_mode_hint = ""
+        if entity.cache:
+            cache_mode_hint = ',\n            @QueryHint(name = HibernateHints.HINT_CACHE_MODE, value = "IGNORE")'
+
+        self.output.write(os.path.join(repo_path, f"{entity_name}Repository.java"), f"""
 package {self.project_config["backend_package"]}.repository;
 
 import {self.project_config["backend_package"]}.model.{entity_name};
-import org.springframework.data.jpa.repository.JpaRepository;
+import jakarta.persistence.QueryHint;
+import org.hibernate.jpa.HibernateHints;
+{keyset_imports}{graph_import}import org.springframework.data.jpa.repository.JpaRepository;
+import org.springframework.data.jpa.repository.JpaSpecificationExecutor;
+import org.springframework.data.jpa.repository.QueryHints;
 import org.springframework.stereotype.Repository;
-
+{self._java_imports(java_imports)}
 @Repository
-public interface {entity_name}Repository extends JpaRepository<{entity_name}, Long> {{
+public interface {entity_name}Repository extends JpaRepository<{entity_name}, Long>, JpaSpecificationExecutor<{entity_name}> {{{keyset_methods}{graph_methods}
+    // Inside a transaction the PostgreSQL driver reads the rows through a cursor, fetch size rows at a time.
+    @QueryHints({{
+            @QueryHint(name = HibernateHints.HINT_FETCH_SIZE, value = "{self.performance['export_fetch_size']}"),
+            @QueryHint(name = HibernateHints.HINT_READ_ONLY, value = "true"){cache_mode_hint}
+    }})
+    Stream<{entity_name}> streamAllByOrderByIdAsc();
 }}
 """)
 
+    def _generate_filter(self, entity, src_path, entity_name):
+        """Generates the query-parameter filter of the entity's list endpoint."""
+        dto_path = os.path.join(src_path, "dto")
+
+        filter_fields = []
+        date_format_import = ""
+        for col in entity.filterable_columns:
+            # Query parameters are bound as ISO-8601 strings.
+            if col.type in ("date", "datetime"):
+                iso = "DATE" if col.type == "date" else "DATE_TIME"
+                filter_fields.append(f"    @DateTimeFormat(iso = DateTimeFormat.ISO.{iso})")
+                date_format_import = "import org.springframework.format.annotation.DateTimeFormat;\n"
+            filter_fields.append(f"    private {col.java_type} {col.name};")
+        filter_fields.extend(f"    private Long {relation.id_field};" for relation in entity.many_to_one_relations)
+        filter_fields = "\n".join(filter_fields)
+        java_imports = {col.java_import for col in entity.filterable_columns if col.java_import}
+
+        self.output.write(os.path.join(dto_path, f"{entity_name}Filter.java"), f'''
+package {self.project_config["backend_package"]}.dto;
+
+{self._enum_imports(entity.filterable_columns)}import lombok.Data;
+{date_format_import}{self._java_imports(java_imports)}
+@Data
+public class {entity_name}Filter {{
+{filter_fields}
+}}
+''')
+
+    def _generate_cursor_page(self, src_path):
+        """Generates the response type of the keyset pagination endpoints."""
+        dto_path = os.path.join(src_path, "dto")
+
+        self.output.write(os.path.join(dto_path, "CursorPage.java"), f'''
+package {self.project_config["backend_package"]}.dto;
+
+import java.util.List;
+
+public record CursorPage<T>(List<T> items, Long nextCursor) {{
+}}
+''')
+
+    def _generate_summary(self, entity, src_path, entity_name):
+        """Generates the record returned by the entity's /summary endpoint."""
+        dto_path = os.path.join(src_path, "dto")
+
+        components = ", ".join(["Long id"] + [f"{col.java_type} {col.name}" for col in entity.summary])
+        java_imports = {col.java_import for col in entity.summary if col.java_import}
+        enum_imports = self._enum_imports(entity.summary)
+        if enum_imports:
+            enum_imports = "\n" + enum_imports
+
+        self.output.write(os.path.join(dto_path, f"{entity_name}Summary.java"), f'''
+package {self.project_config["backend_package"]}.dto;
+{enum_imports}{self._java_imports(java_imports)}
+public record {entity_name}Summary({components}) {{
+}}
+''')
+
+    def _generate_projection_queries(self, src_path):
+        """Generates the helper that runs list queries selecting only some columns."""
+        repo_path = os.path.join(src_path, "repository")
+
+        self.output.write(os.path.join(repo_path, "ProjectionQueries.java"), f'''
+package {self.project_config["backend_package"]}.repository;
+
+import jakarta.persistence.EntityManager;
+import jakarta.persistence.PersistenceContext;
+import jakarta.persistence.Tuple;
+import jakarta.persistence.criteria.CriteriaBuilder;
+import jakarta.persistence.criteria.CriteriaQuery;
+import jakarta.persistence.criteria.Predicate;
+import jakarta.persistence.criteria.Root;
+import jakarta.persistence.criteria.Selection;
+import org.springframework.data.domain.Page;
+import org.springframework.data.domain.Pageable;
+import org.springframework.data.jpa.domain.Specification;
+import org.springframework.data.jpa.repository.query.QueryUtils;
+import org.springframework.data.support.PageableExecutionUtils;
+import org.springframework.stereotype.Repository;
+
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * List queries that select only the requested columns. The rows are records or maps,
+ * not managed entities, so Hibernate neither loads the other columns nor tracks them.
+ */
+@Repository
+public class ProjectionQueries {{
+    @PersistenceContext
+    private EntityManager entityManager;
+
+    public <E, R> Page<R> findAs(Class<E> entityType, Class<R> projection, List<String> fields,
+                                 Specification<E> spec, Pageable pageable) {{
+        CriteriaQuery<R> query = entityManager.getCriteriaBuilder().createQuery(projection);
+        Root<E> root = query.from(entityType);
+        query.select(entityManager.getCriteriaBuilder().construct(projection, select(root, fields)));
+        return page(entityType, query, root, spec, pageable);
+    }}
+
+    public <E> Page<Map<String, Object>> findFields(Class<E> entityType, List<String> fields,
+                                                    Specification<E> spec, Pageable pageable) {{
+        CriteriaQuery<Tuple> query = entityManager.getCriteriaBuilder().createTupleQuery();
+        Root<E> root = query.from(entityType);
+        query.multiselect(select(root, fields));
+        return page(entityType, query, root, spec, pageable).map(tuple -> {{
+            Map<String, Object> row = new LinkedHashMap<>();
+            for (String field : fields) {{
+                row.put(field, tuple.get(field));
+            }}
+            return row;
+        }});
+    }}
+
+    private <E, R> Page<R> page(Class<E> entityType, CriteriaQuery<R> query, Root<E> root,
+                                Specification<E> spec, Pageable pageable) {{
+        CriteriaBuilder cb = entityManager.getCriteriaBuilder();
+        Predicate predicate = spec.toPredicate(root, query, cb);
+        if (predicate != null) {{
+            query.where(predicate);
+        }}
+        query.orderBy(QueryUtils.toOrders(pageable.getSort(), root, cb));
+        List<R> content = entityManager.createQuery(query)
+                .setFirstResult((int) pageable.getOffset())
+                .setMaxResults(pageable.getPageSize())
+                .getResultList();
+        return PageableExecutionUtils.getPage(content, pageable, () -> count(entityType, spec));
+    }}
+
+    private <E> long count(Class<E> entityType, Specification<E> spec) {{
+        CriteriaBuilder cb = entityManager.getCriteriaBuilder();
+        CriteriaQuery<Long> query = cb.createQuery(Long.class);
+        Root<E> root = query.from(entityType);
+        query.select(cb.count(root));
+        Predicate predicate = spec.toPredicate(root, query, cb);
+        if (predicate != null) {{
+            query.where(predicate);
+        }}
+        return entityManager.createQuery(query).getSingleResult();
+    }}
+
+    private static Selection<?>[] select(Root<?> root, List<String> fields) {{
+        return fields.stream()
+                .map(field -> root.get(field).alias(field))
+                .toArray(Selection<?>[]::new);
+    }}
+}}
+''')
+
+    def _generate_export_writer(self, src_path):
+        """Generates the NDJSON/CSV writer behind the /export endpoints."""
+        service_path = os.path.join(src_path, "service")
+
+        self.output.write(os.path.join(service_path, "ExportWriter.java"), f'''
+package {self.project_config["backend_package"]}.service;
+
+import com.fasterxml.jackson.core.JsonProcessingException;
+import com.fasterxml.jackson.core.type.TypeReference;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import org.springframework.http.HttpStatus;
+import org.springframework.web.server.ResponseStatusException;
+
+import java.io.BufferedWriter;
+import java.io.IOException;
+import java.io.OutputStream;
+import java.io.OutputStreamWriter;
+import java.io.Writer;
+import java.nio.charset.StandardCharsets;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * Writes exported rows one at a time to the response stream, as NDJSON (one JSON
+ * object per line) or CSV. Nothing but the current row is held in memory.
+ */
+public class ExportWriter {{
+    private static final TypeReference<Map<String, Object>> ROW = new TypeReference<>() {{}};
+
+    public enum Format {{
+        NDJSON("application/x-ndjson", "ndjson"),
+        CSV("text/csv; charset=UTF-8", "csv");
+
+        private final String contentType;
+        private final String extension;
+
+        Format(String contentType, String extension) {{
+            this.contentType = contentType;
+            this.extension = extension;
+        }}
+
+        public String getContentType() {{
+            return contentType;
+        }}
+
+        public String getExtension() {{
+            return extension;
+        }}
+
+        public static Format of(String name) {{
+            for (Format format : values()) {{
+                if (format.extension.equalsIgnoreCase(name)) {{
+                    return format;
+                }}
+            }}
+            throw new ResponseStatusException(HttpStatus.BAD_REQUEST, "Cannot export as " + name);
+        }}
+    }}
+
+    private final Writer writer;
+    private final Format format;
+    private final ObjectMapper mapper;
+    private final List<String> fields;
+
+    public ExportWriter(OutputStream out, Format format, ObjectMapper mapper, List<String> fields) {{
+        this.writer = new BufferedWriter(new OutputStreamWriter(out, StandardCharsets.UTF_8));
+        this.format = format;
+        this.mapper = mapper;
+        this.fields = fields;
+    }}
+
+    public void writeHeader() throws IOException {{
+        if (format == Format.CSV) {{
+            writer.write(String.join(",", fields));
+            writer.write("\\n");
+        }}
+    }}
+
+    public void write(Object row) throws IOException {{
+        if (format == Format.NDJSON) {{
+            writer.write(mapper.writeValueAsString(row));
+        }} else {{
+            Map<String, Object> values = mapper.convertValue(row, ROW);
+            for (int i = 0; i < fields.size(); i++) {{
+                if (i > 0) {{
+                    writer.write(',');
+                }}
+                writer.write(csvValue(values.get(fields.get(i))));
+            }}
+        }}
+        writer.write("\\n");
+    }}
+
+    public void flush() throws IOException {{
+        writer.flush();
+    }}
+
+    private String csvValue(Object value) throws JsonProcessingException {{
+        if (value == null) {{
+            return "";
+        }}
+        String text = value instanceof String || value instanceof Number || value instanceof Boolean
+                ? value.toString()
+                : mapper.writeValueAsString(value);
+        if (text.contains(",") || text.contains("\\"") || text.contains("\\n") || text.contains("\\r")) {{
+            return "\\"" + text.replace("\\"", "\\"\\"") + "\\"";
+        }}
+        return text;
+    }}
+}}
+''')
+
     def _generate_service(self, entity, src_path, entity_name, entity_name_lower):
         """Generates a service class for the entity."""
         service_path = os.path.join(src_path, "service")
-        os.makedirs(service_path, exist_ok=True)
 
         package_name = self.project_config["backend_package"]
         mapper_name = f"{entity_name}Mapper"
 
-        with open(os.path.join(service_path, f"{entity_name}Service.java"), "w") as f:
-            f.write(f'''
+        sortable = ", ".join(f'"{col.name}"' for col in entity.sortable_columns)
+
+        filter_specs = []
+        for col in entity.filterable_columns:
+            getter = f"filter.get{col.capitalized}()"
+            if col.java_type == "String":
+                predicate = f'cb.like(cb.lower(root.get("{col.name}")), "%" + {getter}.toLowerCase() + "%")'
+            else:
+                predicate = f'cb.equal(root.get("{col.name}"), {getter})'
+            filter_specs.append(f"""        if ({getter} != null) {{
+            specs.add((root, query, cb) -> {predicate});
+        }}""")
+        for relation in entity.many_to_one_relations:
+            getter = f"filter.get{relation.id_field[0].upper()}{relation.id_field[1:]}()"
+            filter_specs.append(f"""        if ({getter} != null) {{
+            specs.add((root, query, cb) -> cb.equal(root.get("{relation.name}").get("id"), {getter}));
+        }}""")
+        filter_specs_str = "\n".join(filter_specs)
+
+        find_one = "findWithRelationsById" if entity.many_to_many_relations else "findById"
+        find_many = "findWithRelationsByIdIn" if entity.many_to_many_relations else "findAllById"
+        relation_repositories, apply_relations = self._service_relations(entity, package_name)
+
+        cursor_import = ""
+        slice_import = ""
+        keyset_methods = ""
+        if entity.keyset:
+            cursor_import = f"import {package_name}.dto.CursorPage;\n"
+            slice_import = "import org.springframework.data.domain.Slice;\n"
+            keyset_methods = f"""
+    public CursorPage<{entity_name}Dto> scroll(Long after, int size) {{
+        Slice<{entity_name}> slice = repository.findByIdGreaterThan(
+                after != null ? after : Long.MIN_VALUE,
+                PageRequest.of(0, clampSize(size), Sort.by("id")));
+        List<{entity_name}Dto> items = slice.map({mapper_name}::toDto).getContent();
+        Long nextCursor = slice.hasNext() ? items.get(items.size() - 1).getId() : null;
+        return new CursorPage<>(items, nextCursor);
+    }}
+"""
+
+        selectable = ", ".join(['"id"', '"version"'] + [f'"{col.name}"' for col in entity.columns if not col.is_id])
+        export_fields = ", ".join(
+            ['"id"', '"version"']
+            + [f'"{col.name}"' for col in entity.columns if not col.is_id]
+            + [f'"{relation.id_field}"' for relation in entity.many_to_one_relations]
+        )
+        cache = self._service_cache_annotations(entity)
+
+        summary_import = ""
+        summary_constant = ""
+        summary_method = ""
+        if entity.summary is not None:
+            summary_import = f"import {package_name}.dto.{entity_name}Summary;\n"
+            summary_fields = ", ".join(['"id"'] + [f'"{col.name}"' for col in entity.summary])
+            summary_constant = f"    private static final List<String> SUMMARY_FIELDS = List.of({summary_fields});\n"
+            summary_method = f"""
+{cache["find_summaries"]}    public Page<{entity_name}Summary> findSummaries({entity_name}Filter filter, Pageable pageable) {{
+        return projections.findAs({entity_name}.class, {entity_name}Summary.class, SUMMARY_FIELDS,
+                toSpecification(filter), limit(pageable));
+    }}
+"""
+
+        self.output.write(os.path.join(service_path, f"{entity_name}Service.java"), f'''
 package {package_name}.service;
 
 import {package_name}.dto.{entity_name}Dto;
-import {package_name}.model.{entity_name};
+import {package_name}.dto.{entity_name}Filter;
+{summary_import}{cursor_import}import {package_name}.model.{entity_name};
 import {package_name}.repository.{entity_name}Repository;
-import {package_name}.mapper.{mapper_name};
+import {package_name}.repository.ProjectionQueries;
+{relation_repositories["imports"]}import {package_name}.mapper.{mapper_name};
+import jakarta.persistence.EntityManager;
+import jakarta.persistence.PersistenceContext;
 import org.springframework.beans.factory.annotation.Autowired;
+{cache["imports"]}import org.springframework.data.domain.Page;
+import org.springframework.data.domain.PageRequest;
+import org.springframework.data.domain.Pageable;
+{slice_import}import org.springframework.data.domain.Sort;
+import org.springframework.data.jpa.domain.Specification;
+import org.springframework.http.HttpStatus;
+import org.springframework.orm.ObjectOptimisticLockingFailureException;
 import org.springframework.stereotype.Service;
+import org.springframework.transaction.annotation.Transactional;
+import org.springframework.web.server.ResponseStatusException;
 
+import java.io.IOException;
+import java.util.ArrayList;
+import java.util.Iterator;
+import java.util.LinkedHashSet;
 import java.util.List;
+import java.util.Map;
 import java.util.Optional;
+import java.util.Set;
+import java.util.function.Function;
 import java.util.stream.Collectors;
+import java.util.stream.Stream;
 
 @Service
+// Reads skip dirty checking and flushing; the write methods override this.
+@Transactional(readOnly = true)
 public class {entity_name}Service {{
+    public static final int MAX_PAGE_SIZE = {entity.max_page_size};
+    public static final int MAX_BATCH_ITEMS = {self.performance["max_batch_items"]};
+    private static final Set<String> SORTABLE_FIELDS = Set.of({sortable});
+    private static final Set<String> SELECTABLE_FIELDS = Set.of({selectable});
+    public static final List<String> EXPORT_FIELDS = List.of({export_fields});
+    private static final int EXPORT_FETCH_SIZE = {self.performance["export_fetch_size"]};
+{summary_constant}
     @Autowired
     private {entity_name}Repository repository;
 
-    public List<{entity_name}Dto> findAll() {{
-        return repository.findAll().stream()
-                .map({mapper_name}::toDto)
-                .collect(Collectors.toList());
+    @Autowired
+    private ProjectionQueries projections;
+
+    @PersistenceContext
+    private EntityManager entityManager;
+{relation_repositories["fields"]}
+{cache["find_all"]}    public Page<{entity_name}Dto> findAll({entity_name}Filter filter, Pageable pageable) {{
+        return repository.findAll(toSpecification(filter), limit(pageable))
+                .map({mapper_name}::toDto);
+    }}
+{summary_method}
+    // Selects only the given fields (and the id) instead of loading whole entities.
+    public Page<Map<String, Object>> findFields({entity_name}Filter filter, Pageable pageable, List<String> fields) {{
+        Set<String> selected = new LinkedHashSet<>();
+        selected.add("id");
+        for (String field : fields) {{
+            if (!SELECTABLE_FIELDS.contains(field)) {{
+                throw new ResponseStatusException(HttpStatus.BAD_REQUEST, "Cannot select " + field);
+            }}
+            selected.add(field);
+        }}
+        return projections.findFields({entity_name}.class, new ArrayList<>(selected), toSpecification(filter), limit(pageable));
+    }}
+{keyset_methods}
+    public void export(ExportWriter writer) throws IOException {{
+        writer.writeHeader();
+        try (Stream<{entity_name}> rows = repository.streamAllByOrderByIdAsc()) {{
+            Iterator<{entity_name}> iterator = rows.iterator();
+            int count = 0;
+            while (iterator.hasNext()) {{
+                writer.write({mapper_name}.toDto(iterator.next()));
+                // Drop the rows already written from the persistence context, so memory does not grow with the table.
+                if (++count % EXPORT_FETCH_SIZE == 0) {{
+                    entityManager.clear();
+                }}
+            }}
+        }}
+        writer.flush();
     }}
 
-    public Optional<{entity_name}Dto> findById(Long id) {{
-        return repository.findById(id)
+{cache["find_by_id"]}    public Optional<{entity_name}Dto> findById(Long id) {{
+        return repository.{find_one}(id)
                 .map({mapper_name}::toDto);
     }}
 
-    public {entity_name}Dto save({entity_name}Dto {entity_name_lower}Dto) {{
-        {entity_name} entity = {mapper_name}.toEntity({entity_name_lower}Dto);
-        entity = repository.save(entity);
+    @Transactional
+{cache["save"]}    public {entity_name}Dto save({entity_name}Dto {entity_name_lower}Dto) {{
+        {entity_name} entity;
+        if ({entity_name_lower}Dto.getId() == null) {{
+            entity = {mapper_name}.toEntity({entity_name_lower}Dto);
+            entity.setVersion(null);
+        }} else {{
+            entity = repository.{find_one}({entity_name_lower}Dto.getId())
+                    .orElseThrow(() -> new ResponseStatusException(HttpStatus.NOT_FOUND, "No {entity_name_lower} with id " + {entity_name_lower}Dto.getId()));
+            checkVersion({entity_name_lower}Dto, entity);
+            {mapper_name}.updateEntity({entity_name_lower}Dto, entity);
+        }}
+{apply_relations.format(dto=f"{entity_name_lower}Dto", indent="        ")}        try {{
+            // Flushing here turns a concurrent update into a 409 and returns the new version.
+            entity = repository.saveAndFlush(entity);
+        }} catch (ObjectOptimisticLockingFailureException e) {{
+            throw new ResponseStatusException(HttpStatus.CONFLICT, "{entity_name} " + entity.getId() + " was modified concurrently");
+        }}
         return {mapper_name}.toDto(entity);
     }}
 
-    public void delete(Long id) {{
+    @Transactional
+{cache["delete"]}    public void delete(Long id) {{
         repository.deleteById(id);
     }}
+
+    @Transactional
+{cache["batch"]}    public List<{entity_name}Dto> createAll(List<{entity_name}Dto> dtos) {{
+        checkBatchSize(dtos.size());
+        List<{entity_name}> entities = new ArrayList<>();
+        for ({entity_name}Dto dto : dtos) {{
+            {entity_name} entity = {mapper_name}.toEntity(dto);
+            entity.setId(null);
+            entity.setVersion(null);
+{apply_relations.format(dto="dto", indent="            ")}            entities.add(entity);
+        }}
+        return repository.saveAll(entities).stream()
+                .map({mapper_name}::toDto)
+                .collect(Collectors.toList());
+    }}
+
+    @Transactional
+{cache["batch"]}    public List<{entity_name}Dto> updateAll(List<{entity_name}Dto> dtos) {{
+        checkBatchSize(dtos.size());
+        List<Long> ids = dtos.stream().map({entity_name}Dto::getId).collect(Collectors.toList());
+        // One SELECT ... IN for all rows; the dirty entities are flushed as batched UPDATEs.
+        Map<Long, {entity_name}> existing = repository.{find_many}(ids).stream()
+                .collect(Collectors.toMap({entity_name}::getId, Function.identity()));
+        List<{entity_name}> updated = new ArrayList<>();
+        for ({entity_name}Dto dto : dtos) {{
+            {entity_name} entity = existing.get(dto.getId());
+            if (entity == null) {{
+                throw new ResponseStatusException(HttpStatus.NOT_FOUND, "No {entity_name_lower} with id " + dto.getId());
+            }}
+            checkVersion(dto, entity);
+            {mapper_name}.updateEntity(dto, entity);
+{apply_relations.format(dto="dto", indent="            ")}            updated.add(entity);
+        }}
+        // Flush so the returned DTOs carry the incremented versions.
+        repository.flush();
+        return updated.stream()
+                .map({mapper_name}::toDto)
+                .collect(Collectors.toList());
+    }}
+
+    @Transactional
+{cache["batch"]}    public void deleteAll(List<Long> ids) {{
+        checkBatchSize(ids.size());
+        repository.deleteAllByIdInBatch(ids);
+    }}
+
+    private void checkVersion({entity_name}Dto dto, {entity_name} entity) {{
+        if (dto.getVersion() != null && !dto.getVersion().equals(entity.getVersion())) {{
+            throw new ResponseStatusException(HttpStatus.CONFLICT, "{entity_name} " + dto.getId() + " was modified concurrently");
+        }}
+    }}
+{relation_repositories["method"]}
+    private void checkBatchSize(int size) {{
+        if (size > MAX_BATCH_ITEMS) {{
+            throw new ResponseStatusException(HttpStatus.BAD_REQUEST, "At most " + MAX_BATCH_ITEMS + " items per batch");
+        }}
+    }}
+
+    private Pageable limit(Pageable pageable) {{
+        for (Sort.Order order : pageable.getSort()) {{
+            if (!SORTABLE_FIELDS.contains(order.getProperty())) {{
+                throw new ResponseStatusException(HttpStatus.BAD_REQUEST, "Cannot sort by " + order.getProperty());
+            }}
+        }}
+        return PageRequest.of(pageable.getPageNumber(), clampSize(pageable.getPageSize()), pageable.getSort());
+    }}
+
+    private int clampSize(int size) {{
+        return Math.max(1, Math.min(size, MAX_PAGE_SIZE));
+    }}
+
+    private Specification<{entity_name}> toSpecification({entity_name}Filter filter) {{
+        List<Specification<{entity_name}>> specs = new ArrayList<>();
+{filter_specs_str}
+        return Specification.allOf(specs);
+    }}
 }}
 ''')
 
     def _generate_controller(self, entity, src_path, entity_name, entity_name_lower):
         """Generates a REST controller for the entity."""
         controller_path = os.path.join(src_path, "controller")
-        os.makedirs(controller_path, exist_ok=True)
 
         package_name = self.project_config["backend_package"]
         dto_name = f"{entity_name}Dto"
 
-        with open(os.path.join(controller_path, f"{entity_name}Controller.java"), "w") as f:
-            f.write(f'''
+        keyset_import = ""
+        keyset_endpoint = ""
+        if entity.keyset:
+            keyset_import = f"import {package_name}.dto.CursorPage;\n"
+            keyset_endpoint = f"""
+    @GetMapping("/scroll")
+    public CursorPage<{dto_name}> scroll(@RequestParam(required = false) Long after,
+                                    @RequestParam(defaultValue = "{entity.page_size}") int size) {{
+        return service.scroll(after, size);
+    }}
+"""
+
+        summary_import = ""
+        summary_endpoint = ""
+        if entity.summary is not None:
+            summary_import = f"import {package_name}.dto.{entity_name}Summary;\n"
+            summary_endpoint = f"""
+    @GetMapping("/summary")
+    public Page<{entity_name}Summary> getSummaries({entity_name}Filter filter,
+                                          @PageableDefault(size = {entity.page_size}, sort = "id") Pageable pageable) {{
+        return service.findSummaries(filter, pageable);
+    }}
+"""
+
+        cache_control_import = ""
+        duration_import = ""
+        cache_control = ""
+        if entity.cache and entity.cache["http_max_age"]:
+            cache_control_import = "import org.springframework.http.CacheControl;\n"
+            duration_import = "import java.time.Duration;\n"
+            cache_control = f"\n                        .cacheControl(CacheControl.maxAge(Duration.ofSeconds({entity.cache['http_max_age']})))"
+
+        self.output.write(os.path.join(controller_path, f"{entity_name}Controller.java"), f'''
 package {package_name}.controller;
 
 import {package_name}.dto.{dto_name};
+import {package_name}.dto.{entity_name}Filter;
+{summary_import}{keyset_import}import {package_name}.service.ExportWriter;
 import {package_name}.service.{entity_name}Service;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import jakarta.servlet.http.HttpServletRequest;
+import jakarta.servlet.http.HttpServletResponse;
 import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.data.domain.Page;
+import org.springframework.data.domain.Pageable;
+import org.springframework.data.web.PageableDefault;
+{cache_control_import}import org.springframework.http.HttpHeaders;
 import org.springframework.http.ResponseEntity;
 import org.springframework.web.bind.annotation.*;
+import org.springframework.web.filter.ShallowEtagHeaderFilter;
 
-import java.util.List;
+import java.io.IOException;
+{duration_import}import java.util.List;
 
 @RestController
 @RequestMapping("/api/{entity_name_lower}s")
@@ -272,15 +1284,38 @@ public class {entity_name}Controller {{
     @Autowired
     private {entity_name}Service service;
 
+    @Autowired
+    private ObjectMapper objectMapper;
+
     @GetMapping
-    public List<{dto_name}> getAll() {{
-        return service.findAll();
+    public Page<?> getAll({entity_name}Filter filter,
+                          @PageableDefault(size = {entity.page_size}, sort = "id") Pageable pageable,
+                          @RequestParam(required = false) List<String> fields) {{
+        if (fields != null && !fields.isEmpty()) {{
+            return service.findFields(filter, pageable, fields);
+        }}
+        return service.findAll(filter, pageable);
+    }}
+{summary_endpoint}{keyset_endpoint}
+    @GetMapping("/export")
+    public void export(@RequestParam(defaultValue = "ndjson") String format,
+                       HttpServletRequest request, HttpServletResponse response) throws IOException {{
+        ExportWriter.Format exportFormat = ExportWriter.Format.of(format);
+        // The ETag filter would buffer the whole export to hash it.
+        ShallowEtagHeaderFilter.disableContentCaching(request);
+        response.setContentType(exportFormat.getContentType());
+        response.setHeader(HttpHeaders.CONTENT_DISPOSITION,
+                "attachment; filename=\\"{entity_name_lower}s." + exportFormat.getExtension() + "\\"");
+        service.export(new ExportWriter(response.getOutputStream(), exportFormat, objectMapper, {entity_name}Service.EXPORT_FIELDS));
     }}
 
     @GetMapping("/{{id}}")
     public ResponseEntity<{dto_name}> getById(@PathVariable Long id) {{
+        // Spring answers 304 without serializing the body when If-None-Match matches the version.
         return service.findById(id)
-                .map(ResponseEntity::ok)
+                .map(dto -> ResponseEntity.ok()
+                        .eTag("\\"" + dto.getVersion() + "\\""){cache_control}
+                        .body(dto))
                 .orElse(ResponseEntity.notFound().build());
     }}
 
@@ -300,16 +1335,24 @@ public class {entity_name}Controller {{
         service.delete(id);
         return ResponseEntity.noContent().build();
     }}
+
+    @PostMapping("/batch")
+    public List<{dto_name}> createAll(@RequestBody List<{dto_name}> dtos) {{
+        return service.createAll(dtos);
+    }}
+
+    @PutMapping("/batch")
+    public List<{dto_name}> updateAll(@RequestBody List<{dto_name}> dtos) {{
+        return service.updateAll(dtos);
+    }}
+
+    @DeleteMapping("/batch")
+    public ResponseEntity<Void> deleteAll(@RequestBody List<Long> ids) {{
+        service.deleteAll(ids);
+        return ResponseEntity.noContent().build();
+    }}
 }}
 ''')
 
-    def _map_type(self, column_type):
-        if column_type == 'string':
-            return 'String'
-        elif column_type == 'number':
-            return 'Long'
-        else:
-            return 'String'
-
     def _log(self, message):
         print(f"[BackendGenerator] {message}")
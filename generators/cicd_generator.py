@@ -1,26 +1,47 @@
 import os
 import json
+from instrumentation import timed
+from manifest import GenerationManifest
+from output_tree import OutputTree
+from starter_cache import JAVA_VERSION
 from utils import run_cmd
 
 class CiCdGenerator:
-    def __init__(self, root_dir, project_config):
+    def __init__(self, root_dir, project_config, manifest=None, output=None):
         self.root_dir = root_dir
         self.project_config = project_config
+        self.manifest = manifest or GenerationManifest(root_dir)
+        self.owns_output = output is None
+        self.output = output or OutputTree(root_dir, self.manifest)
 
     def generate(self):
         self._log("Starting CI/CD generation...")
+        self.generate_backend_files()
+        self.generate_frontend_files()
+        self.generate_stack_files()
+        if self.owns_output:
+            self.output.flush()
+        self._log("CI/CD generation complete.")
+
+    def generate_backend_files(self):
+        """Generates the files that live inside the backend project."""
         self._generate_backend_dockerfile()
+
+    def generate_frontend_files(self):
+        """Generates the files that live inside the Angular app directory."""
         self._generate_frontend_dockerfile()
         self._generate_nginx_config()
+
+    def generate_stack_files(self):
+        """Generates the monitoring and docker-compose files at the project root."""
         self._generate_prometheus_config()
         self._generate_grafana_config()
         self._generate_docker_compose()
-        self._log("CI/CD generation complete.")
 
+    @timed("cicd.grafana")
     def _generate_grafana_config(self):
         """Generates Grafana configuration files."""
         grafana_path = os.path.join(self.root_dir, "grafana", "provisioning", "datasources")
-        os.makedirs(grafana_path, exist_ok=True)
 
         datasource_path = os.path.join(grafana_path, "datasource.yml")
 
@@ -35,13 +56,12 @@ datasources:
     isDefault: true
 """
 
-        with open(datasource_path, "w") as f:
-            f.write(datasource_content)
+        self.output.write(datasource_path, datasource_content)
 
+    @timed("cicd.prometheus")
     def _generate_prometheus_config(self):
         """Generates a prometheus.yml file."""
         prometheus_path = os.path.join(self.root_dir, "prometheus")
-        os.makedirs(prometheus_path, exist_ok=True)
 
         prometheus_config_path = os.path.join(prometheus_path, "prometheus.yml")
 
@@ -56,9 +76,9 @@ scrape_configs:
       - targets: ['backend:8080']
 """
 
-        with open(prometheus_config_path, "w") as f:
-            f.write(prometheus_config_content)
+        self.output.write(prometheus_config_path, prometheus_config_content)
 
+    @timed("cicd.docker_compose")
     def _generate_docker_compose(self):
         """Generates a docker-compose.yml file for the entire application stack."""
         compose_path = os.path.join(self.root_dir, "docker-compose.yml")
@@ -123,9 +143,10 @@ services:
       - database
       - minio
     environment:
-      SPRING_DATASOURCE_URL: jdbc:postgresql://database:5432/mydatabase
-      SPRING_DATASOURCE_USERNAME: myuser
-      SPRING_DATASOURCE_PASSWORD: mypassword
+      SPRING_PROFILES_ACTIVE: prod
+      DB_HOST: database
+      DB_USER: myuser
+      DB_PASSWORD: mypassword
       MINIO_URL: http://minio:9000
       MINIO_ACCESS_KEY: minioadmin
       MINIO_SECRET_KEY: minioadmin
@@ -148,9 +169,9 @@ volumes:
   grafana_data:
 """
 
-        with open(compose_path, "w") as f:
-            f.write(compose_content)
+        self.output.write(compose_path, compose_content)
 
+    @timed("cicd.nginx")
     def _generate_nginx_config(self):
         """Generates a custom Nginx configuration file."""
         frontend_path = os.path.join(self.root_dir, self.project_config["frontend"], self.project_config["app"])
@@ -164,8 +185,24 @@ server {
     root /usr/share/nginx/html;
     index index.html index.htm;
 
+    # The build ships .br and .gz copies of its assets; nginx sends them as they are.
+    brotli_static on;
+    gzip_static on;
+    # API responses are compressed on the fly.
+    gzip on;
+    gzip_types application/json application/x-ndjson text/csv;
+    gzip_min_length 1024;
+    gzip_vary on;
+
     location / {
         try_files $uri $uri/ /index.html;
+        add_header Cache-Control "no-cache";
+    }
+
+    # Hashed file names change with their content, so they can be cached for good.
+    location ~* -[0-9a-z]{8}\\.(?:js|css)$ {
+        expires 1y;
+        add_header Cache-Control "public, immutable";
     }
 
     location /api {
@@ -178,57 +215,60 @@ server {
 }
 """
 
-        with open(nginx_conf_path, "w") as f:
-            f.write(nginx_conf_content)
+        self.output.write(nginx_conf_path, nginx_conf_content)
 
+    @timed("cicd.frontend_dockerfile")
     def _generate_frontend_dockerfile(self):
         """Generates a Dockerfile for the frontend Angular application."""
         frontend_path = os.path.join(self.root_dir, self.project_config["frontend"], self.project_config["app"])
         dockerfile_path = os.path.join(frontend_path, "Dockerfile")
 
-        dockerfile_content = f"""
+        dockerfile_content = f"""# syntax=docker/dockerfile:1
 # Stage 1: Build the application
 FROM node:20-alpine AS build
 WORKDIR /app
 COPY package*.json ./
-RUN npm install
+# The npm cache survives between builds, so only changed packages are downloaded.
+RUN --mount=type=cache,target=/root/.npm npm ci --prefer-offline --no-audit --no-fund
 COPY . .
 RUN npm run build
 
-# Stage 2: Serve the application with Nginx
-FROM nginx:1.25-alpine
+# Stage 2: Serve the application with Nginx; Alpine's nginx has a brotli_static module
+FROM alpine:3.19
+RUN apk add --no-cache nginx nginx-mod-http-brotli
 COPY --from=build /app/dist/{self.project_config["app"]}/browser /usr/share/nginx/html
-COPY nginx.conf /etc/nginx/conf.d/default.conf
+COPY nginx.conf /etc/nginx/http.d/default.conf
 EXPOSE 80
+CMD ["nginx", "-g", "daemon off;"]
 """
 
-        with open(dockerfile_path, "w") as f:
-            f.write(dockerfile_content)
+        self.output.write(dockerfile_path, dockerfile_content)
 
+    @timed("cicd.backend_dockerfile")
     def _generate_backend_dockerfile(self):
         """Generates a Dockerfile for the backend Spring Boot application."""
         backend_path = os.path.join(self.root_dir, self.project_config["backend"])
         dockerfile_path = os.path.join(backend_path, "Dockerfile")
 
-        dockerfile_content = """
+        dockerfile_content = f"""# syntax=docker/dockerfile:1
 # Stage 1: Build the application with Maven
-FROM maven:3.8-jdk17-alpine AS build
+FROM maven:3.9-eclipse-temurin-{JAVA_VERSION}-alpine AS build
 WORKDIR /app
 COPY pom.xml .
-RUN mvn dependency:go-offline
+# The local Maven repository survives between builds, so only changed artifacts are downloaded.
+RUN --mount=type=cache,target=/root/.m2 mvn dependency:go-offline
 COPY src ./src
-RUN mvn clean install
+RUN --mount=type=cache,target=/root/.m2 mvn clean install
 
-# Stage 2: Create the final image
-FROM eclipse-temurin:17-jre-alpine
+# Stage 2: Create the final image; the JRE matches <java.version> in pom.xml
+FROM eclipse-temurin:{JAVA_VERSION}-jre-alpine
 WORKDIR /app
 COPY --from=build /app/target/*.jar /app/app.jar
 EXPOSE 8080
 ENTRYPOINT ["java", "-jar", "/app/app.jar"]
 """
 
-        with open(dockerfile_path, "w") as f:
-            f.write(dockerfile_content)
+        self.output.write(dockerfile_path, dockerfile_content)
 
     def _log(self, message):
         print(f"[CiCdGenerator] {message}")
@@ -1,12 +1,26 @@
 import os
 import json
+from bootstrap import ToolBootstrap
+from instrumentation import timed
+from manifest import GenerationManifest
+from output_tree import OutputTree
 from utils import run_cmd
 
+# Size limits of the production build; "ng build" fails once an error limit is exceeded.
+PRODUCTION_BUDGETS = [
+    {"type": "initial", "maximumWarning": "500kb", "maximumError": "800kb"},
+    {"type": "anyComponentStyle", "maximumWarning": "2kb", "maximumError": "4kb"},
+]
+
 class FrontendGenerator:
-    def __init__(self, root_dir, entities_file, project_config):
+    def __init__(self, root_dir, schema, project_config, manifest=None, output=None):
         self.root_dir = root_dir
-        self.entities_file = entities_file
+        self.schema = schema
         self.project_config = project_config
+        self.manifest = manifest or GenerationManifest(root_dir)
+        self.owns_output = output is None
+        self.output = output or OutputTree(root_dir, self.manifest)
+        self.bootstrap = ToolBootstrap.from_config(project_config)
 
     def _log(self, message):
         print(f"[FrontendGenerator] {message}")
@@ -17,12 +31,18 @@ class FrontendGenerator:
 
         # 1. Generate Angular App
         app_name = self.project_config["app"]
-        run_cmd(
-            f"npx -y @angular/cli@latest new {app_name} --style=scss --routing=false --skip-git --skip-install",
-            cwd=frontend_dir,
-        )
-
         app_path = os.path.join(frontend_dir, app_name)
+        if self.bootstrap.is_angular_scaffolded(app_path):
+            self._log("Angular project already scaffolded, reusing it.")
+        else:
+            run_cmd(
+                f"npx -y {self.bootstrap.pin('@angular/cli')} new {app_name} --style=scss --routing=false --skip-git --skip-install",
+                cwd=frontend_dir,
+                env=self.bootstrap.npm_env(),
+                timeout=self.bootstrap.command_timeout,
+                check=True,
+            )
+
         if not os.path.exists(app_path):
             raise FileNotFoundError("Angular project not found. Check if 'app' was created.")
 
@@ -34,13 +54,11 @@ class FrontendGenerator:
         self._generate_components(app_path)
 
         # 4. Update app config and styles
-        with open(self.entities_file, "r") as f:
-            entities = json.load(f)["entities"]
-        self._update_app_config(app_path, entities)
+        self._update_app_config(app_path, self.schema.entities)
         self._update_styles(app_path)
 
-        # 5. Set up Storybook (temporarily disabled due to timeout)
-        # self._setup_storybook(app_path)
+        # 5. Set up Storybook (killed after tooling.storybook_timeout seconds)
+        self._setup_storybook(app_path)
 
         # 6. Set up Cypress
         self._setup_cypress(app_path)
@@ -58,19 +76,26 @@ class FrontendGenerator:
         # 10. Add Compodoc script
         self._add_compodoc_script(app_path)
 
-        # 11. Generate environment files
+        # 11. Precompress the production build
+        self._add_precompress_step(app_path)
+
+        # 12. Generate environment files
         self._generate_environment_files(app_path)
 
+        if self.owns_output:
+            self.output.flush()
+
+    @timed("frontend.install")
     def _install_dependencies(self, path):
         deps = [
-            "primeng", "primeicons", "primeflex",
+            "primeng", "primeicons",
             "@angular/animations",
             "@angular/forms",
             "@ngx-translate/core",
             "@ngx-translate/http-loader",
             "@ngxs/store"
         ]
-        run_cmd(f"npm install {' '.join(deps)}", cwd=path)
+        self._npm_install(path, deps)
 
         dev_deps = [
             "@storybook/angular", "@storybook/cli",
@@ -82,108 +107,197 @@ class FrontendGenerator:
             "tailwindcss",
             "@compodoc/compodoc"
         ]
-        run_cmd(f"npm install --save-dev {' '.join(dev_deps)}", cwd=path)
+        self._npm_install(path, dev_deps, dev=True)
+
+    def _npm_install(self, path, packages, dev=False):
+        """Installs the pinned packages that are not already present in the project."""
+        missing = self.bootstrap.missing_npm_packages(path, packages)
+        if not missing:
+            self._log(f"{'Dev dependencies' if dev else 'Dependencies'} already installed, skipping npm install.")
+            return
+
+        save_flag = " --save-dev" if dev else ""
+        pinned = " ".join(self.bootstrap.pin(package) for package in missing)
+        run_cmd(
+            f"npm install{save_flag} {self.bootstrap.npm_flags()} {pinned}",
+            cwd=path,
+            env=self.bootstrap.npm_env(),
+            timeout=self.bootstrap.command_timeout,
+            check=True,
+        )
 
+    @timed("frontend.components")
     def _generate_components(self, path):
-        with open(self.entities_file, "r") as f:
-            entities = json.load(f)["entities"]
+        entities = self.schema.entities
 
         components_dir = os.path.join(path, "src", "app", "components")
-        os.makedirs(components_dir, exist_ok=True)
 
+        context = self.manifest.render_context(self.project_config, __file__)
         for entity in entities:
-            name = entity["name"].lower()
-            entity_path = os.path.join(components_dir, name)
-            os.makedirs(entity_path, exist_ok=True)
+            fingerprint = self.manifest.fingerprint(entity.raw, context)
+            if self.manifest.is_entity_current("frontend", entity.name, fingerprint):
+                self._log(f"{entity.name} unchanged, skipping.")
+                continue
 
-            # .component.ts
-            with open(os.path.join(entity_path, f"{name}.component.ts"), "w") as f:
-                f.write(self._generate_component_code(entity))
+            with self.manifest.rendering("frontend", entity.name, fingerprint):
+                self._generate_entity_files(entity, path, components_dir)
 
-            # .component.html
-            with open(os.path.join(entity_path, f"{name}.component.html"), "w") as f:
-                f.write(self._generate_component_html(entity))
+        self._generate_page_model(path)
+        self._generate_entity_state_helpers(path)
+        self._generate_etag_interceptor(path)
+        self._generate_cache_interceptor(path)
 
-            # .stories.ts
-            self._generate_story(entity, entity_path, entity['name'])
+        # Generate app.routes.ts
+        routes_file_path = os.path.join(path, "src", "app", "app.routes.ts")
+        self.output.write(routes_file_path, self._generate_entities_routes(entities))
 
-            # .spec.ts
-            self._generate_component_spec(entity, entity_path, entity['name'])
+    def _generate_entity_files(self, entity, path, components_dir):
+        """Generates the component, model, service, state and e2e files of one entity."""
+        name = entity.lower
+        entity_path = os.path.join(components_dir, name)
 
-            # DTO and Service
-            self._generate_frontend_dto(entity, path, entity['name'])
-            self._generate_service(entity, path, entity['name'])
+        # .component.ts
+        self.output.write(os.path.join(entity_path, f"{name}.component.ts"), self._generate_component_code(entity))
 
-            # NGXS State
-            state_path = os.path.join(path, "src", "app", "core", "state", entity['name'].lower())
-            os.makedirs(state_path, exist_ok=True)
-            self._generate_ngxs_actions(entity, state_path, entity['name'])
-            self._generate_ngxs_state_model(entity, state_path, entity['name'])
-            self._generate_ngxs_state(entity, state_path, entity['name'])
+        # .component.html
+        self.output.write(os.path.join(entity_path, f"{name}.component.html"), self._generate_component_html(entity))
 
-            # E2E spec
-            self._generate_e2e_spec(entity, path, entity['name'])
+        # .routes.ts
+        self._generate_entity_routes(entity, entity_path)
 
-        # Generate app.routes.ts
-        routes_file_path = os.path.join(path, "src", "app", "app.routes.ts")
-        with open(routes_file_path, "w") as f:
-            f.write(self._generate_entities_routes(entities))
+        # .stories.ts
+        self._generate_story(entity, entity_path, entity.name)
+
+        # .spec.ts
+        self._generate_component_spec(entity, entity_path, entity.name)
+
+        # DTO and Service
+        self._generate_frontend_dto(entity, path, entity.name)
+        self._generate_service(entity, path, entity.name)
+
+        # NGXS State
+        state_path = os.path.join(path, "src", "app", "core", "state", entity.lower)
+        self._generate_ngxs_actions(entity, state_path, entity.name)
+        self._generate_ngxs_state_model(entity, state_path, entity.name)
+        self._generate_ngxs_state(entity, state_path, entity.name)
+
+        # E2E spec
+        self._generate_e2e_spec(entity, path, entity.name)
 
     def _generate_component_code(self, entity):
-        class_name = entity["name"].capitalize()
-        entity_name_lower = entity["name"].lower()
-        state_name = f"{class_name}State"
+        class_name = entity.capitalized
+        entity_name_lower = entity.lower
 
         form_controls = []
-        for col in entity["columns"]:
-            if col["name"].lower() == 'id':
+        for col in entity.columns:
+            if col.is_id:
+                continue
+            if col.input == "json":
+                # Free-form JSON has no generic form control, so it is left out of the form.
                 continue
-            form_controls.append(f'"{col["name"]}": ["", [Validators.required]]')
+            if col.input == "checkbox":
+                form_controls.append(f'"{col.name}": [false]')
+            else:
+                form_controls.append(f'"{col.name}": ["", [Validators.required]]')
 
         form_controls_str = ",\n    ".join(form_controls)
 
         primeng_imports = {
             "ButtonModule": "primeng/button",
             "InputTextModule": "primeng/inputtext",
+            "TableModule": "primeng/table",
         }
 
-        if any(col.get("type") == "number" for col in entity["columns"] if col.get("name", "").lower() != "id"):
+        inputs = {col.input for col in entity.columns if not col.is_id}
+        if inputs & {"number", "decimal"}:
             primeng_imports["InputNumberModule"] = "primeng/inputnumber"
+        if "checkbox" in inputs:
+            primeng_imports["CheckboxModule"] = "primeng/checkbox"
+        if "select" in inputs:
+            primeng_imports["DropdownModule"] = "primeng/dropdown"
+
+        # datetime-local inputs have no zone; the API expects an ISO-8601 instant.
+        datetime_conversion = "    const value: any = { ...this.form.value };\n"
+        for col in entity.columns:
+            if col.type == "datetime":
+                datetime_conversion += f"    if (value.{col.name}) {{\n      value.{col.name} = new Date(value.{col.name}).toISOString();\n    }}\n"
+
+        enum_options = "".join(
+            f"  {col.name}Options = [{', '.join(repr(value) for value in col.enum_values)}];\n"
+            for col in entity.columns if col.type == "enum"
+        )
 
         import_statements = [f"import {{ {mod} }} from '{path}';" for mod, path in primeng_imports.items()]
         primeng_imports_str = "\n".join(import_statements)
         primeng_modules_str = ", ".join(primeng_imports.keys())
 
-        return f\"\"\"
-import {{ Component, inject, OnInit }} from '@angular/core';
+        return f"""
+import {{ ChangeDetectionStrategy, ChangeDetectorRef, Component, DestroyRef, inject }} from '@angular/core';
+import {{ takeUntilDestroyed }} from '@angular/core/rxjs-interop';
 import {{ FormBuilder, ReactiveFormsModule, Validators }} from '@angular/forms';
 import {{ CommonModule }} from '@angular/common';
-import {{ Store, Select }} from '@ngxs/store';
-import {{ Observable }} from 'rxjs';
-import {{ {state_name} }} from '../../core/state/{entity_name_lower}/{entity_name_lower}.state';
-import {{ Get{class_name}s, Add{class_name} }} from '../../core/state/{entity_name_lower}/{entity_name_lower}.actions';
+import {{ TranslateModule }} from '@ngx-translate/core';
+import {{ Actions, Store, ofActionSuccessful }} from '@ngxs/store';
+import {{ TableLazyLoadEvent }} from 'primeng/table';
+import {{ Add{class_name}, Delete{class_name}, Update{class_name} }} from '../../core/state/{entity_name_lower}/{entity_name_lower}.actions';
 import {{ {class_name}Dto }} from '../../core/models/{entity_name_lower}.dto';
+import {{ {class_name}Service }} from '../../core/services/{entity_name_lower}.service';
 {primeng_imports_str}
 
+// The table reads pages straight from the service instead of the NGXS state: the state holds
+// whole lists, while the table only ever keeps the visible pages of a server-side sort. Writes
+// still go through the store, and every successful one reloads the visible rows.
 @Component({{
   selector: 'app-{entity_name_lower}',
   standalone: true,
-  imports: [CommonModule, ReactiveFormsModule, {primeng_modules_str}],
-  templateUrl: './{entity_name_lower}.component.html'
+  imports: [CommonModule, ReactiveFormsModule, TranslateModule, {primeng_modules_str}],
+  templateUrl: './{entity_name_lower}.component.html',
+  changeDetection: ChangeDetectionStrategy.OnPush
 }})
-export class {class_name}Component implements OnInit {{
-  @Select({state_name}.getItems) items$!: Observable<{class_name}Dto[]>;
-  @Select({state_name}.isLoading) isLoading$!: Observable<boolean>;
-
-  private fb = inject(FormBuilder);
+export class {class_name}Component {{
+  // The table fetches rows in pages of this size as they scroll into view.
+  readonly blockSize = {entity.max_page_size};
+
+  // One slot per row on the server; slots not fetched yet are undefined.
+  rows: ({class_name}Dto | undefined)[] = [];
+  totalRecords = 0;
+  private loadedBlocks = new Set<number>();
+  private visible = {{ first: 0, last: 0 }};
+  private sort: string[] = [];
+  private generation = 0;
+
+{enum_options}  private fb = inject(FormBuilder);
   private store = inject(Store);
+  private service = inject({class_name}Service);
+  private changeDetector = inject(ChangeDetectorRef);
+  private destroyRef = inject(DestroyRef);
 
   form = this.fb.group({{
     {form_controls_str}
   }});
 
-  ngOnInit() {{
-    this.store.dispatch(new Get{class_name}s());
+  constructor() {{
+    inject(Actions)
+      .pipe(ofActionSuccessful(Add{class_name}, Update{class_name}, Delete{class_name}), takeUntilDestroyed(this.destroyRef))
+      .subscribe(() => {{
+        this.reset();
+        this.loadVisibleBlocks();
+        this.changeDetector.markForCheck();
+      }});
+  }}
+
+  // Rows not fetched yet are keyed by position; ids are always positive.
+  trackById = (index: number, row: {class_name}Dto | undefined) => row ? row.id : -1 - index;
+
+  loadRows(event: TableLazyLoadEvent): void {{
+    const sort = event.sortField ? [`${{event.sortField}},${{event.sortOrder === -1 ? 'desc' : 'asc'}}`] : [];
+    if (sort.join() !== this.sort.join()) {{
+      this.sort = sort;
+      this.reset();
+    }}
+    const first = event.first ?? 0;
+    this.visible = {{ first, last: first + (event.rows ?? this.blockSize) }};
+    this.loadVisibleBlocks();
   }}
 
   save(): void {{
@@ -192,44 +306,141 @@ export class {class_name}Component implements OnInit {{
       return;
     }}
 
-    this.store.dispatch(new Add{class_name}(this.form.value as any));
+{datetime_conversion}    this.store.dispatch(new Add{class_name}(value));
     this.form.reset();
   }}
+
+  private reset(): void {{
+    this.generation++;
+    this.loadedBlocks.clear();
+    this.rows = Array.from({{ length: this.totalRecords }});
+  }}
+
+  private loadVisibleBlocks(): void {{
+    const {{ first, last }} = this.visible;
+    for (let block = Math.floor(first / this.blockSize); block * this.blockSize < last; block++) {{
+      this.loadBlock(block);
+    }}
+  }}
+
+  private loadBlock(block: number): void {{
+    if (this.loadedBlocks.has(block)) {{
+      return;
+    }}
+    this.loadedBlocks.add(block);
+    const generation = this.generation;
+    this.service.getPage({{ page: block, size: this.blockSize, sort: this.sort }})
+      .pipe(takeUntilDestroyed(this.destroyRef))
+      .subscribe({{
+        next: page => {{
+          // A response for an older sort or a reloaded table is stale.
+          if (generation !== this.generation) {{
+            return;
+          }}
+          const resized = page.totalElements !== this.rows.length;
+          if (resized) {{
+            // Rows were added or removed on the server, so the other blocks may have shifted.
+            this.totalRecords = page.totalElements;
+            this.reset();
+            this.loadedBlocks.add(block);
+          }}
+          const rows = [...this.rows];
+          rows.splice(block * this.blockSize, page.content.length, ...page.content);
+          this.rows = rows;
+          if (resized) {{
+            this.loadVisibleBlocks();
+          }}
+          this.changeDetector.markForCheck();
+        }},
+        error: () => this.loadedBlocks.delete(block)
+      }});
+  }}
 }}
-\"\"\"
+"""
 
     def _generate_component_html(self, entity):
         inputs = []
-        entity_name_upper = entity['name'].upper()
-        for col in entity["columns"]:
-            col_name = col["name"]
-            col_type = col.get("type", "string")
-            col_name_upper = col['name'].upper()
+        entity_name_upper = entity.upper
+        for col in entity.columns:
+            col_name = col.name
+            col_name_upper = col.upper
 
-            if col_name.lower() == 'id':
+            if col.is_id or col.input == 'json':
                 continue
 
             input_html = ''
-            if col_type == 'number':
+            if col.input == 'number':
                 input_html = f'<p-inputNumber inputId="{col_name}" formControlName="{col_name}" mode="decimal" [showButtons]="true"></p-inputNumber>'
+            elif col.input == 'decimal':
+                input_html = f'<p-inputNumber inputId="{col_name}" formControlName="{col_name}" mode="decimal" [minFractionDigits]="{col.scale}" [maxFractionDigits]="{col.scale}"></p-inputNumber>'
+            elif col.input == 'checkbox':
+                input_html = f'<p-checkbox inputId="{col_name}" formControlName="{col_name}" [binary]="true"></p-checkbox>'
+            elif col.input == 'select':
+                input_html = f'<p-dropdown inputId="{col_name}" formControlName="{col_name}" [options]="{col_name}Options"></p-dropdown>'
+            elif col.input in ('date', 'datetime-local'):
+                input_html = f'<input id="{col_name}" type="{col.input}" pInputText formControlName="{col_name}" />'
             else:
                 input_html = f'<input id="{col_name}" type="text" pInputText formControlName="{col_name}" />'
 
-            field_html = f"""<div class="field col-12">
+            field_html = f"""<div class="flex flex-col gap-2">
         <label for="{col_name}" class="font-semibold">{{{{ 'FIELD_{col_name_upper}' | translate }}}}</label>
         {input_html}
       </div>"""
             inputs.append(field_html)
 
-        inputs_html = '\\n      '.join(inputs)
+        inputs_html = '\n      '.join(inputs)
 
-        return f"""<div class="card p-fluid">
+        headers = []
+        cells = []
+        for col in entity.columns:
+            if col.input == 'json':
+                continue
+            label = f"{{{{ 'FIELD_{col.upper}' | translate }}}}"
+            if col.sortable or col.is_id:
+                headers.append(f'<th pSortableColumn="{col.name}">{label} <p-sortIcon field="{col.name}"></p-sortIcon></th>')
+            else:
+                headers.append(f'<th>{label}</th>')
+            value = f"row?.{col.name}"
+            if col.input == 'datetime-local':
+                value += " | date: 'short'"
+            cells.append(f"<td>{{{{ {value} }}}}</td>")
+        headers_html = '\n        '.join(headers)
+        cells_html = '\n        '.join(cells)
+
+        return f"""<div class="card mb-6">
+  <h2 class="text-2xl font-bold mb-4">{{{{ '{entity_name_upper}_LIST_TITLE' | translate }}}}</h2>
+  <!-- Only the visible rows are in the DOM; pages are fetched from the API as they scroll into view. -->
+  <p-table
+    [value]="rows"
+    [lazy]="true"
+    (onLazyLoad)="loadRows($event)"
+    [totalRecords]="totalRecords"
+    [rows]="blockSize"
+    [scrollable]="true"
+    scrollHeight="480px"
+    [virtualScroll]="true"
+    [virtualScrollItemSize]="46"
+    [rowTrackBy]="trackById">
+    <ng-template pTemplate="header">
+      <tr>
+        {headers_html}
+      </tr>
+    </ng-template>
+    <ng-template pTemplate="body" let-row>
+      <tr style="height: 46px">
+        {cells_html}
+      </tr>
+    </ng-template>
+  </p-table>
+</div>
+
+<div class="card p-fluid">
   <h2 class="text-2xl font-bold mb-4">{{{{ '{entity_name_upper}_FORM_TITLE' | translate }}}}</h2>
   <form [formGroup]="form" (ngSubmit)="save()">
-    <div class="formgrid grid">
+    <div class="grid grid-cols-1 gap-4">
       {inputs_html}
     </div>
-    <div class="mt-4 flex justify-content-end">
+    <div class="mt-4 flex justify-end">
         <p-button label="{{{{ 'SAVE_BUTTON' | translate }}}}" type="submit" icon="pi pi-check" [disabled]="form.invalid"></p-button>
     </div>
   </form>
@@ -238,17 +449,17 @@ export class {class_name}Component implements OnInit {{
 
     def _generate_story(self, entity, component_path, entity_name):
         """Generates a Storybook story for a component."""
-        story_path = os.path.join(component_path, f"{entity_name.lower()}.stories.ts")
+        story_path = os.path.join(component_path, f"{entity.lower}.stories.ts")
 
         story_content = f"""
 import type {{ Meta, StoryObj }} from '@storybook/angular';
-import {{ {entity_name.capitalize()}Component }} from './{entity_name.lower()}.component';
+import {{ {entity.capitalized}Component }} from './{entity.lower}.component';
 
-const meta: Meta<{entity_name.capitalize()}Component> = {{
-  title: 'Components/{entity_name.capitalize()}',
-  component: {entity_name.capitalize()}Component,
+const meta: Meta<{entity.capitalized}Component> = {{
+  title: 'Components/{entity.capitalized}',
+  component: {entity.capitalized}Component,
   tags: ['autodocs'],
-  render: (args: {entity_name.capitalize()}Component) => ({{
+  render: (args: {entity.capitalized}Component) => ({{
     props: {{
       ...args,
     }},
@@ -256,30 +467,28 @@ const meta: Meta<{entity_name.capitalize()}Component> = {{
 }};
 
 export default meta;
-type Story = StoryObj<{entity_name.capitalize()}Component>;
+type Story = StoryObj<{entity.capitalized}Component>;
 
 export const Default: Story = {{
   args: {{}},
 }};
 """
 
-        with open(story_path, "w") as f:
-            f.write(story_content)
+        self.output.write(story_path, story_content)
 
     def _generate_e2e_spec(self, entity, app_path, entity_name):
         """Generates a Cypress E2E test spec for an entity."""
         e2e_path = os.path.join(app_path, "cypress", "e2e")
-        os.makedirs(e2e_path, exist_ok=True)
 
-        spec_path = os.path.join(e2e_path, f"{entity_name.lower()}.cy.ts")
+        spec_path = os.path.join(e2e_path, f"{entity.lower}.cy.ts")
         spec_content = f"""
-describe('{entity_name.capitalize()} Form', () => {{
+describe('{entity.capitalized} Form', () => {{
   beforeEach(() => {{
-    cy.visit('/{entity_name.lower()}');
+    cy.visit('/{entity.lower}');
   }});
 
   it('should display the form title', () => {{
-    cy.get('h2').should('contain', '{entity_name.capitalize()} Form');
+    cy.get('h2').should('contain', '{entity.capitalized} Form');
   }});
 
   it('should have a disabled save button initially', () => {{
@@ -287,35 +496,45 @@ describe('{entity_name.capitalize()} Form', () => {{
   }});
 }});
 """
-        with open(spec_path, "w") as f:
-            f.write(spec_content)
+        self.output.write(spec_path, spec_content)
 
     def _generate_component_spec(self, entity, component_path, entity_name):
         """Generates a component spec file for a component."""
-        spec_path = os.path.join(component_path, f"{entity_name.lower()}.component.spec.ts")
+        spec_path = os.path.join(component_path, f"{entity.lower}.component.spec.ts")
 
         spec_content = f"""
 import {{ ComponentFixture, TestBed }} from '@angular/core/testing';
+import {{ provideHttpClient }} from '@angular/common/http';
+import {{ provideHttpClientTesting }} from '@angular/common/http/testing';
 import {{ ReactiveFormsModule }} from '@angular/forms';
 import {{ NoopAnimationsModule }} from '@angular/platform-browser/animations';
+import {{ TranslateModule }} from '@ngx-translate/core';
+import {{ provideStore }} from '@ngxs/store';
 
-import {{ {entity_name.capitalize()}Component }} from './{entity_name.lower()}.component';
+import {{ {entity.capitalized}Component }} from './{entity.lower}.component';
+import {{ {entity.capitalized}State }} from '../../core/state/{entity.lower}/{entity.lower}.state';
 
-describe('{entity_name.capitalize()}Component', () => {{
-  let component: {entity_name.capitalize()}Component;
-  let fixture: ComponentFixture<{entity_name.capitalize()}Component>;
+describe('{entity.capitalized}Component', () => {{
+  let component: {entity.capitalized}Component;
+  let fixture: ComponentFixture<{entity.capitalized}Component>;
 
   beforeEach(async () => {{
     await TestBed.configureTestingModule({{
       imports: [
         ReactiveFormsModule,
         NoopAnimationsModule,
-        {entity_name.capitalize()}Component
+        TranslateModule.forRoot(),
+        {entity.capitalized}Component
+      ],
+      providers: [
+        provideStore([{entity.capitalized}State]),
+        provideHttpClient(),
+        provideHttpClientTesting()
       ]
     }})
     .compileComponents();
 
-    fixture = TestBed.createComponent({entity_name.capitalize()}Component);
+    fixture = TestBed.createComponent({entity.capitalized}Component);
     component = fixture.componentInstance;
     fixture.detectChanges();
   }});
@@ -326,47 +545,312 @@ describe('{entity_name.capitalize()}Component', () => {{
 }});
 """
 
-        with open(spec_path, "w") as f:
-            f.write(spec_content)
+        self.output.write(spec_path, spec_content)
 
     def _generate_frontend_dto(self, entity, app_path, entity_name):
         """Generates a TypeScript interface for an entity's DTO."""
         dto_dir = os.path.join(app_path, "src", "app", "core", "models")
-        os.makedirs(dto_dir, exist_ok=True)
 
-        dto_path = os.path.join(dto_dir, f"{entity_name.lower()}.dto.ts")
+        dto_path = os.path.join(dto_dir, f"{entity.lower}.dto.ts")
 
         ts_fields = []
-        for col in entity["columns"]:
-            ts_type = self._map_ts_type(col['type'])
-            ts_fields.append(f"  {col['name']}: {ts_type};")
+        for col in entity.columns:
+            ts_fields.append(f"  {col.name}: {col.ts_type};")
+        ts_fields.append("  version?: number;")
+        for relation in entity.many_to_one_relations:
+            ts_fields.append(f"  {relation.id_field}?: number | null;")
+        for relation in entity.many_to_many_relations:
+            # Only the detail endpoint fills the ids of a many-to-many relation.
+            ts_fields.append(f"  {relation.id_field}?: number[];")
 
         ts_fields_str = "\n".join(ts_fields)
 
         dto_content = f"""
-export interface {entity_name.capitalize()}Dto {{
+export interface {entity.capitalized}Dto {{
 {ts_fields_str}
 }}
+"""
+        if entity.summary is not None:
+            summary_fields = " | ".join(["'id'"] + [f"'{col.name}'" for col in entity.summary])
+            dto_content += f"""
+export type {entity.capitalized}Summary = Pick<{entity.capitalized}Dto, {summary_fields}>;
+"""
+
+        self.output.write(dto_path, dto_content)
+
+    def _generate_page_model(self, app_path):
+        """Generates the TypeScript shapes of the paged list endpoints."""
+        page_path = os.path.join(app_path, "src", "app", "core", "models", "page.ts")
+
+        page_content = """
+export interface Page<T> {
+  content: T[];
+  totalElements: number;
+  totalPages: number;
+  number: number;
+  size: number;
+}
+
+export interface CursorPage<T> {
+  items: T[];
+  nextCursor: number | null;
+}
+
+export interface PageRequest {
+  page?: number;
+  size?: number;
+  sort?: string[];
+  filters?: Record<string, string | number | boolean | null | undefined>;
+  /** Only these properties (and the id) are selected and returned. */
+  fields?: string[];
+}
+"""
+
+        self.output.write(page_path, page_content)
+
+    def _generate_entity_state_helpers(self, app_path):
+        """Generates the normalized state shape and the updates shared by every NGXS entity state."""
+        helpers_path = os.path.join(app_path, "src", "app", "core", "state", "entity-state.ts")
+
+        helpers_content = """
+/**
+ * Items keyed by id, with their order in a separate list. Updating one item
+ * leaves the order and every other item untouched, so only its row re-renders.
+ */
+export interface EntityStateModel<T> {
+  ids: number[];
+  entities: Record<number, T>;
+  /** Ids with a save or delete in flight. */
+  pending: Record<number, boolean>;
+  loading: boolean;
+}
+
+export function emptyEntityState<T>(): EntityStateModel<T> {
+  return { ids: [], entities: {}, pending: {}, loading: false };
+}
+
+export function setAll<T extends { id: number }>(items: T[]): Partial<EntityStateModel<T>> {
+  const entities: Record<number, T> = {};
+  for (const item of items) {
+    entities[item.id] = item;
+  }
+  return { ids: items.map(item => item.id), entities, pending: {} };
+}
+
+/** Adds or replaces one item; the ids are only copied when the item is new. */
+export function upsert<T extends { id: number }>(
+  state: EntityStateModel<T>, item: T, index = state.ids.length
+): Partial<EntityStateModel<T>> {
+  const entities = { ...state.entities, [item.id]: item };
+  if (item.id in state.entities) {
+    return { entities };
+  }
+  const ids = [...state.ids];
+  ids.splice(index, 0, item.id);
+  return { ids, entities };
+}
+
+export function remove<T>(state: EntityStateModel<T>, id: number): Partial<EntityStateModel<T>> {
+  const { [id]: removed, ...entities } = state.entities;
+  return { ids: state.ids.filter(existing => existing !== id), entities };
+}
+
+export function setPending<T>(state: EntityStateModel<T>, id: number, pending: boolean): Partial<EntityStateModel<T>> {
+  const next = { ...state.pending };
+  if (pending) {
+    next[id] = true;
+  } else {
+    delete next[id];
+  }
+  return { pending: next };
+}
+"""
+
+        self.output.write(helpers_path, helpers_content)
+
+    def _generate_etag_interceptor(self, app_path):
+        """Generates an HTTP interceptor that revalidates GETs with If-None-Match."""
+        interceptor_path = os.path.join(app_path, "src", "app", "core", "http", "etag.interceptor.ts")
+
+        interceptor_content = """import { HttpErrorResponse, HttpInterceptorFn, HttpResponse } from '@angular/common/http';
+import { catchError, of, tap, throwError } from 'rxjs';
+
+interface CachedResponse {
+  etag: string;
+  response: HttpResponse<unknown>;
+}
+
+const MAX_ENTRIES = 200;
+const cache = new Map<string, CachedResponse>();
+
+/**
+ * Sends the ETag of the last response as If-None-Match and answers a 304
+ * from the cached copy, so unchanged lists are not downloaded again.
+ */
+export const etagInterceptor: HttpInterceptorFn = (req, next) => {
+  if (req.method !== 'GET') {
+    return next(req);
+  }
+
+  const key = req.urlWithParams;
+  const cached = cache.get(key);
+  const request = cached ? req.clone({ setHeaders: { 'If-None-Match': cached.etag } }) : req;
+
+  return next(request).pipe(
+    tap(event => {
+      if (event instanceof HttpResponse) {
+        const etag = event.headers.get('ETag');
+        if (etag) {
+          remember(key, { etag, response: event });
+        }
+      }
+    }),
+    catchError((error: HttpErrorResponse) => {
+      if (error.status === 304 && cached) {
+        remember(key, cached);
+        return of(cached.response.clone());
+      }
+      return throwError(() => error);
+    })
+  );
+};
+
+function remember(key: string, entry: CachedResponse): void {
+  // Re-inserting keeps the Map ordered from least to most recently used.
+  cache.delete(key);
+  cache.set(key, entry);
+  if (cache.size > MAX_ENTRIES) {
+    cache.delete(cache.keys().next().value as string);
+  }
+}
+"""
+
+        self.output.write(interceptor_path, interceptor_content)
+
+    def _generate_cache_interceptor(self, app_path):
+        """Generates an HTTP interceptor that shares identical GETs and caches them for a while."""
+        interceptor_path = os.path.join(app_path, "src", "app", "core", "http", "cache.interceptor.ts")
+
+        interceptor_content = """import { HttpContextToken, HttpEvent, HttpInterceptorFn, HttpResponse } from '@angular/common/http';
+import { Observable, finalize, of, share, tap } from 'rxjs';
+
+/** How long a GET response is served from memory; 0 only shares identical requests in flight. */
+export const CACHE_TTL_MS = new HttpContextToken<number>(() => 0);
+
+/** The collection URL whose cached responses are dropped by a write through the same service. */
+export const CACHE_SCOPE = new HttpContextToken<string | null>(() => null);
+
+interface CachedResponse {
+  expires: number;
+  response: HttpResponse<unknown>;
+}
+
+const MAX_ENTRIES = 200;
+const cache = new Map<string, CachedResponse>();
+const inFlight = new Map<string, Observable<HttpEvent<unknown>>>();
+// Bumped by every write, so a GET that was already running does not cache a stale response.
+const generations = new Map<string, number>();
+
+export const cacheInterceptor: HttpInterceptorFn = (req, next) => {
+  const scope = req.context.get(CACHE_SCOPE);
+  if (req.method !== 'GET') {
+    if (!scope) {
+      return next(req);
+    }
+    invalidate(scope);
+    return next(req).pipe(finalize(() => invalidate(scope)));
+  }
+
+  const key = req.urlWithParams;
+  const cached = cache.get(key);
+  if (cached && cached.expires > Date.now()) {
+    remember(key, cached);
+    return of(cached.response.clone());
+  }
+  cache.delete(key);
+
+  const running = inFlight.get(key);
+  if (running) {
+    return running;
+  }
+
+  const ttl = req.context.get(CACHE_TTL_MS);
+  const generation = scope ? generations.get(scope) ?? 0 : 0;
+  const shared = next(req).pipe(
+    tap(event => {
+      const current = scope ? generations.get(scope) ?? 0 : 0;
+      if (ttl > 0 && event instanceof HttpResponse && event.ok && current === generation) {
+        remember(key, { expires: Date.now() + ttl, response: event });
+      }
+    }),
+    finalize(() => inFlight.delete(key)),
+    share()
+  );
+  inFlight.set(key, shared);
+  return shared;
+};
+
+function invalidate(scope: string): void {
+  generations.set(scope, (generations.get(scope) ?? 0) + 1);
+  for (const key of [...cache.keys()]) {
+    if (key === scope || key.startsWith(scope + '/') || key.startsWith(scope + '?')) {
+      cache.delete(key);
+    }
+  }
+}
+
+function remember(key: string, entry: CachedResponse): void {
+  // Re-inserting keeps the Map ordered from least to most recently used.
+  cache.delete(key);
+  cache.set(key, entry);
+  if (cache.size > MAX_ENTRIES) {
+    cache.delete(cache.keys().next().value as string);
+  }
+}
 """
 
-        with open(dto_path, "w") as f:
-            f.write(dto_content)
+        self.output.write(interceptor_path, interceptor_content)
 
     def _generate_service(self, entity, app_path, entity_name):
         """Generates an Angular service for an entity."""
         service_dir = os.path.join(app_path, "src", "app", "core", "services")
-        os.makedirs(service_dir, exist_ok=True)
 
-        service_path = os.path.join(service_dir, f"{entity_name.lower()}.service.ts")
+        service_path = os.path.join(service_dir, f"{entity.lower}.service.ts")
 
-        entity_name_cap = entity_name.capitalize()
+        entity_name_cap = entity.capitalized
         dto_name = f"{entity_name_cap}Dto"
 
+        scroll_method = ""
+        if entity.keyset:
+            scroll_method = f"""
+  scroll(after: number | null = null, size = {entity.page_size}): Observable<CursorPage<{dto_name}>> {{
+    let params = new HttpParams().set('size', size);
+    if (after !== null) {{
+      params = params.set('after', after);
+    }}
+    return this.http.get<CursorPage<{dto_name}>>(`${{this.apiUrl}}/scroll`, {{ params, context: this.context }});
+  }}
+"""
+
+        dto_imports = dto_name
+        summary_method = ""
+        if entity.summary is not None:
+            dto_imports = f"{dto_name}, {entity_name_cap}Summary"
+            summary_method = f"""
+  /** The summary columns only; cheaper than getPage() for lists. */
+  getSummaries(request: PageRequest = {{}}): Observable<Page<{entity_name_cap}Summary>> {{
+    return this.http.get<Page<{entity_name_cap}Summary>>(`${{this.apiUrl}}/summary`, {{ params: this.toParams(request), context: this.context }});
+  }}
+"""
+
         service_content = f"""
 import {{ Injectable, inject }} from '@angular/core';
-import {{ HttpClient }} from '@angular/common/http';
+import {{ HttpClient, HttpContext, HttpParams }} from '@angular/common/http';
 import {{ Observable }} from 'rxjs';
-import {{ {dto_name} }} from '../models/{entity_name.lower()}.dto';
+import {{ map }} from 'rxjs/operators';
+import {{ {dto_imports} }} from '../models/{entity.lower}.dto';
+import {{ CursorPage, Page, PageRequest }} from '../models/page';
+import {{ CACHE_SCOPE, CACHE_TTL_MS }} from '../http/cache.interceptor';
 import {{ environment }} from '../../../../environments/environment';
 
 @Injectable({{
@@ -374,41 +858,68 @@ import {{ environment }} from '../../../../environments/environment';
 }})
 export class {entity_name_cap}Service {{
   private http = inject(HttpClient);
-  private apiUrl = `${{environment.apiUrl}}/{entity_name.lower()}s`;
-
+  private apiUrl = `${{environment.apiUrl}}/{entity.plural}`;
+  // Identical GETs in flight share one request, and responses are kept for client_cache_seconds
+  // ({entity.client_cache_seconds}). Any write through this service drops the cached responses.
+  private context = new HttpContext()
+    .set(CACHE_TTL_MS, {entity.client_cache_seconds * 1000})
+    .set(CACHE_SCOPE, this.apiUrl);
+
+  getPage(request: PageRequest = {{}}): Observable<Page<{dto_name}>> {{
+    return this.http.get<Page<{dto_name}>>(this.apiUrl, {{ params: this.toParams(request), context: this.context }});
+  }}
+{summary_method}
+  /** First page only; the server caps the page size at {entity.max_page_size}. */
   getAll(): Observable<{dto_name}[]> {{
-    return this.http.get<{dto_name}[]>(this.apiUrl);
+    return this.getPage().pipe(map(page => page.content));
   }}
-
+{scroll_method}
   getById(id: number): Observable<{dto_name}> {{
-    return this.http.get<{dto_name}>(`${{this.apiUrl}}/${{id}}`);
+    return this.http.get<{dto_name}>(`${{this.apiUrl}}/${{id}}`, {{ context: this.context }});
   }}
 
   create(dto: {dto_name}): Observable<{dto_name}> {{
-    return this.http.post<{dto_name}>(this.apiUrl, dto);
+    return this.http.post<{dto_name}>(this.apiUrl, dto, {{ context: this.context }});
   }}
 
   update(id: number, dto: {dto_name}): Observable<{dto_name}> {{
-    return this.http.put<{dto_name}>(`${{this.apiUrl}}/${{id}}`, dto);
+    return this.http.put<{dto_name}>(`${{this.apiUrl}}/${{id}}`, dto, {{ context: this.context }});
   }}
 
   delete(id: number): Observable<void> {{
-    return this.http.delete<void>(`${{this.apiUrl}}/${{id}}`);
+    return this.http.delete<void>(`${{this.apiUrl}}/${{id}}`, {{ context: this.context }});
+  }}
+
+  private toParams(request: PageRequest): HttpParams {{
+    let params = new HttpParams()
+      .set('page', request.page ?? 0)
+      .set('size', request.size ?? {entity.page_size});
+    for (const sort of request.sort ?? []) {{
+      params = params.append('sort', sort);
+    }}
+    for (const [name, value] of Object.entries(request.filters ?? {{}})) {{
+      if (value !== null && value !== undefined && value !== '') {{
+        params = params.set(name, value);
+      }}
+    }}
+    if (request.fields?.length) {{
+      params = params.set('fields', request.fields.join(','));
+    }}
+    return params;
   }}
 }}
 """
 
-        with open(service_path, "w") as f:
-            f.write(service_content)
+        self.output.write(service_path, service_content)
 
     def _generate_ngxs_actions(self, entity, state_path, entity_name):
         """Generates NGXS action classes."""
-        actions_path = os.path.join(state_path, f"{entity_name.lower()}.actions.ts")
-        entity_name_cap = entity_name.capitalize()
+        actions_path = os.path.join(state_path, f"{entity.lower}.actions.ts")
+        entity_name_cap = entity.capitalized
         dto_name = f"{entity_name_cap}Dto"
 
         actions_content = f"""
-import {{ {dto_name} }} from '../../models/{entity_name.lower()}.dto';
+import {{ {dto_name} }} from '../../models/{entity.lower}.dto';
 
 export class Get{entity_name_cap}s {{
   static readonly type = '[{entity_name_cap}] Get All';
@@ -429,119 +940,177 @@ export class Delete{entity_name_cap} {{
   constructor(public id: number) {{}}
 }}
 """
-        with open(actions_path, "w") as f:
-            f.write(actions_content)
+        self.output.write(actions_path, actions_content)
 
     def _generate_ngxs_state_model(self, entity, state_path, entity_name):
         """Generates the NGXS state model interface."""
-        model_path = os.path.join(state_path, f"{entity_name.lower()}.state.model.ts")
-        entity_name_cap = entity_name.capitalize()
+        model_path = os.path.join(state_path, f"{entity.lower}.state.model.ts")
+        entity_name_cap = entity.capitalized
         dto_name = f"{entity_name_cap}Dto"
 
         model_content = f"""
-import {{ {dto_name} }} from '../../models/{entity_name.lower()}.dto';
+import {{ {dto_name} }} from '../../models/{entity.lower}.dto';
+import {{ EntityStateModel }} from '../entity-state';
 
-export interface {entity_name_cap}StateModel {{
-  items: {dto_name}[];
-  loading: boolean;
-}}
+export type {entity_name_cap}StateModel = EntityStateModel<{dto_name}>;
 """
-        with open(model_path, "w") as f:
-            f.write(model_content)
+        self.output.write(model_path, model_content)
 
     def _generate_ngxs_state(self, entity, state_path, entity_name):
         """Generates the NGXS state class."""
-        state_file_path = os.path.join(state_path, f"{entity_name.lower()}.state.ts")
-        entity_name_cap = entity_name.capitalize()
+        state_file_path = os.path.join(state_path, f"{entity.lower}.state.ts")
+        entity_name_cap = entity.capitalized
         service_name = f"{entity_name_cap}Service"
         state_model = f"{entity_name_cap}StateModel"
 
-        state_content = f\"\"\"
-import {{ State, Action, StateContext, Selector }} from '@ngxs/store';
+        dto_name = f"{entity_name_cap}Dto"
+
+        state_content = f"""
+import {{ State, Action, StateContext, Selector, SelectorOptions, createSelector }} from '@ngxs/store';
 import {{ inject, Injectable }} from '@angular/core';
-import {{ tap }} from 'rxjs/operators';
-import {{ {state_model} }} from './{entity_name.lower()}.state.model';
-import {{ Get{entity_name_cap}s, Add{entity_name_cap}, Update{entity_name_cap}, Delete{entity_name_cap} }} from './{entity_name.lower()}.actions';
-import {{ {service_name} }} from '../../services/{entity_name.lower()}.service';
+import {{ throwError }} from 'rxjs';
+import {{ catchError, tap }} from 'rxjs/operators';
+import {{ {state_model} }} from './{entity.lower}.state.model';
+import {{ Get{entity_name_cap}s, Add{entity_name_cap}, Update{entity_name_cap}, Delete{entity_name_cap} }} from './{entity.lower}.actions';
+import {{ {dto_name} }} from '../../models/{entity.lower}.dto';
+import {{ {service_name} }} from '../../services/{entity.lower}.service';
+import {{ emptyEntityState, remove, setAll, setPending, upsert }} from '../entity-state';
 
 @State<{state_model}>({{
-  name: '{entity_name.lower()}s',
-  defaults: {{
-    items: [],
-    loading: false
-  }}
+  name: '{entity.plural}',
+  defaults: emptyEntityState<{dto_name}>()
 }})
+@SelectorOptions({{ injectContainerState: false }})
 @Injectable()
 export class {entity_name_cap}State {{
   private service = inject({service_name});
 
   @Selector()
-  static getItems(state: {state_model}) {{
-    return state.items;
+  static ids(state: {state_model}): number[] {{
+    return state.ids;
+  }}
+
+  @Selector()
+  static entities(state: {state_model}): Record<number, {dto_name}> {{
+    return state.entities;
   }}
 
   @Selector()
-  static isLoading(state: {state_model}) {{
+  static pending(state: {state_model}): Record<number, boolean> {{
+    return state.pending;
+  }}
+
+  // Recomputed only when the ids or items change, not when a loading or pending flag does.
+  @Selector([{entity_name_cap}State.ids, {entity_name_cap}State.entities])
+  static getItems(ids: number[], entities: Record<number, {dto_name}>): {dto_name}[] {{
+    return ids.map(id => entities[id]);
+  }}
+
+  @Selector()
+  static isLoading(state: {state_model}): boolean {{
     return state.loading;
   }}
 
+  static getById(id: number) {{
+    return createSelector([{entity_name_cap}State.entities], (entities: Record<number, {dto_name}>) => entities[id]);
+  }}
+
+  static isPending(id: number) {{
+    return createSelector([{entity_name_cap}State.pending], (pending: Record<number, boolean>) => !!pending[id]);
+  }}
+
   @Action(Get{entity_name_cap}s)
-  get({{{{ patchState }}}}: StateContext<{state_model}>) {{
+  get({{ patchState }}: StateContext<{state_model}>) {{
     patchState({{ loading: true }});
     return this.service.getAll().pipe(
-      tap(items => patchState({{ items, loading: false }}))
+      tap(items => patchState({{ ...setAll(items), loading: false }})),
+      catchError(error => {{
+        patchState({{ loading: false }});
+        return throwError(() => error);
+      }})
     );
   }}
 
   @Action(Add{entity_name_cap})
-  add({{{{ getState, patchState }}}}: StateContext<{state_model}>, {{{{ payload }}}}: Add{entity_name_cap}) {{
-    patchState({{ loading: true }});
+  add({{ getState, patchState }}: StateContext<{state_model}>, {{ payload }}: Add{entity_name_cap}) {{
+    // The server assigns the id, so a new item is only added once it is saved.
     return this.service.create(payload).pipe(
-      tap(item => {{
-        const state = getState();
-        patchState({{ items: [...state.items, item], loading: false }});
-      }})
+      tap(item => patchState(upsert(getState(), item)))
     );
   }}
 
   @Action(Update{entity_name_cap})
-  update({{{{ getState, patchState }}}}: StateContext<{state_model}>, {{{{ payload }}}}: Update{entity_name_cap}) {{
-    patchState({{ loading: true }});
+  update({{ getState, patchState }}: StateContext<{state_model}>, {{ payload }}: Update{entity_name_cap}) {{
+    // Optimistic: the change shows at once and is reverted if the server rejects it.
+    const state = getState();
+    const previous = state.entities[payload.id];
+    patchState({{ ...upsert(state, payload), ...setPending(state, payload.id, true) }});
     return this.service.update(payload.id, payload).pipe(
       tap(item => {{
-        const state = getState();
-        const newItems = state.items.map(i => i.id === item.id ? item : i);
-        patchState({{ items: newItems, loading: false }});
+        const current = getState();
+        patchState({{ ...upsert(current, item), ...setPending(current, item.id, false) }});
+      }}),
+      catchError(error => {{
+        const current = getState();
+        const rollback = previous ? upsert(current, previous) : remove(current, payload.id);
+        patchState({{ ...rollback, ...setPending(current, payload.id, false) }});
+        return throwError(() => error);
       }})
     );
   }}
 
   @Action(Delete{entity_name_cap})
-  delete({{{{ getState, patchState }}}}: StateContext<{state_model}>, {{{{ id }}}}: Delete{entity_name_cap}) {{
-    patchState({{ loading: true }});
+  delete({{ getState, patchState }}: StateContext<{state_model}>, {{ id }}: Delete{entity_name_cap}) {{
+    const state = getState();
+    const previous = state.entities[id];
+    const index = state.ids.indexOf(id);
+    patchState({{ ...remove(state, id), ...setPending(state, id, true) }});
     return this.service.delete(id).pipe(
-      tap(() => {{
-        const state = getState();
-        const newItems = state.items.filter(i => i.id !== id);
-        patchState({{ items: newItems, loading: false }});
+      tap(() => patchState(setPending(getState(), id, false))),
+      catchError(error => {{
+        // Put the item back where it was.
+        const current = getState();
+        const rollback = previous ? upsert(current, previous, index) : {{}};
+        patchState({{ ...rollback, ...setPending(current, id, false) }});
+        return throwError(() => error);
       }})
     );
   }}
 }}
-\"\"\"
-        with open(state_file_path, "w") as f:
-            f.write(state_content)
+"""
+        self.output.write(state_file_path, state_content)
+
+    def _generate_entity_routes(self, entity, entity_path):
+        """Generates the child routes that load an entity's component together with its NGXS state."""
+        class_name = entity.capitalized
+
+        content = f"""import {{ Routes }} from '@angular/router';
+import {{ provideStates }} from '@ngxs/store';
+import {{ {class_name}Component }} from './{entity.lower}.component';
+import {{ {class_name}State }} from '../../core/state/{entity.lower}/{entity.lower}.state';
+
+export const {entity.upper}_ROUTES: Routes = [
+  {{
+    path: '',
+    component: {class_name}Component,
+    providers: [provideStates([{class_name}State])]
+  }}
+];
+"""
+        self.output.write(os.path.join(entity_path, f"{entity.lower}.routes.ts"), content)
 
     def _generate_entities_routes(self, entities):
         if not entities:
             return "import { Routes } from '@angular/router';\n\nexport const routes: Routes = [];"
 
-        first_entity_path = entities[0]["name"].lower()
+        first_entity_path = entities[0].lower
 
+        preload_data = ",\n      data: { preload: true }"
+        # Each entity is its own chunk: the component and its state load on first navigation.
         routes = ",\n  ".join(
             f"""{{
-      path: '{entity["name"].lower()}',
-      loadComponent: () => import('./components/{entity["name"].lower()}/{entity["name"].lower()}.component').then(m => m.{entity["name"].capitalize()}Component)
+      path: '{entity.lower}',
+      loadChildren: () => import('./components/{entity.lower}/{entity.lower}.routes').then(m => m.{entity.upper}_ROUTES){preload_data if entity.preload else ""}
     }}""" for entity in entities
         )
 
@@ -557,15 +1126,14 @@ export const routes: Routes = [
 ];
 """
 
+    @timed("frontend.app_component")
     def _generate_app_component(self, path):
-        with open(self.entities_file, "r") as f:
-            entities = json.load(f)["entities"]
+        entities = self.schema.entities
 
         src_app_dir = os.path.join(path, "src", "app")
-        os.makedirs(src_app_dir, exist_ok=True)
 
         # app.component.ts
-        entity_list = ",\n    ".join([f"{{ name: '{e['name'].capitalize()}', path: '/{e['name'].lower()}' }}" for e in entities])
+        entity_list = ",\n    ".join([f"{{ name: '{e.capitalized}', path: '/{e.lower}' }}" for e in entities])
         ts_code = f'''import {{ Component, inject }} from '@angular/core';
 import {{ RouterModule }} from '@angular/router';
 import {{ CommonModule }} from '@angular/common';
@@ -591,8 +1159,7 @@ export class AppComponent {{
   }}
 }}
 '''
-        with open(os.path.join(src_app_dir, "app.component.ts"), "w") as f:
-            f.write(ts_code)
+        self.output.write(os.path.join(src_app_dir, "app.component.ts"), ts_code)
 
         # app.component.html
         html_code = f'''<div class="flex h-screen bg-gray-100 font-sans">
@@ -620,8 +1187,7 @@ export class AppComponent {{
   </main>
 </div>
 '''
-        with open(os.path.join(src_app_dir, "app.component.html"), "w") as f:
-            f.write(html_code)
+        self.output.write(os.path.join(src_app_dir, "app.component.html"), html_code)
 
         # app.component.scss
         scss_code = '''
@@ -630,54 +1196,54 @@ export class AppComponent {{
   color: white;
 }
 '''
-        with open(os.path.join(src_app_dir, "app.component.scss"), "w") as f:
-            f.write(scss_code)
-
-    def _update_app_config(self, app_path):
-        app_config_path = os.path.join(app_path, "src", "app", "app.config.ts")
+        self.output.write(os.path.join(src_app_dir, "app.component.scss"), scss_code)
 
-        with open(app_config_path, "r") as f:
-            content = f.read()
+    @timed("frontend.app_config")
+    def _update_app_config(self, app_path, entities):
+        """Writes app.config.ts with the router, i18n and NGXS providers.
 
-        # Generate NGXS state imports
-        state_imports = []
-        state_classes = []
-        for entity in entities:
-            entity_name_cap = entity['name'].capitalize()
-            state_class = f"{entity_name_cap}State"
-            state_imports.append(f"import {{ {state_class} }} from './core/state/{entity['name'].lower()}/{entity['name'].lower()}.state';")
-            state_classes.append(state_class)
-
-        state_imports_str = "\n".join(state_imports)
-        state_classes_str = ", ".join(state_classes)
+        The whole file is rendered instead of patching the CLI version, so
+        re-running the generator produces identical bytes.
+        """
+        app_config_path = os.path.join(app_path, "src", "app", "app.config.ts")
 
-        # Add imports for i18n, NGXS, and other providers
-        imports_to_add = f\"\"\"import {{ provideRouter }} from '@angular/router';
+        # The entity states are registered by their lazy routes, so the root store starts empty.
+        preloading = self.project_config.get("preloading", "none")
+        router_imports = "provideRouter"
+        router_features = ""
+        preloading_import = ""
+        if preloading == "all":
+            router_imports = "provideRouter, withPreloading, PreloadAllModules"
+            router_features = ", withPreloading(PreloadAllModules)"
+        elif preloading == "selective":
+            router_imports = "provideRouter, withPreloading"
+            router_features = ", withPreloading(SelectivePreloadingStrategy)"
+            preloading_import = "import { SelectivePreloadingStrategy } from './core/routing/selective-preloading.strategy';\n"
+
+        content = f"""import {{ ApplicationConfig, importProvidersFrom }} from '@angular/core';
+import {{ {router_imports} }} from '@angular/router';
 import {{ routes }} from './app.routes';
-import {{ provideAnimations }} from '@angular/platform-browser/animations';
-import {{ provideHttpClient, HttpClient }} from '@angular/common/http';
-import {{ importProvidersFrom }} from '@angular/core';
+{preloading_import}import {{ provideAnimations }} from '@angular/platform-browser/animations';
+import {{ provideHttpClient, withInterceptors, HttpClient }} from '@angular/common/http';
 import {{ TranslateModule, TranslateLoader }} from '@ngx-translate/core';
 import {{ TranslateHttpLoader }} from '@ngx-translate/http-loader';
-import {{ NgxsModule }} from '@ngxs/store';
-import {{ NgxsLoggerPluginModule }} from '@ngxs/logger-plugin';
-import {{ NgxsReduxDevtoolsPluginModule }} from '@ngxs/devtools-plugin';
-{state_imports_str}
+import {{ provideStore }} from '@ngxs/store';
+import {{ withNgxsLoggerPlugin }} from '@ngxs/logger-plugin';
+import {{ withNgxsReduxDevtoolsPlugin }} from '@ngxs/devtools-plugin';
+import {{ cacheInterceptor }} from './core/http/cache.interceptor';
+import {{ etagInterceptor }} from './core/http/etag.interceptor';
 import {{ environment }} from '../environments/environment';
 
 export function HttpLoaderFactory(httpClient: HttpClient) {{
   return new TranslateHttpLoader(httpClient);
 }}
-\"\"\"
 
-        # Prepend the imports to be safe
-        content = imports_to_add + content
-
-        # Add providers
-        providers_to_add = f\"\"\"
-    provideRouter(routes),
+export const appConfig: ApplicationConfig = {{
+  providers: [
+    provideRouter(routes{router_features}),
     provideAnimations(),
-    provideHttpClient(),
+    // Cache hits and shared requests are answered before the ETag revalidation.
+    provideHttpClient(withInterceptors([cacheInterceptor, etagInterceptor])),
     importProvidersFrom(
       TranslateModule.forRoot({{
         loader: {{
@@ -685,33 +1251,41 @@ export function HttpLoaderFactory(httpClient: HttpClient) {{
           useFactory: HttpLoaderFactory,
           deps: [HttpClient]
         }}
-      }}),
-      NgxsModule.forRoot([{state_classes_str}], {{
-        developmentMode: !environment.production
-      }}),
-      NgxsLoggerPluginModule.forRoot({{
-        disabled: environment.production
-      }}),
-      NgxsReduxDevtoolsPluginModule.forRoot({{
-        disabled: environment.production
       }})
+    ),
+    provideStore(
+      [],
+      {{ developmentMode: !environment.production }},
+      withNgxsLoggerPlugin({{ disabled: environment.production }}),
+      withNgxsReduxDevtoolsPlugin({{ disabled: environment.production }})
     )
-\"\"\"
-        if "providers: [" in content:
-            content = content.replace(
-                "providers: [",
-                f"providers: [{providers_to_add},"
-            )
-        else:
-            # This case is unlikely with modern Angular CLI, but as a fallback
-            content = content.replace(
-                "providers: []",
-                f"providers: [{providers_to_add}]"
-            )
+  ]
+}};
+"""
+
+        self.output.write(app_config_path, content)
+
+        if preloading == "selective":
+            self._generate_preloading_strategy(app_path)
+
+    def _generate_preloading_strategy(self, app_path):
+        """Generates the strategy that preloads only the routes flagged with data.preload."""
+        strategy_path = os.path.join(app_path, "src", "app", "core", "routing", "selective-preloading.strategy.ts")
 
-        with open(app_config_path, "w") as f:
-            f.write(content)
+        content = """import { Injectable } from '@angular/core';
+import { PreloadingStrategy, Route } from '@angular/router';
+import { Observable, of } from 'rxjs';
 
+@Injectable({ providedIn: 'root' })
+export class SelectivePreloadingStrategy implements PreloadingStrategy {
+  preload(route: Route, load: () => Observable<unknown>): Observable<unknown> {
+    return route.data?.['preload'] ? load() : of(null);
+  }
+}
+"""
+        self.output.write(strategy_path, content)
+
+    @timed("frontend.styles")
     def _update_styles(self, app_path):
         styles_path = os.path.join(app_path, "src", "styles.scss")
 
@@ -726,27 +1300,30 @@ export function HttpLoaderFactory(httpClient: HttpClient) {{
 @import "primeng/resources/themes/lara-light-blue/theme.css";
 @import "primeng/resources/primeng.css";
 @import "primeicons/primeicons.css";
-@import "primeflex/primeflex.css";
 """
 
         final_styles = tailwind_directives + primeng_styles
 
-        with open(styles_path, "w") as f:
-            f.write(final_styles)
+        self.output.write(styles_path, final_styles)
 
+    @timed("frontend.storybook")
     def _setup_storybook(self, app_path):
         """Initializes Storybook in the generated project."""
-        self._log("Setting up Storybook...")
-        run_cmd("npx storybook init -y", cwd=app_path)
+        if os.path.isdir(os.path.join(app_path, ".storybook")):
+            self._log("Storybook already set up, skipping.")
+            return
 
-    def _map_ts_type(self, column_type):
-        if column_type == 'string':
-            return 'string'
-        elif column_type == 'number':
-            return 'number'
-        else:
-            return 'any'
+        self._log("Setting up Storybook...")
+        result = run_cmd(
+            f"npx {self.bootstrap.pin('@storybook/cli')} init -y",
+            cwd=app_path,
+            env=self.bootstrap.npm_env(),
+            timeout=self.bootstrap.storybook_timeout,
+        )
+        if result.timed_out:
+            self._log("Storybook setup timed out and was stopped; continuing without it.")
 
+    @timed("frontend.cypress")
     def _setup_cypress(self, app_path):
         """Sets up Cypress for E2E testing."""
         self._log("Setting up Cypress...")
@@ -763,25 +1340,21 @@ export default defineConfig({
   },
 });
 """
-        with open(cypress_config_path, "w") as f:
-            f.write(cypress_config_content)
+        self.output.write(cypress_config_path, cypress_config_content)
 
         # Update package.json scripts
         package_json_path = os.path.join(app_path, "package.json")
-        with open(package_json_path, "r+") as f:
-            package_json = json.load(f)
-            if "scripts" not in package_json:
-                package_json["scripts"] = {}
-            package_json["scripts"]["cy:open"] = "cypress open"
-            package_json["scripts"]["cy:run"] = "cypress run"
-            f.seek(0)
-            json.dump(package_json, f, indent=2)
-            f.truncate()
-
+        package_json = json.loads(self.output.read(package_json_path))
+        if "scripts" not in package_json:
+            package_json["scripts"] = {}
+        package_json["scripts"]["cy:open"] = "cypress open"
+        package_json["scripts"]["cy:run"] = "cypress run"
+        self.output.write(package_json_path, json.dumps(package_json, indent=2))
+
+    @timed("frontend.environments")
     def _generate_environment_files(self, app_path):
         """Generates environment files for the Angular application."""
         env_path = os.path.join(app_path, "src", "environments")
-        os.makedirs(env_path, exist_ok=True)
 
         # environment.ts
         env_content = """
@@ -790,8 +1363,7 @@ export const environment = {
   apiUrl: '/api'
 };
 """
-        with open(os.path.join(env_path, "environment.ts"), "w") as f:
-            f.write(env_content)
+        self.output.write(os.path.join(env_path, "environment.ts"), env_content)
 
         # environment.prod.ts
         prod_env_content = """
@@ -800,9 +1372,9 @@ export const environment = {
   apiUrl: 'https://your-production-api.com/api'
 };
 """
-        with open(os.path.join(env_path, "environment.prod.ts"), "w") as f:
-            f.write(prod_env_content)
+        self.output.write(os.path.join(env_path, "environment.prod.ts"), prod_env_content)
 
+    @timed("frontend.proxy")
     def _create_proxy_config(self, app_path):
         """Creates a proxy configuration file for the Angular dev server."""
         proxy_config_path = os.path.join(app_path, "proxy.conf.json")
@@ -815,68 +1387,78 @@ export const environment = {
           }
         }
 
-        with open(proxy_config_path, "w") as f:
-            json.dump(proxy_config_content, f, indent=2)
+        self.output.write(proxy_config_path, json.dumps(proxy_config_content, indent=2))
 
+    @timed("frontend.angular_json")
     def _update_angular_json(self, app_path):
         """Updates angular.json for proxy and environments."""
         angular_json_path = os.path.join(app_path, "angular.json")
 
-        with open(angular_json_path, "r+") as f:
-            angular_json = json.load(f)
-
-            project_name = self.project_config["app"]
-
-            if "projects" in angular_json and project_name in angular_json["projects"]:
-                # Proxy config
-                serve_options = angular_json["projects"][project_name]["architect"]["serve"]["options"]
-                serve_options["proxyConfig"] = "proxy.conf.json"
-
-                # File replacements for production build
-                build_prod_config = angular_json["projects"][project_name]["architect"]["build"]["configurations"]["production"]
-                if "fileReplacements" not in build_prod_config:
-                    build_prod_config["fileReplacements"] = []
-
-                build_prod_config["fileReplacements"].append({
-                  "replace": "src/environments/environment.ts",
-                  "with": "src/environments/environment.prod.ts"
-                })
-
-            f.seek(0)
-            json.dump(angular_json, f, indent=2)
-            f.truncate()
-
+        angular_json = json.loads(self.output.read(angular_json_path))
+
+        project_name = self.project_config["app"]
+
+        if "projects" in angular_json and project_name in angular_json["projects"]:
+            # Proxy config
+            serve_options = angular_json["projects"][project_name]["architect"]["serve"]["options"]
+            serve_options["proxyConfig"] = "proxy.conf.json"
+
+            # File replacements for production build
+            build_prod_config = angular_json["projects"][project_name]["architect"]["build"]["configurations"]["production"]
+            if "fileReplacements" not in build_prod_config:
+                build_prod_config["fileReplacements"] = []
+
+            replacement = {
+              "replace": "src/environments/environment.ts",
+              "with": "src/environments/environment.prod.ts"
+            }
+            # Re-running the generator must not append the same replacement again.
+            if replacement not in build_prod_config["fileReplacements"]:
+                build_prod_config["fileReplacements"].append(replacement)
+
+            build_prod_config["budgets"] = PRODUCTION_BUDGETS
+            build_prod_config["optimization"] = {
+                "scripts": True,
+                "styles": {"minify": True, "inlineCritical": True},
+            }
+            build_prod_config["outputHashing"] = "all"
+            build_prod_config["sourceMap"] = False
+            build_prod_config["namedChunks"] = False
+            build_prod_config["extractLicenses"] = True
+
+        self.output.write(angular_json_path, json.dumps(angular_json, indent=2))
+
+    @timed("frontend.i18n")
     def _generate_translation_files(self, app_path):
         """Generates i18n translation files."""
         i18n_path = os.path.join(app_path, "src", "assets", "i18n")
-        os.makedirs(i18n_path, exist_ok=True)
 
         en_json_path = os.path.join(i18n_path, "en.json")
 
         translations = {}
-        with open(self.entities_file, "r") as f:
-            entities = json.load(f)["entities"]
-
-        for entity in entities:
-            entity_name_upper = entity['name'].upper()
-            translations[f"{entity_name_upper}_FORM_TITLE"] = f"{entity['name']} Form"
-            for col in entity['columns']:
-                col_name_upper = col['name'].upper()
-                translations[f"FIELD_{col_name_upper}"] = col['name'].capitalize()
+        for entity in self.schema.entities:
+            entity_name_upper = entity.upper
+            translations[f"{entity_name_upper}_FORM_TITLE"] = f"{entity.name} Form"
+            translations[f"{entity_name_upper}_LIST_TITLE"] = f"{entity.name} List"
+            for col in entity.columns:
+                col_name_upper = col.upper
+                translations[f"FIELD_{col_name_upper}"] = col.name.capitalize()
 
         translations["SAVE_BUTTON"] = "Save"
 
-        with open(en_json_path, "w") as f:
-            json.dump(translations, f, indent=2)
+        self.output.write(en_json_path, json.dumps(translations, indent=2))
 
+    @timed("frontend.tailwind")
     def _generate_tailwind_config(self, app_path):
         """Creates a tailwind.config.js file."""
         config_path = os.path.join(app_path, "tailwind.config.js")
 
         config_content = """
 module.exports = {
+  // Only the templates are scanned, so the CSS holds just the utilities they use.
   content: [
-    "./src/**/*.{html,ts}",
+    "./src/index.html",
+    "./src/app/**/*.html",
   ],
   theme: {
     extend: {},
@@ -885,18 +1467,73 @@ module.exports = {
 };
 """
 
-        with open(config_path, "w") as f:
-            f.write(config_content)
+        self.output.write(config_path, config_content)
 
+    @timed("frontend.compodoc")
     def _add_compodoc_script(self, app_path):
         """Adds a script to package.json to run Compodoc."""
         package_json_path = os.path.join(app_path, "package.json")
 
-        with open(package_json_path, "r+") as f:
-            package_json = json.load(f)
-            if "scripts" not in package_json:
-                package_json["scripts"] = {}
-            package_json["scripts"]["compodoc"] = "npx compodoc -p src/tsconfig.app.json -s"
-            f.seek(0)
-            json.dump(package_json, f, indent=2)
-            f.truncate()
+        package_json = json.loads(self.output.read(package_json_path))
+        if "scripts" not in package_json:
+            package_json["scripts"] = {}
+        package_json["scripts"]["compodoc"] = "npx compodoc -p src/tsconfig.app.json -s"
+        self.output.write(package_json_path, json.dumps(package_json, indent=2))
+
+    @timed("frontend.precompress")
+    def _add_precompress_step(self, app_path):
+        """Adds the post-build script that precompresses the production bundle."""
+        package_json_path = os.path.join(app_path, "package.json")
+
+        package_json = json.loads(self.output.read(package_json_path))
+        if "scripts" not in package_json:
+            package_json["scripts"] = {}
+        # npm runs it after every "npm run build".
+        package_json["scripts"]["postbuild"] = "node scripts/precompress.mjs"
+        self.output.write(package_json_path, json.dumps(package_json, indent=2))
+
+        self._generate_precompress_script(app_path)
+
+    def _generate_precompress_script(self, app_path):
+        """Generates the post-build script that writes .gz and .br copies of the static assets."""
+        script_path = os.path.join(app_path, "scripts", "precompress.mjs")
+
+        script_content = f"""// Writes .gz and .br next to every text asset of the production build, so nginx
+// serves them with gzip_static/brotli_static instead of compressing on each request.
+import {{ readdirSync, readFileSync, statSync, writeFileSync }} from 'node:fs';
+import {{ extname, join }} from 'node:path';
+import {{ brotliCompressSync, constants, gzipSync }} from 'node:zlib';
+
+const root = 'dist/{self.project_config["app"]}/browser';
+const extensions = new Set(['.js', '.mjs', '.css', '.html', '.svg', '.json', '.txt', '.ico']);
+const minSize = 1024;
+
+function compress(path) {{
+  const content = readFileSync(path);
+  const gzip = gzipSync(content, {{ level: 9 }});
+  const brotli = brotliCompressSync(content, {{
+    params: {{ [constants.BROTLI_PARAM_QUALITY]: constants.BROTLI_MAX_QUALITY }}
+  }});
+  if (gzip.length < content.length) {{
+    writeFileSync(`${{path}}.gz`, gzip);
+  }}
+  if (brotli.length < content.length) {{
+    writeFileSync(`${{path}}.br`, brotli);
+  }}
+}}
+
+function walk(dir) {{
+  for (const name of readdirSync(dir)) {{
+    const path = join(dir, name);
+    const stats = statSync(path);
+    if (stats.isDirectory()) {{
+      walk(path);
+    }} else if (extensions.has(extname(name)) && stats.size >= minSize) {{
+      compress(path);
+    }}
+  }}
+}}
+
+walk(root);
+"""
+        self.output.write(script_path, script_content)
@@ -1,19 +1,31 @@
 import os
 import yaml
+from bootstrap import ToolBootstrap
+from instrumentation import timed
+from manifest import GenerationManifest
+from output_tree import OutputTree
 from utils import run_cmd
 
 class MobileGenerator:
-    def __init__(self, root_dir, project_config):
+    def __init__(self, root_dir, schema, project_config, manifest=None, output=None):
         self.root_dir = root_dir
+        self.schema = schema
         self.project_config = project_config
+        self.manifest = manifest or GenerationManifest(root_dir)
+        self.owns_output = output is None
+        self.output = output or OutputTree(root_dir, self.manifest)
+        self.bootstrap = ToolBootstrap.from_config(project_config)
 
     def generate(self):
         self._log("Starting Flutter mobile app generation...")
         self._create_flutter_project()
         self._add_flutter_dependencies()
         self._generate_flutter_files()
+        if self.owns_output:
+            self.output.flush()
         self._log("Flutter mobile app generation complete.")
 
+    @timed("mobile.dependencies")
     def _add_flutter_dependencies(self):
         """Adds http and provider dependencies to pubspec.yaml."""
         app_name = self.project_config["mobile_app"]
@@ -21,8 +33,7 @@ class MobileGenerator:
 
         self._log("Adding dependencies to pubspec.yaml...")
 
-        with open(pubspec_path, "r") as f:
-            pubspec_data = yaml.safe_load(f)
+        pubspec_data = yaml.safe_load(self.output.read(pubspec_path))
 
         if "dependencies" not in pubspec_data:
             pubspec_data["dependencies"] = {}
@@ -30,59 +41,77 @@ class MobileGenerator:
         pubspec_data["dependencies"]["http"] = "^1.1.0"
         pubspec_data["dependencies"]["provider"] = "^6.0.5"
 
-        with open(pubspec_path, "w") as f:
-            yaml.dump(pubspec_data, f, default_flow_style=False)
+        self.output.write(pubspec_path, yaml.dump(pubspec_data, default_flow_style=False))
 
+    @timed("mobile.create")
     def _create_flutter_project(self):
         """Creates a new Flutter project."""
         mobile_path = os.path.join(self.root_dir, "mobile")
         os.makedirs(mobile_path, exist_ok=True)
         app_name = self.project_config["mobile_app"]
-        self._log(f"Creating Flutter project: {app_name}...")
-        run_cmd(f"flutter create {app_name}", cwd=mobile_path)
+        if self.bootstrap.is_flutter_scaffolded(os.path.join(mobile_path, app_name)):
+            self._log(f"Flutter project {app_name} already exists, reusing it.")
+            return
 
+        self._log(f"Creating Flutter project: {app_name}...")
+        run_cmd(
+            f"flutter create {self.bootstrap.flutter_flags()} {app_name}",
+            cwd=mobile_path,
+            env=self.bootstrap.flutter_env(),
+            timeout=self.bootstrap.command_timeout,
+            check=True,
+        )
+
+    @timed("mobile.files")
     def _generate_flutter_files(self):
         """Generates all the necessary files for the Flutter app."""
         app_name = self.project_config["mobile_app"]
         lib_path = os.path.join(self.root_dir, "mobile", app_name, "lib")
 
-        with open("entities.json", "r") as f:
-            entities = json.load(f)["entities"]
+        entities = self.schema.entities
 
+        context = self.manifest.render_context(self.project_config, __file__)
         for entity in entities:
-            entity_name = entity["name"]
+            entity_name = entity.name
+            fingerprint = self.manifest.fingerprint(entity.raw, context)
+            if self.manifest.is_entity_current("mobile", entity_name, fingerprint):
+                self._log(f"{entity_name} unchanged, skipping.")
+                continue
+
             self._log(f"Generating files for {entity_name}...")
 
-            # Create directories
+            # Output directories (created when the tree is flushed)
             models_path = os.path.join(lib_path, "models")
             services_path = os.path.join(lib_path, "services")
             providers_path = os.path.join(lib_path, "providers")
             screens_path = os.path.join(lib_path, "screens")
-            os.makedirs(models_path, exist_ok=True)
-            os.makedirs(services_path, exist_ok=True)
-            os.makedirs(providers_path, exist_ok=True)
-            os.makedirs(screens_path, exist_ok=True)
 
-            self._generate_flutter_model(entity, models_path)
-            self._generate_flutter_service(entity, services_path)
-            self._generate_flutter_provider(entity, providers_path)
-            self._generate_entity_list_screen(entity, screens_path)
+            with self.manifest.rendering("mobile", entity_name, fingerprint):
+                self._generate_flutter_model(entity, models_path)
+                self._generate_flutter_service(entity, services_path)
+                self._generate_flutter_provider(entity, providers_path)
+                self._generate_entity_list_screen(entity, screens_path)
 
         self._update_main_dart(lib_path, entities)
 
     def _generate_flutter_model(self, entity, models_path):
         """Generates a Dart model class for an entity."""
-        entity_name = entity["name"]
-        file_path = os.path.join(models_path, f"{entity_name.lower()}_model.dart")
+        entity_name = entity.name
+        file_path = os.path.join(models_path, f"{entity.lower}_model.dart")
 
         fields = []
-        for col in entity["columns"]:
-            dart_type = self._map_dart_type(col['type'])
-            fields.append(f"  final {dart_type} {col['name']};")
+        for col in entity.columns:
+            fields.append(f"  final {col.dart_type} {col.name};")
 
         fields_str = "\n".join(fields)
 
-        constructor_params = ",\n".join([f"    required this.{col['name']}" for col in entity["columns"]])
+        constructor_params = ",\n".join([f"    required this.{col.name}" for col in entity.columns])
+        from_json = []
+        for col in entity.columns:
+            # Dates arrive as ISO-8601 strings and decimals as any JSON number.
+            value = f"json['{col.name}']"
+            from_json.append(f"{col.name}: {col.dart_parse.format(value=value)}")
+        from_json_str = ", ".join(from_json)
 
         model_content = f"""
 class {entity_name} {{
@@ -94,64 +123,85 @@ class {entity_name} {{
 
   factory {entity_name}.fromJson(Map<String, dynamic> json) {{
     return {entity_name}(
-      {', '.join([f"{col['name']}: json['{col['name']}']" for col in entity["columns"]])}
+      {from_json_str}
     );
   }}
 }}
 """
-        with open(file_path, "w") as f:
-            f.write(model_content)
+        self.output.write(file_path, model_content)
 
     def _generate_flutter_service(self, entity, services_path):
         """Generates a Dart service class for an entity."""
-        entity_name = entity["name"]
-        file_path = os.path.join(services_path, f"{entity_name.lower()}_service.dart")
+        entity_name = entity.name
+        file_path = os.path.join(services_path, f"{entity.lower}_service.dart")
 
         service_content = f"""
 import 'dart:convert';
 import 'package:http/http.dart' as http;
-import '../models/{entity_name.lower()}_model.dart';
+import '../models/{entity.lower}_model.dart';
 
-class {entity_name}Service {{
-  final String _baseUrl = 'http://10.0.2.2:8080/api/{entity_name.lower()}s'; // 10.0.2.2 for Android emulator
+class _CachedPage {{
+  final String etag;
+  final List<{entity_name}> items;
+
+  _CachedPage(this.etag, this.items);
+}}
 
-  Future<List<{entity_name}>> getAll() async {{
-    final response = await http.get(Uri.parse(_baseUrl));
+class {entity_name}Service {{
+  final String _baseUrl = 'http://10.0.2.2:8080/api/{entity.plural}'; // 10.0.2.2 for Android emulator
+  // Last page per URL with its ETag; a 304 reuses it instead of downloading the list again.
+  final Map<Uri, _CachedPage> _cache = {{}};
+
+  Future<List<{entity_name}>> getAll({{int page = 0, int size = {entity.page_size}}}) async {{
+    final uri = Uri.parse(_baseUrl).replace(queryParameters: {{'page': '$page', 'size': '$size'}});
+    final cached = _cache[uri];
+    final response = await http.get(
+      uri,
+      headers: cached == null ? null : {{'If-None-Match': cached.etag}},
+    );
+    if (response.statusCode == 304 && cached != null) {{
+      return cached.items;
+    }}
     if (response.statusCode == 200) {{
-      List<dynamic> data = json.decode(response.body);
-      return data.map((json) => {entity_name}.fromJson(json)).toList();
+      // The list endpoint returns a Spring Data page; the items are in 'content'.
+      List<dynamic> data = json.decode(response.body)['content'];
+      final items = data.map((json) => {entity_name}.fromJson(json)).toList();
+      final etag = response.headers['etag'];
+      if (etag != null) {{
+        _cache[uri] = _CachedPage(etag, items);
+      }}
+      return items;
     }} else {{
-      throw Exception('Failed to load {entity_name.lower()}s');
+      throw Exception('Failed to load {entity.plural}');
     }}
   }}
 }}
 """
-        with open(file_path, "w") as f:
-            f.write(service_content)
+        self.output.write(file_path, service_content)
 
     def _generate_flutter_provider(self, entity, providers_path):
         """Generates a Dart provider class for an entity."""
-        entity_name = entity["name"]
-        file_path = os.path.join(providers_path, f"{entity_name.lower()}_provider.dart")
+        entity_name = entity.name
+        file_path = os.path.join(providers_path, f"{entity.lower}_provider.dart")
 
         provider_content = f"""
 import 'package:flutter/material.dart';
-import '../models/{entity_name.lower()}_model.dart';
-import '../services/{entity_name.lower()}_service.dart';
+import '../models/{entity.lower}_model.dart';
+import '../services/{entity.lower}_service.dart';
 
 class {entity_name}Provider with ChangeNotifier {{
   final _{entity_name}Service = {entity_name}Service();
-  List<{entity_name}> _{entity_name.lower()}s = [];
+  List<{entity_name}> _{entity.plural} = [];
   bool _isLoading = false;
 
-  List<{entity_name}> get {entity_name.lower()}s => _{entity_name.lower()}s;
+  List<{entity_name}> get {entity.plural} => _{entity.plural};
   bool get isLoading => _isLoading;
 
   Future<void> fetch{entity_name}s() async {{
     _isLoading = true;
     notifyListeners();
     try {{
-      _{entity_name.lower()}s = await _{entity_name}Service.getAll();
+      _{entity.plural} = await _{entity_name}Service.getAll();
     }} catch (error) {{
       // Handle error
     }} finally {{
@@ -161,18 +211,17 @@ class {entity_name}Provider with ChangeNotifier {{
   }}
 }}
 """
-        with open(file_path, "w") as f:
-            f.write(provider_content)
+        self.output.write(file_path, provider_content)
 
     def _generate_entity_list_screen(self, entity, screens_path):
         """Generates a Flutter screen to list entities."""
-        entity_name = entity["name"]
-        file_path = os.path.join(screens_path, f"{entity_name.lower()}_list_screen.dart")
+        entity_name = entity.name
+        file_path = os.path.join(screens_path, f"{entity.lower}_list_screen.dart")
 
         list_screen_content = f"""
 import 'package:flutter/material.dart';
 import 'package:provider/provider.dart';
-import '../providers/{entity_name.lower()}_provider.dart';
+import '../providers/{entity.lower}_provider.dart';
 
 class {entity_name}ListScreen extends StatefulWidget {{
   @override
@@ -200,9 +249,9 @@ class _{entity_name}ListScreenState extends State<{entity_name}ListScreen> {{
             return Center(child: CircularProgressIndicator());
           }}
           return ListView.builder(
-            itemCount: provider.{entity_name.lower()}s.length,
+            itemCount: provider.{entity.plural}.length,
             itemBuilder: (context, index) {{
-              final item = provider.{entity_name.lower()}s[index];
+              final item = provider.{entity.plural}[index];
               return ListTile(
                 title: Text(item.name), // Assumes a 'name' field
               );
@@ -214,27 +263,26 @@ class _{entity_name}ListScreenState extends State<{entity_name}ListScreen> {{
   }}
 }}
 """
-        with open(file_path, "w") as f:
-            f.write(list_screen_content)
+        self.output.write(file_path, list_screen_content)
 
     def _update_main_dart(self, lib_path, entities):
         """Updates the main.dart file to set up providers and routes."""
         main_dart_path = os.path.join(lib_path, "main.dart")
 
-        provider_imports = "\n".join([f"import 'providers/{entity['name'].lower()}_provider.dart';" for entity in entities])
-        screen_imports = "\n".join([f"import 'screens/{entity['name'].lower()}_list_screen.dart';" for entity in entities])
+        provider_imports = "\n".join([f"import 'providers/{entity.lower}_provider.dart';" for entity in entities])
+        screen_imports = "\n".join([f"import 'screens/{entity.lower}_list_screen.dart';" for entity in entities])
 
-        providers = ",\n        ".join([f"ChangeNotifierProvider(create: (_) => {entity['name']}Provider())" for entity in entities])
+        providers = ",\n        ".join([f"ChangeNotifierProvider(create: (_) => {entity.name}Provider())" for entity in entities])
 
-        routes = ",\n        ".join([f"'/{{entity['name'].lower()}}s': (context) => {entity['name']}ListScreen()" for entity in entities])
+        routes = ",\n        ".join([f"'/{entity.plural}': (context) => {entity.name}ListScreen()" for entity in entities])
 
         home_screen_buttons = "\n".join([f"""
             ElevatedButton(
-              child: Text('View {entity['name']}s'),
-              onPressed: () => Navigator.pushNamed(context, '/{entity['name'].lower()}s'),
+              child: Text('View {entity.name}s'),
+              onPressed: () => Navigator.pushNamed(context, '/{entity.plural}'),
             ),""" for entity in entities])
 
-        main_dart_content = f\"\"\"
+        main_dart_content = f"""
 import 'package:flutter/material.dart';
 import 'package:provider/provider.dart';
 {provider_imports}
@@ -283,17 +331,8 @@ class HomeScreen extends StatelessWidget {{
     );
   }}
 }}
-\"\"\"
-        with open(main_dart_path, "w") as f:
-            f.write(main_dart_content)
-
-    def _map_dart_type(self, column_type):
-        if column_type == 'string':
-            return 'String'
-        elif column_type == 'number':
-            return 'int' # Or double
-        else:
-            return 'dynamic'
+"""
+        self.output.write(main_dart_path, main_dart_content)
 
     def _log(self, message):
         print(f"[MobileGenerator] {message}")
@@ -0,0 +1,163 @@
+import cProfile
+import functools
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Recorder:
+    """Collects timing events for generator steps and external commands.
+
+    Every span records wall time, the CPU time of the running thread and any
+    extra fields (exit code, output size). Optionally each scheduler step runs
+    under its own cProfile profiler, and tracemalloc reports per-span memory.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.profile = False
+        self.trace_memory = False
+        self._profiles = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def reset(self, profile=False, trace_memory=False):
+        with self._lock:
+            self.events = []
+            self._profiles = []
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self._origin = time.perf_counter()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def span(self, name, category="step", **fields):
+        """Times the enclosed block; fields may be updated inside it (e.g. the exit code)."""
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        memory_start = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        try:
+            yield fields
+        finally:
+            event = {
+                "name": name,
+                "category": category,
+                "start": start - self._origin,
+                "wall": time.perf_counter() - start,
+                "cpu": time.thread_time() - cpu_start,
+                "thread": threading.current_thread().name,
+                "tid": threading.get_ident(),
+            }
+            if memory_start is not None and tracemalloc.is_tracing():
+                event["memory_delta"] = tracemalloc.get_traced_memory()[0] - memory_start
+            event.update(fields)
+            with self._lock:
+                self.events.append(event)
+
+    @contextmanager
+    def step(self, name):
+        """A scheduler step: a span, profiled with cProfile when profiling is on."""
+        with self.span(name, category="scheduler"):
+            if not self.profile:
+                yield
+                return
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                with self._lock:
+                    self._profiles.append(profiler)
+
+    def summary(self):
+        """Total wall/CPU time per category, plus the slowest events."""
+        totals = {}
+        for event in self.events:
+            total = totals.setdefault(event["category"], {"count": 0, "wall": 0.0, "cpu": 0.0})
+            total["count"] += 1
+            total["wall"] += event["wall"]
+            total["cpu"] += event["cpu"]
+        slowest = sorted(self.events, key=lambda e: e["wall"], reverse=True)[:10]
+        summary = {"categories": totals, "slowest": [{"name": e["name"], "wall": e["wall"]} for e in slowest]}
+        if tracemalloc.is_tracing():
+            summary["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        return summary
+
+    def export_json(self, path):
+        with open(path, "w") as f:
+            json.dump({"events": self.events, "summary": self.summary()}, f, indent=2)
+
+    def export_chrome_trace(self, path):
+        """Writes the events in the Chrome trace format (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        trace_events = []
+        thread_names = {}
+        for event in self.events:
+            thread_names[event["tid"]] = event["thread"]
+            args = {k: v for k, v in event.items() if k not in ("name", "category", "start", "wall", "tid", "thread")}
+            trace_events.append({
+                "name": event["name"],
+                "cat": event["category"],
+                "ph": "X",
+                "ts": round(event["start"] * 1e6),
+                "dur": round(event["wall"] * 1e6),
+                "pid": pid,
+                "tid": event["tid"],
+                "args": args,
+            })
+        for tid, thread_name in thread_names.items():
+            trace_events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+
+    def export(self, path):
+        """Exports as a Chrome trace when the file name ends in .trace.json, else as plain JSON."""
+        if path.endswith(".trace.json"):
+            self.export_chrome_trace(path)
+        else:
+            self.export_json(path)
+
+    def dump_profile(self, path):
+        """Merges the per-step profiles into a single pstats file."""
+        with self._lock:
+            profiles = list(self._profiles)
+        if not profiles:
+            return False
+        stats = pstats.Stats(profiles[0])
+        for profiler in profiles[1:]:
+            stats.add(profiler)
+        stats.dump_stats(path)
+        return True
+
+    def print_summary(self):
+        summary = self.summary()
+        for category, total in sorted(summary["categories"].items()):
+            self._log(f"{category}: {total['count']} events, {total['wall']:.2f}s wall, {total['cpu']:.2f}s CPU")
+        for event in summary["slowest"][:5]:
+            self._log(f"  {event['wall']:8.2f}s  {event['name']}")
+        if "peak_memory" in summary:
+            self._log(f"Peak traced memory: {summary['peak_memory'] / (1024 * 1024):.1f} MiB")
+
+    def _log(self, message):
+        print(f"[Instrumentation] {message}")
+
+
+recorder = Recorder()
+
+
+def timed(name):
+    """Decorator recording a generator step method as a span."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with recorder.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -3,32 +3,88 @@ from generators.backend_generator import BackendGenerator
 from generators.project_initializer import ProjectInitializer
 from generators.cicd_generator import CiCdGenerator
 from generators.mobile_generator import MobileGenerator
-import json
+from instrumentation import recorder
+from manifest import GenerationManifest
+from output_tree import OutputTree
+from scheduler import StepScheduler
+from schema import load_schema, load_project_config
+import argparse
 
 class CodeGenerator:
-    def __init__(self, entities_file="entities.json", project_file="project.json"):
+    def __init__(self, entities_file="entities.json", project_file="project.json", workers=None, offline=False, archive=None):
         self.entities_file = entities_file
         self.project_file = project_file
-        self.project_config = self._load_project_config()
+        self.project_config = load_project_config(project_file)
+        if offline:
+            self.project_config["offline"] = True
+        self.schema = load_schema(entities_file)
         self.root_dir = self.project_config["name"]
+        self.workers = workers or self.project_config.get("workers")
+        self.archive = archive
 
-        self.initializer = ProjectInitializer(self.root_dir ,project_file)
-        self.frontend = FrontendGenerator(self.root_dir, entities_file, self.project_config)
-        self.backend = BackendGenerator(self.root_dir, entities_file, self.project_config)
-        self.cicd = CiCdGenerator(self.root_dir, self.project_config)
-        self.mobile = MobileGenerator(self.root_dir, self.project_config)
+        # An archive is always complete, so nothing may be skipped as "unchanged on disk".
+        self.manifest = GenerationManifest(self.root_dir, load=archive is None)
+        self.output = OutputTree(self.root_dir, self.manifest)
 
-    def _load_project_config(self):
-        with open(self.project_file, "r") as file:
-            return json.load(file)["project"]
-        
-    def generate(self):
-        self.initializer.create_base_structure()
-        self.frontend.generate()
-        self.backend.generate()
-        self.cicd.generate()
-        self.mobile.generate()
+        self.initializer = ProjectInitializer(self.root_dir, self.project_config)
+        self.frontend = FrontendGenerator(self.root_dir, self.schema, self.project_config, self.manifest, self.output)
+        self.backend = BackendGenerator(self.root_dir, self.schema, self.project_config, self.manifest, self.output)
+        self.cicd = CiCdGenerator(self.root_dir, self.project_config, self.manifest, self.output)
+        self.mobile = MobileGenerator(self.root_dir, self.schema, self.project_config, self.manifest, self.output)
+
+    def _build_scheduler(self, workers=None):
+        """Declares the generator steps and the steps each one needs to run after."""
+        scheduler = StepScheduler(max_workers=workers or self.workers)
+        scheduler.add("init", self.initializer.create_base_structure)
+        scheduler.add("frontend", self.frontend.generate, depends_on=["init"])
+        scheduler.add("backend", self.backend.generate, depends_on=["init"])
+        scheduler.add("mobile", self.mobile.generate, depends_on=["init"])
+        # The Dockerfiles and nginx.conf are written inside the scaffolded projects.
+        scheduler.add("cicd.frontend", self.cicd.generate_frontend_files, depends_on=["frontend"])
+        scheduler.add("cicd.backend", self.cicd.generate_backend_files, depends_on=["backend"])
+        scheduler.add("cicd.stack", self.cicd.generate_stack_files, depends_on=["init"])
+        return scheduler
+
+    def generate(self, trace_path=None, profile_path=None, trace_memory=False):
+        recorder.reset(profile=profile_path is not None, trace_memory=trace_memory)
+        try:
+            with recorder.span("generate", category="run"):
+                # Python 3.12+ allows only one active profiler per process, so profiled steps run one at a time.
+                self._build_scheduler(workers=1 if profile_path else None).run()
+        finally:
+            if self.archive:
+                self.output.write_archive(self.archive)
+            else:
+                # Flushed and saved even after a failure, so finished entities are not re-rendered next time.
+                self.output.flush()
+                self.manifest.save()
+            recorder.print_summary()
+            if trace_path:
+                recorder.export(trace_path)
+            if profile_path and recorder.dump_profile(profile_path):
+                print(f"[CodeGenerator] Profile written to {profile_path}")
 
 if __name__ == "__main__":
-    generator = CodeGenerator()
-    generator.generate()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generates a full-stack application from entities.json.")
+    parser.add_argument("--entities", default="entities.json", help="Path to the entities definition file.")
+    parser.add_argument("--project", default="project.json", help="Path to the project configuration file.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of generator steps to run in parallel.")
+    parser.add_argument("--offline", action="store_true", help="Never download; use cached packages and templates only.")
+    parser.add_argument("--trace", help="Write step and command timings to this file (*.trace.json for Chrome trace format).")
+    parser.add_argument("--profile", help="Profile every step with cProfile and write the merged stats to this file.")
+    parser.add_argument("--trace-memory", action="store_true", help="Track Python memory per step with tracemalloc.")
+    parser.add_argument("--archive", help="Write the generated project to this .zip/.tar/.tar.gz file instead of the project directory.")
+    parser.add_argument("--seed-starter-cache", action="store_true", help="Download the Spring starter into the local cache and exit.")
+    parser.add_argument("--warm-caches", action="store_true", help="Fill the Spring starter and npm caches concurrently and exit.")
+    args = parser.parse_args()
+
+    generator = CodeGenerator(args.entities, args.project, workers=args.workers, offline=args.offline, archive=args.archive)
+    if args.seed_starter_cache:
+        generator.backend.seed_starter_cache()
+    elif args.warm_caches:
+        generator.backend.seed_starter_cache()
+        failed = generator.frontend.bootstrap.warm_npm_cache()
+        for result in failed:
+            print(f"[CodeGenerator] Could not cache: {result.cmd}")
+    else:
+        generator.generate(trace_path=args.trace, profile_path=args.profile, trace_memory=args.trace_memory)
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+import schema
+
+
+class GenerationManifest:
+    """Records what the last generation produced so the next one can be incremental.
+
+    The manifest stores the sha256 and size of every written file plus, per target
+    and entity, a fingerprint of the inputs and the list of files rendered from it.
+    """
+
+    FILE_NAME = ".generator-manifest.json"
+
+    def __init__(self, root_dir, load=True):
+        self.root_dir = root_dir
+        self.path = os.path.join(root_dir, self.FILE_NAME)
+        self.files = {}
+        self.entities = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._source_digests = {}
+        if load:
+            self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        self.files = data.get("files", {})
+        self.entities = data.get("entities", {})
+
+    def save(self):
+        os.makedirs(self.root_dir, exist_ok=True)
+        with self._lock:
+            data = {"files": self.files, "entities": self.entities}
+            content = json.dumps(data, indent=2, sort_keys=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, self.path)
+
+    def is_recorded(self, path, digest, size):
+        """True if path was last written with this digest and still has that size on disk."""
+        with self._lock:
+            entry = self.files.get(self._key(path))
+        if entry is None or entry["sha256"] != digest:
+            return False
+        try:
+            return os.path.getsize(path) == size
+        except OSError:
+            return False
+
+    def record(self, path, digest, size):
+        key = self._key(path)
+        with self._lock:
+            self.files[key] = {"sha256": digest, "size": size}
+
+    def track(self, path):
+        """Attributes path to the entity being rendered on this thread, if any."""
+        rendered = getattr(self._local, "rendered", None)
+        if rendered is not None:
+            rendered.append(self._key(path))
+
+    def source_digest(self, source_file):
+        """Hash of a generator module, so template edits invalidate its entities."""
+        if source_file not in self._source_digests:
+            with open(source_file, "rb") as f:
+                self._source_digests[source_file] = hashlib.sha256(f.read()).hexdigest()
+        return self._source_digests[source_file]
+
+    def render_context(self, project_config, *source_files):
+        """Fingerprint context shared by a target's entities.
+
+        schema.py is always part of it, since the entity model and its defaults live there.
+        """
+        sources = [schema.__file__, *source_files]
+        return [project_config, *(self.source_digest(source) for source in sources)]
+
+    def fingerprint(self, entity, context):
+        payload = json.dumps([entity, context], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def is_entity_current(self, target, name, fingerprint):
+        """True if the entity's inputs are unchanged and all its files are still in place."""
+        with self._lock:
+            entry = self.entities.get(target, {}).get(name)
+            if entry is None or entry["fingerprint"] != fingerprint:
+                return False
+            files = [(key, self.files.get(key)) for key in entry["files"]]
+        for key, file_entry in files:
+            if file_entry is None:
+                return False
+            try:
+                if os.path.getsize(os.path.join(self.root_dir, key)) != file_entry["size"]:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    @contextmanager
+    def rendering(self, target, name, fingerprint):
+        """Attributes the files written inside the block to an entity of a target."""
+        self._local.rendered = []
+        try:
+            yield
+            with self._lock:
+                self.entities.setdefault(target, {})[name] = {
+                    "fingerprint": fingerprint,
+                    "files": sorted(set(self._local.rendered)),
+                }
+        finally:
+            self._local.rendered = None
+
+    def _key(self, path):
+        return os.path.relpath(path, self.root_dir).replace(os.sep, "/")
@@ -0,0 +1,182 @@
+import json
+import os
+import re
+from schema import index_name
+
+# Stored next to pom.xml; it describes the schema the existing migrations create.
+SNAPSHOT_FILE = ".generator-schema.json"
+MIGRATION_DIR = os.path.join("src", "main", "resources", "db", "migration")
+
+
+def build_snapshot(schema, sequence_increment):
+    """Describes the tables, sequences and indexes the entities map to."""
+    tables = {}
+    types = {}
+    for entity in schema.entities:
+        types.update((col.sql_type, col.enum_values) for col in entity.columns if col.is_pg_enum)
+        # The id and the @Version column are always generated, even when entities.json does not list them.
+        columns = {"id": "BIGINT", "version": "BIGINT NOT NULL DEFAULT 0"}
+        columns.update((col.sql_name, col.sql_type) for col in entity.columns if not col.is_id)
+        columns.update((relation.join_column, "BIGINT") for relation in entity.many_to_one_relations)
+        tables[entity.table] = {
+            "columns": columns,
+            "sequence": {"name": f"{entity.table}_seq", "increment": sequence_increment},
+            "indexes": {index.name: {"columns": index.columns, "unique": index.unique} for index in entity.indexes},
+            "foreign_keys": {
+                index_name("fk", entity.table, [relation.join_column]): _foreign_key(relation.join_column, relation.target.table)
+                for relation in entity.many_to_one_relations
+            },
+        }
+        for relation in entity.many_to_many_relations:
+            tables[relation.join_table] = _join_table(relation, entity.table)
+    return {"types": types, "tables": tables}
+
+
+def _foreign_key(column, references, on_delete=None):
+    spec = {"column": column, "references": references}
+    if on_delete:
+        spec["on_delete"] = on_delete
+    return spec
+
+
+def _join_table(relation, owner_table):
+    owner, inverse = relation.owner_column, relation.inverse_column
+    table = relation.join_table
+    return {
+        "columns": {owner: "BIGINT NOT NULL", inverse: "BIGINT NOT NULL"},
+        "primary_key": [owner, inverse],
+        # The primary key serves lookups by owner; the other side needs its own index.
+        "indexes": {index_name("idx", table, [inverse]): {"columns": [inverse], "unique": False}},
+        # Link rows go with either side, so bulk deletes of the entities do not fail on them.
+        "foreign_keys": {
+            index_name("fk", table, [owner]): _foreign_key(owner, owner_table, "CASCADE"),
+            index_name("fk", table, [inverse]): _foreign_key(inverse, relation.target.table, "CASCADE"),
+        },
+    }
+
+
+def plan_migration(previous, current):
+    """Returns the SQL statements that turn the previous snapshot into the current one.
+
+    Dropped tables and columns are only reported in comments, never dropped, so a
+    schema edit cannot silently delete data.
+    """
+    statements = []
+    # Foreign keys go last, so they can reference tables created by the same migration.
+    constraints = []
+    old_tables = previous.get("tables", {})
+    new_tables = current["tables"]
+    statements.extend(_plan_types(previous.get("types", {}), current.get("types", {})))
+
+    for table, spec in new_tables.items():
+        old = old_tables.get(table)
+        if old is None:
+            statements.extend(_create_table(table, spec))
+            constraints.extend(_add_foreign_key(table, name, fk) for name, fk in spec.get("foreign_keys", {}).items())
+            continue
+
+        for column, sql_type in spec["columns"].items():
+            old_type = old["columns"].get(column)
+            if old_type is None:
+                statements.append(f"ALTER TABLE {table} ADD COLUMN {column} {sql_type};")
+            elif old_type != sql_type:
+                statements.append(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {sql_type} USING {column}::{sql_type};")
+        for column in old["columns"]:
+            if column not in spec["columns"]:
+                statements.append(f"-- {table}.{column} is no longer mapped; drop it manually if the data is not needed.")
+
+        sequence = spec.get("sequence")
+        if sequence and old.get("sequence") != sequence:
+            if not old.get("sequence") or old["sequence"]["name"] != sequence["name"]:
+                statements.append(f"CREATE SEQUENCE IF NOT EXISTS {sequence['name']} INCREMENT BY {sequence['increment']};")
+            else:
+                statements.append(f"ALTER SEQUENCE {sequence['name']} INCREMENT BY {sequence['increment']};")
+
+        for name, index in old["indexes"].items():
+            if spec["indexes"].get(name) != index:
+                statements.append(f"DROP INDEX IF EXISTS {name};")
+        for name, index in spec["indexes"].items():
+            if old["indexes"].get(name) != index:
+                statements.append(_create_index(table, name, index))
+
+        old_keys = old.get("foreign_keys", {})
+        new_keys = spec.get("foreign_keys", {})
+        for name, fk in old_keys.items():
+            if new_keys.get(name) != fk:
+                statements.append(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name};")
+        for name, fk in new_keys.items():
+            if old_keys.get(name) != fk:
+                constraints.append(_add_foreign_key(table, name, fk))
+
+    for table in old_tables:
+        if table not in new_tables:
+            statements.append(f"-- Table {table} is no longer mapped; drop it manually if the data is not needed.")
+    return statements + constraints
+
+
+def _plan_types(old_types, new_types):
+    statements = []
+    for name, values in new_types.items():
+        old_values = old_types.get(name)
+        if old_values is None:
+            labels = ", ".join(f"'{value}'" for value in values)
+            statements.append(f"CREATE TYPE {name} AS ENUM ({labels});")
+            continue
+        # PostgreSQL can add enum labels but not remove or reorder them.
+        for value in values:
+            if value not in old_values:
+                statements.append(f"ALTER TYPE {name} ADD VALUE IF NOT EXISTS '{value}';")
+        for value in old_values:
+            if value not in values:
+                statements.append(f"-- {name} no longer uses '{value}'; rows holding it must be migrated manually.")
+    for name in old_types:
+        if name not in new_types:
+            statements.append(f"-- Type {name} is no longer used; drop it manually once no column refers to it.")
+    return statements
+
+
+def next_version(migration_path):
+    """The version after the highest V<n>__*.sql already in migration_path."""
+    versions = [0]
+    if os.path.isdir(migration_path):
+        for filename in os.listdir(migration_path):
+            match = re.match(r"V(\d+)__.*\.sql$", filename)
+            if match:
+                versions.append(int(match.group(1)))
+    return max(versions) + 1
+
+
+def load_snapshot(output, backend_path):
+    try:
+        return json.loads(output.read(os.path.join(backend_path, SNAPSHOT_FILE)))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"tables": {}}
+
+
+def _create_table(table, spec):
+    primary_key = spec.get("primary_key")
+    columns = []
+    for column, sql_type in spec["columns"].items():
+        suffix = " PRIMARY KEY" if column == "id" and not primary_key else ""
+        columns.append(f"    {column} {sql_type}{suffix}")
+    if primary_key:
+        columns.append(f"    PRIMARY KEY ({', '.join(primary_key)})")
+    columns_sql = ",\n".join(columns)
+    statements = []
+    sequence = spec.get("sequence")
+    if sequence:
+        statements.append(f"CREATE SEQUENCE IF NOT EXISTS {sequence['name']} INCREMENT BY {sequence['increment']};")
+    statements.append(f"CREATE TABLE {table} (\n{columns_sql}\n);")
+    for name, index in spec["indexes"].items():
+        statements.append(_create_index(table, name, index))
+    return statements
+
+
+def _add_foreign_key(table, name, fk):
+    on_delete = f" ON DELETE {fk['on_delete']}" if fk.get("on_delete") else ""
+    return f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({fk['column']}) REFERENCES {fk['references']} (id){on_delete};"
+
+
+def _create_index(table, name, index):
+    unique = "UNIQUE " if index["unique"] else ""
+    return f"CREATE {unique}INDEX IF NOT EXISTS {name} ON {table} ({', '.join(index['columns'])});"
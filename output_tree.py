@@ -0,0 +1,168 @@
+import hashlib
+import io
+import os
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from instrumentation import recorder
+
+# Directories of the scaffolded projects that never go into an archive.
+ARCHIVE_EXCLUDES = {"node_modules", ".dart_tool", ".git", ".angular"}
+
+
+class OutputTree:
+    """In-memory tree of the files rendered by the generators.
+
+    Generators write into the tree instead of the disk; flush() then writes
+    everything in one pass, creating each directory once and replacing files
+    atomically (temp file + rename). write_archive() packs the tree into a
+    zip or tar file instead, without writing the rendered files to disk.
+    """
+
+    def __init__(self, root_dir, manifest=None):
+        self.root_dir = root_dir
+        self.manifest = manifest
+        self.files = {}
+        self.modes = {}
+        self._lock = threading.Lock()
+
+    def write(self, path, content, mode=None):
+        """Stages content for path; a later write to the same path replaces it."""
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        path = os.path.normpath(path)
+        with self._lock:
+            self.files[path] = data
+            if mode is not None:
+                self.modes[path] = mode
+        if self.manifest is not None:
+            self.manifest.track(path)
+
+    def read(self, path):
+        """Returns the staged content of path, or the file on disk if nothing is staged."""
+        with self._lock:
+            data = self.files.get(os.path.normpath(path))
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        return data.decode("utf-8")
+
+    def exists(self, path):
+        with self._lock:
+            staged = os.path.normpath(path) in self.files
+        return staged or os.path.exists(path)
+
+    def flush(self):
+        """Writes the staged files that differ from the disk; returns how many were written."""
+        with self._lock:
+            files = sorted(self.files.items())
+            modes = dict(self.modes)
+            self.files = {}
+            self.modes = {}
+
+        written = 0
+        with recorder.span("output.flush", category="io", files=len(files)) as fields:
+            for directory in sorted({os.path.dirname(path) or "." for path, _ in files}):
+                os.makedirs(directory, exist_ok=True)
+            for path, data in files:
+                digest = hashlib.sha256(data).hexdigest()
+                if not self._is_current(path, data, digest):
+                    self._replace(path, data, modes.get(path))
+                    written += 1
+                if self.manifest is not None:
+                    self.manifest.record(path, digest, len(data))
+            fields["written"] = written
+        self._log(f"Flushed {len(files)} files, {written} changed.")
+        return written
+
+    def write_archive(self, archive_path):
+        """Packs the project into a .zip, .tar, .tar.gz or .tgz file.
+
+        Files produced by the scaffolding tools are read from the disk; the staged
+        files take precedence over them.
+        """
+        with self._lock:
+            files = dict(self.files)
+            modes = dict(self.modes)
+        for path in self._disk_files():
+            if path not in files:
+                files[path] = None
+
+        prefix = os.path.basename(os.path.normpath(self.root_dir))
+        entries = []
+        for path in sorted(files):
+            arcname = os.path.join(prefix, os.path.relpath(path, self.root_dir)).replace(os.sep, "/")
+            entries.append((arcname, path, files[path], modes.get(path)))
+
+        with recorder.span("output.archive", category="io", files=len(entries)):
+            if archive_path.endswith(".zip"):
+                self._write_zip(archive_path, entries)
+            elif archive_path.endswith((".tar.gz", ".tgz")):
+                self._write_tar(archive_path, entries, "w:gz")
+            elif archive_path.endswith(".tar"):
+                self._write_tar(archive_path, entries, "w")
+            else:
+                raise ValueError(f"Unsupported archive format: {archive_path}")
+        self._log(f"Wrote {len(entries)} files to {archive_path}")
+        return len(entries)
+
+    def _is_current(self, path, data, digest):
+        if self.manifest is not None and self.manifest.is_recorded(path, digest, len(data)):
+            return True
+        try:
+            if os.path.getsize(path) != len(data):
+                return False
+            with open(path, "rb") as f:
+                return f.read() == data
+        except OSError:
+            return False
+
+    def _replace(self, path, data, mode):
+        directory = os.path.dirname(path) or "."
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.chmod(tmp_path, mode if mode is not None else 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _disk_files(self):
+        manifest_name = self.manifest.FILE_NAME if self.manifest is not None else None
+        for dirpath, dirnames, filenames in os.walk(self.root_dir):
+            dirnames[:] = [d for d in dirnames if d not in ARCHIVE_EXCLUDES]
+            for filename in filenames:
+                if filename != manifest_name:
+                    yield os.path.normpath(os.path.join(dirpath, filename))
+
+    def _write_zip(self, archive_path, entries):
+        now = time.localtime()[:6]
+        with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for arcname, path, data, mode in entries:
+                if data is None:
+                    archive.write(path, arcname)
+                    continue
+                info = zipfile.ZipInfo(arcname, date_time=now)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = ((mode or 0o644) & 0o777) << 16
+                archive.writestr(info, data)
+
+    def _write_tar(self, archive_path, entries, tar_mode):
+        now = time.time()
+        with tarfile.open(archive_path, tar_mode) as archive:
+            for arcname, path, data, mode in entries:
+                if data is None:
+                    archive.add(path, arcname, recursive=False)
+                    continue
+                info = tarfile.TarInfo(arcname)
+                info.size = len(data)
+                info.mode = mode or 0o644
+                info.mtime = now
+                archive.addfile(info, io.BytesIO(data))
+
+    def _log(self, message):
+        print(f"[OutputTree] {message}")
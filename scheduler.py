@@ -0,0 +1,111 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from instrumentation import recorder
+
+
+class Step:
+    def __init__(self, name, func, depends_on=()):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+
+
+class StepScheduler:
+    """Runs generator steps on a thread pool, honouring declared dependencies.
+
+    Independent steps (Angular scaffold, Spring starter, Flutter create) run
+    concurrently, so the total wall-clock time is the longest dependency chain
+    rather than the sum of all steps.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 4)
+        self.steps = {}
+
+    def add(self, name, func, depends_on=()):
+        if name in self.steps:
+            raise ValueError(f"Step '{name}' is already registered.")
+        self.steps[name] = Step(name, func, depends_on)
+        return self
+
+    def run(self):
+        """Executes all steps and returns the names in completion order.
+
+        If a step fails, its dependents are skipped, the remaining independent
+        steps are allowed to finish and the first error is re-raised.
+        """
+        self._validate()
+
+        remaining = {name: set(step.depends_on) for name, step in self.steps.items()}
+        completed = []
+        failed = {}
+        skipped = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            running = {}
+
+            def submit_ready():
+                # Skips can cascade down a chain, so resolve until nothing changes.
+                changed = True
+                while changed:
+                    changed = False
+                    for name in list(remaining):
+                        deps = remaining[name]
+                        if deps & (set(failed) | set(skipped)):
+                            del remaining[name]
+                            skipped.append(name)
+                            changed = True
+                            self._log(f"Skipping '{name}' (a dependency failed).")
+                        elif not deps:
+                            del remaining[name]
+                            self._log(f"Starting '{name}'...")
+                            running[pool.submit(self._run_step, self.steps[name])] = name
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        failed[name] = error
+                        self._log(f"Step '{name}' failed: {error}")
+                        continue
+                    completed.append(name)
+                    self._log(f"Finished '{name}'.")
+                    for deps in remaining.values():
+                        deps.discard(name)
+                submit_ready()
+
+        if failed:
+            raise next(iter(failed.values()))
+        return completed
+
+    def _run_step(self, step):
+        with recorder.step(step.name):
+            return step.func()
+
+    def _validate(self):
+        for step in self.steps.values():
+            for dep in step.depends_on:
+                if dep not in self.steps:
+                    raise ValueError(f"Step '{step.name}' depends on unknown step '{dep}'.")
+
+        # Kahn's algorithm: anything left over is part of a cycle.
+        indegree = {name: len(step.depends_on) for name, step in self.steps.items()}
+        ready = [name for name, count in indegree.items() if count == 0]
+        visited = 0
+        while ready:
+            current = ready.pop()
+            visited += 1
+            for step in self.steps.values():
+                if current in step.depends_on:
+                    indegree[step.name] -= 1
+                    if indegree[step.name] == 0:
+                        ready.append(step.name)
+        if visited != len(self.steps):
+            cycle = sorted(name for name, count in indegree.items() if count > 0)
+            raise ValueError(f"Dependency cycle between steps: {', '.join(cycle)}")
+
+    def _log(self, message):
+        print(f"[StepScheduler] {message}")
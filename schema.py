@@ -0,0 +1,476 @@
+import hashlib
+import json
+import re
+
+
+class ColumnType:
+    """How a logical column type is stored in PostgreSQL and exchanged by each target.
+
+    dart_parse turns the decoded JSON value into the Dart type ({value} is the
+    expression); input is the kind of form control the Angular component uses.
+    """
+
+    __slots__ = ("java", "java_import", "sql", "ts", "dart", "dart_parse", "input")
+
+    def __init__(self, java, sql, ts, dart, java_import=None, dart_parse="{value}", input="text"):
+        self.java = java
+        self.java_import = java_import
+        self.sql = sql
+        self.ts = ts
+        self.dart = dart
+        self.dart_parse = dart_parse
+        self.input = input
+
+
+# "number" predates the sized integer types and stays a BIGINT so existing schemas keep their columns.
+COLUMN_TYPES = {
+    "string": ColumnType("String", "VARCHAR(255)", "string", "String"),
+    "text": ColumnType("String", "TEXT", "string", "String"),
+    "number": ColumnType("Long", "BIGINT", "number", "int", input="number"),
+    "long": ColumnType("Long", "BIGINT", "number", "int", input="number"),
+    "int": ColumnType("Integer", "INTEGER", "number", "int", input="number"),
+    "smallint": ColumnType("Short", "SMALLINT", "number", "int", input="number"),
+    "decimal": ColumnType("BigDecimal", "NUMERIC({precision}, {scale})", "number", "double",
+                          "java.math.BigDecimal", "({value} as num).toDouble()", "decimal"),
+    "boolean": ColumnType("Boolean", "BOOLEAN", "boolean", "bool", input="checkbox"),
+    "date": ColumnType("LocalDate", "DATE", "string", "DateTime",
+                       "java.time.LocalDate", "DateTime.parse({value})", "date"),
+    "datetime": ColumnType("Instant", "TIMESTAMPTZ", "string", "DateTime",
+                           "java.time.Instant", "DateTime.parse({value})", "datetime-local"),
+    "uuid": ColumnType("UUID", "UUID", "string", "String", "java.util.UUID"),
+    "json": ColumnType("Map<String, Object>", "JSONB", "Record<string, unknown>", "Map<String, dynamic>",
+                       "java.util.Map", input="json"),
+    # Java and SQL types of enums depend on the entity; see Column.
+    "enum": ColumnType(None, None, None, "String", input="select"),
+}
+
+ENUM_STORAGE = ("postgres", "ordinal")
+DEFAULT_DECIMAL = {"precision": 19, "scale": 2}
+
+# Settings of entities with "cache": true; an object overrides single values.
+DEFAULT_CACHE = {"ttl_seconds": 600, "max_size": 10000, "http_max_age": 0}
+
+# Cache and performance settings where 0 is meaningful: no expiry/max-age, no Hikari timeout,
+# no idle connections, no server-side prepares. Every other size or count must be at least 1.
+ZERO_ALLOWED_SETTINGS = ("ttl_seconds", "http_max_age", "min_idle", "connection_timeout_ms",
+                         "idle_timeout_ms", "max_lifetime_ms", "prepare_threshold")
+
+# PostgreSQL truncates identifiers longer than this.
+MAX_IDENTIFIER_LENGTH = 63
+
+# Page sizes of the generated list endpoints, unless an entity sets "pagination".
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+RELATION_TYPES = ("many-to-one", "one-to-many", "many-to-many")
+
+# Router preloading of the lazy entity routes; "selective" preloads entities with "preload": true.
+PRELOADING_STRATEGIES = ("none", "all", "selective")
+
+
+def sql_identifier(name):
+    """Spring Boot's default naming strategy maps camelCase fields to snake_case columns."""
+    return re.sub(r"(?<=[a-z0-9])([A-Z])", r"_\1", name).lower()
+
+
+class SchemaError(ValueError):
+    """Raised when entities.json or project.json is malformed."""
+
+
+class Column:
+    """A column of an entity, with the names and types every target needs precomputed."""
+
+    __slots__ = ("name", "type", "capitalized", "upper", "is_id", "java_type", "java_import", "ts_type", "dart_type",
+                 "dart_parse", "input", "sql_name", "sql_type", "precision", "scale", "enum_values", "enum_storage",
+                 "sortable", "filterable", "indexed", "unique", "raw")
+
+    def __init__(self, raw, entity_name):
+        self.raw = raw
+        self.name = raw["name"]
+        self.type = raw.get("type", "string")
+        self.capitalized = self.name[0].upper() + self.name[1:]
+        self.upper = self.name.upper()
+        self.is_id = self.name.lower() == "id"
+        column_type = COLUMN_TYPES[self.type]
+        self.java_type = column_type.java
+        self.java_import = column_type.java_import
+        self.ts_type = column_type.ts
+        self.dart_type = column_type.dart
+        self.dart_parse = column_type.dart_parse
+        self.input = column_type.input
+        self.sql_name = sql_identifier(self.name)
+        self.sql_type = column_type.sql
+        self.precision = self.scale = None
+        self.enum_values = self.enum_storage = None
+        if self.type == "decimal":
+            self.precision = raw.get("precision", DEFAULT_DECIMAL["precision"])
+            self.scale = raw.get("scale", DEFAULT_DECIMAL["scale"])
+            self.sql_type = self.sql_type.format(precision=self.precision, scale=self.scale)
+        elif self.type == "enum":
+            self.enum_values = raw["values"]
+            self.enum_storage = raw.get("storage", "postgres")
+            # The Java enum lives in the model package, e.g. ProductStatus.
+            self.java_type = f"{entity_name}{self.capitalized}"
+            self.ts_type = " | ".join(f"'{value}'" for value in self.enum_values)
+            # Ordinals fit a SMALLINT; a PostgreSQL enum stores 4 bytes but keeps the names readable.
+            self.sql_type = "SMALLINT" if self.enum_storage == "ordinal" else f"{entity_name.lower()}_{self.sql_name}"
+        self.unique = raw.get("unique", False)
+        self.indexed = raw.get("indexed", False) or self.unique
+        self.sortable = raw.get("sortable", self.type != "json")
+        self.filterable = raw.get("filterable", not self.is_id and self.type != "json")
+
+    @property
+    def is_pg_enum(self):
+        return self.type == "enum" and self.enum_storage == "postgres"
+
+    def __repr__(self):
+        return f"Column({self.name!r}, {self.type!r})"
+
+
+class Relation:
+    """An association to another entity; the target is resolved once all entities are parsed."""
+
+    __slots__ = ("name", "type", "capitalized", "target_name", "target", "mapped_by", "id_field",
+                 "join_column", "join_table", "owner_column", "inverse_column", "raw")
+
+    def __init__(self, raw, owner):
+        self.raw = raw
+        self.name = raw["name"]
+        self.type = raw["type"]
+        self.capitalized = self.name[0].upper() + self.name[1:]
+        self.target_name = raw["target"]
+        self.target = None
+        self.mapped_by = raw.get("mapped_by")
+        # The DTOs carry ids only: "category" -> categoryId, "tags" -> tagIds.
+        if self.type == "many-to-one":
+            self.id_field = f"{self.name}Id"
+        else:
+            self.id_field = f"{self.name[:-1] if self.name.endswith('s') else self.name}Ids"
+        self.join_column = f"{sql_identifier(self.name)}_id" if self.type == "many-to-one" else None
+        self.join_table = f"{owner.table}_{sql_identifier(self.name)}" if self.type == "many-to-many" else None
+        self.owner_column = f"{owner.lower}_id"
+        self.inverse_column = None
+
+    def resolve(self, target):
+        self.target = target
+        if self.type == "many-to-many":
+            self.inverse_column = f"{target.lower}_id"
+            if self.inverse_column == self.owner_column:
+                self.inverse_column = f"{sql_identifier(self.name)}_id"
+
+    def __repr__(self):
+        return f"Relation({self.name!r}, {self.type!r}, {self.target_name!r})"
+
+
+class Index:
+    """A database index on one or more columns of an entity's table."""
+
+    __slots__ = ("name", "columns", "unique")
+
+    def __init__(self, table, columns, unique=False, name=None):
+        self.columns = columns
+        self.unique = unique
+        self.name = name or index_name("uq" if unique else "idx", table, columns)
+
+    def __repr__(self):
+        return f"Index({self.name!r}, {self.columns!r}, unique={self.unique})"
+
+
+def index_name(prefix, table, columns):
+    name = "_".join([prefix, table, *columns])
+    if len(name) > MAX_IDENTIFIER_LENGTH:
+        digest = hashlib.sha256(name.encode("utf-8")).hexdigest()[:8]
+        name = f"{name[:MAX_IDENTIFIER_LENGTH - 9]}_{digest}"
+    return name
+
+
+class Entity:
+    """An entity from entities.json, parsed once and shared by every generator."""
+
+    __slots__ = ("name", "lower", "capitalized", "upper", "plural", "table", "columns", "relations", "indexes",
+                 "summary", "page_size", "max_page_size", "keyset", "cache", "client_cache_seconds", "preload", "raw")
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.name = raw["name"]
+        self.lower = self.name.lower()
+        self.capitalized = self.name.capitalize()
+        self.upper = self.name.upper()
+        self.plural = f"{self.lower}s"
+        self.table = self.plural
+        self.columns = [Column(col, self.name) for col in raw["columns"]]
+        self.relations = [Relation(relation, self) for relation in raw.get("relations", [])]
+        self.indexes = self._build_indexes(raw.get("indexes", []))
+        # Columns of the /summary projection besides the id; None when the entity declares none.
+        summary = raw.get("summary")
+        self.summary = None
+        if summary is not None:
+            self.summary = [col for col in self.columns if col.name in summary and not col.is_id]
+        pagination = raw.get("pagination", {})
+        self.page_size = pagination.get("default_size", DEFAULT_PAGE_SIZE)
+        self.max_page_size = pagination.get("max_size", MAX_PAGE_SIZE)
+        self.keyset = pagination.get("keyset", False)
+        self.preload = raw.get("preload", False)
+        self.client_cache_seconds = raw.get("client_cache_seconds", 0)
+        cache = raw.get("cache", False)
+        self.cache = None
+        if cache:
+            self.cache = dict(DEFAULT_CACHE)
+            if isinstance(cache, dict):
+                self.cache.update(cache)
+
+    def _build_indexes(self, composite):
+        by_name = {col.name: col for col in self.columns}
+        indexes = [Index(self.table, [col.sql_name], col.unique) for col in self.columns if col.indexed and not col.is_id]
+        # PostgreSQL does not index foreign keys by itself.
+        indexes.extend(Index(self.table, [relation.join_column]) for relation in self.many_to_one_relations)
+        for spec in composite:
+            columns = [by_name[name].sql_name for name in spec["columns"]]
+            indexes.append(Index(self.table, columns, spec.get("unique", False), spec.get("name")))
+        return indexes
+
+    @property
+    def sortable_columns(self):
+        # The id is the default sort and the keyset cursor, so it is always sortable.
+        return [col for col in self.columns if col.sortable or col.is_id]
+
+    @property
+    def filterable_columns(self):
+        return [col for col in self.columns if col.filterable]
+
+    @property
+    def many_to_one_relations(self):
+        return [relation for relation in self.relations if relation.type == "many-to-one"]
+
+    @property
+    def many_to_many_relations(self):
+        return [relation for relation in self.relations if relation.type == "many-to-many"]
+
+    def __repr__(self):
+        return f"Entity({self.name!r})"
+
+
+class Schema:
+    __slots__ = ("entities",)
+
+    def __init__(self, entities):
+        self.entities = entities
+
+    def get(self, name):
+        for entity in self.entities:
+            if entity.name == name:
+                return entity
+        return None
+
+
+def load_schema(entities_file):
+    """Reads and validates entities.json, returning a Schema."""
+    with open(entities_file, "r") as f:
+        data = json.load(f)
+    return parse_schema(data, source=entities_file)
+
+
+def parse_schema(data, source="entities.json"):
+    if not isinstance(data, dict) or not isinstance(data.get("entities"), list):
+        raise SchemaError(f"{source}: expected an object with an 'entities' list.")
+
+    seen = set()
+    entities = []
+    for index, raw in enumerate(data["entities"]):
+        where = f"{source}: entities[{index}]"
+        if not isinstance(raw, dict):
+            raise SchemaError(f"{where} must be an object.")
+        name = raw.get("name")
+        if not isinstance(name, str) or not name.isidentifier():
+            raise SchemaError(f"{where} has an invalid name: {name!r}.")
+        if name.lower() in seen:
+            raise SchemaError(f"{where}: duplicate entity '{name}'.")
+        seen.add(name.lower())
+
+        columns = raw.get("columns")
+        if not isinstance(columns, list) or not columns:
+            raise SchemaError(f"{where} ('{name}') needs a non-empty 'columns' list.")
+        column_names = set()
+        for col_index, col in enumerate(columns):
+            col_where = f"{where}.columns[{col_index}]"
+            if not isinstance(col, dict):
+                raise SchemaError(f"{col_where} must be an object.")
+            col_name = col.get("name")
+            if not isinstance(col_name, str) or not col_name.isidentifier():
+                raise SchemaError(f"{col_where} has an invalid name: {col_name!r}.")
+            if col_name == "version":
+                raise SchemaError(f"{col_where}: 'version' is reserved for the optimistic-locking column.")
+            if col_name in column_names:
+                raise SchemaError(f"{col_where}: duplicate column '{col_name}' in '{name}'.")
+            column_names.add(col_name)
+            _validate_column_type(col, col_where)
+            for flag in ("sortable", "filterable", "indexed", "unique"):
+                if not isinstance(col.get(flag, True), bool):
+                    raise SchemaError(f"{col_where}: '{flag}' must be true or false.")
+
+        _validate_pagination(raw.get("pagination", {}), where)
+        _validate_indexes(raw.get("indexes", []), column_names, where)
+        _validate_cache(raw.get("cache", False), where)
+        _validate_relations(raw.get("relations", []), column_names, where)
+        _validate_summary(raw.get("summary"), column_names, where)
+        if not isinstance(raw.get("preload", False), bool):
+            raise SchemaError(f"{where}: 'preload' must be true or false.")
+        client_cache_seconds = raw.get("client_cache_seconds", 0)
+        if not isinstance(client_cache_seconds, int) or isinstance(client_cache_seconds, bool) or client_cache_seconds < 0:
+            raise SchemaError(f"{where}: 'client_cache_seconds' must be a non-negative integer.")
+
+        entities.append(Entity(raw))
+
+    schema = Schema(entities)
+    _resolve_relations(schema, source)
+    return schema
+
+
+def _validate_column_type(col, where):
+    col_type = col.get("type", "string")
+    if not isinstance(col_type, str) or col_type not in COLUMN_TYPES:
+        raise SchemaError(f"{where}: unknown type {col_type!r}; expected one of {', '.join(COLUMN_TYPES)}.")
+    if col["name"].lower() == "id" and col_type not in ("number", "long"):
+        raise SchemaError(f"{where}: the id column is always a 'number'.")
+    if col_type == "json" and (col.get("sortable") or col.get("filterable") or col.get("indexed") or col.get("unique")):
+        raise SchemaError(f"{where}: a json column cannot be sortable, filterable or indexed.")
+    if col_type == "decimal":
+        precision = col.get("precision", DEFAULT_DECIMAL["precision"])
+        scale = col.get("scale", DEFAULT_DECIMAL["scale"])
+        for key, value in (("precision", precision), ("scale", scale)):
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise SchemaError(f"{where}: '{key}' must be a non-negative integer.")
+        if not 0 < precision <= 1000 or scale > precision:
+            raise SchemaError(f"{where}: 'precision' must be 1-1000 and at least 'scale'.")
+    if col_type == "enum":
+        values = col.get("values")
+        if not isinstance(values, list) or not values or len(set(values)) != len(values):
+            raise SchemaError(f"{where}: an enum needs a non-empty list of distinct 'values'.")
+        for value in values:
+            if not isinstance(value, str) or not value.isidentifier():
+                raise SchemaError(f"{where}: enum value {value!r} is not a valid identifier.")
+        if col.get("storage", "postgres") not in ENUM_STORAGE:
+            raise SchemaError(f"{where}: 'storage' must be one of {', '.join(ENUM_STORAGE)}.")
+
+
+def _validate_pagination(pagination, where):
+    if not isinstance(pagination, dict):
+        raise SchemaError(f"{where}: 'pagination' must be an object.")
+    for key in ("default_size", "max_size"):
+        value = pagination.get(key, 1)
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            raise SchemaError(f"{where}: 'pagination.{key}' must be a positive integer.")
+    if pagination.get("default_size", DEFAULT_PAGE_SIZE) > pagination.get("max_size", MAX_PAGE_SIZE):
+        raise SchemaError(f"{where}: 'pagination.default_size' is larger than 'pagination.max_size'.")
+    if not isinstance(pagination.get("keyset", False), bool):
+        raise SchemaError(f"{where}: 'pagination.keyset' must be true or false.")
+
+
+def _validate_indexes(indexes, column_names, where):
+    if not isinstance(indexes, list):
+        raise SchemaError(f"{where}: 'indexes' must be a list.")
+    for index_pos, spec in enumerate(indexes):
+        index_where = f"{where}.indexes[{index_pos}]"
+        if not isinstance(spec, dict) or not isinstance(spec.get("columns"), list) or not spec["columns"]:
+            raise SchemaError(f"{index_where} needs a non-empty 'columns' list.")
+        for name in spec["columns"]:
+            if name not in column_names:
+                raise SchemaError(f"{index_where}: unknown column {name!r}.")
+        if not isinstance(spec.get("unique", False), bool):
+            raise SchemaError(f"{index_where}: 'unique' must be true or false.")
+        name = spec.get("name")
+        if name is not None and (not isinstance(name, str) or not name.isidentifier()):
+            raise SchemaError(f"{index_where} has an invalid name: {name!r}.")
+
+
+def _validate_relations(relations, column_names, where):
+    if not isinstance(relations, list):
+        raise SchemaError(f"{where}: 'relations' must be a list.")
+    field_names = {name.lower() for name in column_names} | {"id", "version"}
+    for relation_pos, spec in enumerate(relations):
+        relation_where = f"{where}.relations[{relation_pos}]"
+        if not isinstance(spec, dict):
+            raise SchemaError(f"{relation_where} must be an object.")
+        name = spec.get("name")
+        if not isinstance(name, str) or not name.isidentifier():
+            raise SchemaError(f"{relation_where} has an invalid name: {name!r}.")
+        if name.lower() in field_names:
+            raise SchemaError(f"{relation_where}: '{name}' is already used by a column or another relation.")
+        field_names.add(name.lower())
+        if spec.get("type") == "many-to-one" and f"{name}id".lower() in {column.lower() for column in column_names}:
+            raise SchemaError(f"{relation_where}: the column '{name}Id' clashes with the relation's id field.")
+        if spec.get("type") not in RELATION_TYPES:
+            raise SchemaError(f"{relation_where}: 'type' must be one of {', '.join(RELATION_TYPES)}.")
+        if not isinstance(spec.get("target"), str):
+            raise SchemaError(f"{relation_where} needs a 'target' entity.")
+        if spec["type"] == "one-to-many" and not isinstance(spec.get("mapped_by"), str):
+            raise SchemaError(f"{relation_where}: a one-to-many relation needs 'mapped_by'.")
+
+
+def _resolve_relations(schema, source):
+    for entity in schema.entities:
+        for relation in entity.relations:
+            where = f"{source}: {entity.name}.{relation.name}"
+            target = schema.get(relation.target_name)
+            if target is None:
+                raise SchemaError(f"{where}: unknown target entity {relation.target_name!r}.")
+            if relation.type == "one-to-many":
+                back = next((r for r in target.relations if r.name == relation.mapped_by), None)
+                if back is None or back.type != "many-to-one" or back.target_name != entity.name:
+                    raise SchemaError(f"{where}: 'mapped_by' must name a many-to-one relation of "
+                                      f"{target.name} that points back to {entity.name}.")
+            relation.resolve(target)
+
+
+def _validate_summary(summary, column_names, where):
+    if summary is None:
+        return
+    if not isinstance(summary, list) or not summary:
+        raise SchemaError(f"{where}: 'summary' must be a non-empty list of column names.")
+    for name in summary:
+        if name not in column_names:
+            raise SchemaError(f"{where}: unknown summary column {name!r}.")
+
+
+def _validate_cache(cache, where):
+    if isinstance(cache, bool):
+        return
+    if not isinstance(cache, dict):
+        raise SchemaError(f"{where}: 'cache' must be true, false or an object.")
+    for key, value in cache.items():
+        if key not in DEFAULT_CACHE:
+            raise SchemaError(f"{where}: unknown cache setting {key!r}.")
+        _validate_setting(value, f"{where}: 'cache.{key}'", key)
+
+
+def _validate_setting(value, label, key):
+    minimum = 0 if key in ZERO_ALLOWED_SETTINGS else 1
+    if not isinstance(value, int) or isinstance(value, bool) or value < minimum:
+        raise SchemaError(f"{label} must be a {'non-negative' if minimum == 0 else 'positive'} integer.")
+
+
+def load_project_config(project_file):
+    """Reads project.json and returns its 'project' section."""
+    with open(project_file, "r") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get("project"), dict):
+        raise SchemaError(f"{project_file}: expected an object with a 'project' section.")
+
+    config = data["project"]
+    for key in ("name", "app", "backend", "frontend", "backend_package", "mobile_app"):
+        if not isinstance(config.get(key), str) or not config[key]:
+            raise SchemaError(f"{project_file}: 'project.{key}' is required.")
+
+    if config.get("preloading", "none") not in PRELOADING_STRATEGIES:
+        raise SchemaError(f"{project_file}: 'project.preloading' must be one of {', '.join(PRELOADING_STRATEGIES)}.")
+
+    performance = config.get("performance", {})
+    if not isinstance(performance, dict):
+        raise SchemaError(f"{project_file}: 'project.performance' must be an object.")
+    for key, value in performance.items():
+        if key == "virtual_threads":
+            if not isinstance(value, bool):
+                raise SchemaError(f"{project_file}: 'project.performance.virtual_threads' must be true or false.")
+            continue
+        _validate_setting(value, f"{project_file}: 'project.performance.{key}'", key)
+    return config
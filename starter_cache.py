@@ -0,0 +1,267 @@
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import urllib.error
+import urllib.request
+import zipfile
+
+STARTER_URL = "https://start.spring.io/starter.zip"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "generate-code", "spring-starters")
+
+SPRING_BOOT_VERSION = "3.2.5"
+JAVA_VERSION = "21"
+
+# Maven coordinates used by the fallback skeleton for each Initializr dependency id.
+# Entries are (groupId, artifactId, scope, optional).
+FALLBACK_DEPENDENCIES = {
+    "web": ("org.springframework.boot", "spring-boot-starter-web", None, False),
+    "data-jpa": ("org.springframework.boot", "spring-boot-starter-data-jpa", None, False),
+    "postgresql": ("org.postgresql", "postgresql", "runtime", False),
+    "lombok": ("org.projectlombok", "lombok", None, True),
+    "actuator": ("org.springframework.boot", "spring-boot-starter-actuator", None, False),
+    "prometheus": ("io.micrometer", "micrometer-registry-prometheus", "runtime", False),
+    "flyway": ("org.flywaydb", "flyway-core", None, False),
+    "cache": ("org.springframework.boot", "spring-boot-starter-cache", None, False),
+    # Not Initializr ids; only ever added to an existing pom.xml.
+    "caffeine": ("com.github.ben-manes.caffeine", "caffeine", None, False),
+    "caffeine-jcache": ("com.github.ben-manes.caffeine", "jcache", None, False),
+    "hibernate-jcache": ("org.hibernate.orm", "hibernate-jcache", None, False),
+    # Flyway 10 moved PostgreSQL support out of flyway-core; on Flyway 9 the module is empty.
+    "flyway-postgresql": ("org.flywaydb", "flyway-database-postgresql", None, False),
+}
+
+
+class SpringStarterCache:
+    """Content-addressed cache of Spring Initializr starter archives.
+
+    Archives are stored once under ``objects/<sha256>.zip``; ``index.json`` maps
+    a key derived from the project type and dependency list to the archive hash.
+    """
+
+    def __init__(self, cache_dir=None, offline=False, timeout=60):
+        self.cache_dir = cache_dir or os.environ.get("GENERATOR_STARTER_CACHE") or DEFAULT_CACHE_DIR
+        self.offline = offline
+        self.timeout = timeout
+
+    @classmethod
+    def from_config(cls, project_config):
+        return cls(
+            cache_dir=project_config.get("starter_cache_dir"),
+            offline=project_config.get("offline", False),
+        )
+
+    def cache_key(self, project_type, dependencies):
+        payload = json.dumps({"type": project_type, "dependencies": sorted(dependencies)}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, project_type, dependencies):
+        """Returns the cached archive bytes, or None on a cache miss."""
+        digest = self._read_index().get(self.cache_key(project_type, dependencies))
+        if digest is None:
+            return None
+
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            return None
+        with open(object_path, "rb") as f:
+            data = f.read()
+        if hashlib.sha256(data).hexdigest() != digest:
+            self._log(f"Ignoring corrupt cache entry {digest[:12]}.")
+            return None
+        return data
+
+    def put(self, project_type, dependencies, data):
+        digest = hashlib.sha256(data).hexdigest()
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            self._atomic_write(object_path, data)
+
+        index = self._read_index()
+        index[self.cache_key(project_type, dependencies)] = digest
+        self._atomic_write(self._index_path(), json.dumps(index, indent=2, sort_keys=True).encode("utf-8"))
+        return digest
+
+    def fetch(self, project_type, dependencies):
+        """Downloads a starter archive from start.spring.io and stores it in the cache."""
+        url = f"{STARTER_URL}?type={project_type}&dependencies={','.join(dependencies)}"
+        self._log(f"Downloading {url}")
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            data = response.read()
+        if not zipfile.is_zipfile(io.BytesIO(data)):
+            raise ValueError(f"start.spring.io did not return a zip archive for {url}")
+        self.put(project_type, dependencies, data)
+        return data
+
+    def load(self, project_type, dependencies, check=False):
+        """Returns the starter archive from the cache, downloading it unless offline.
+
+        Returns None when the archive is not cached and offline mode is on. A failed
+        download also returns None, or is raised with check=True.
+        """
+        data = self.get(project_type, dependencies)
+        if data is not None:
+            self._log("Using cached Spring starter archive.")
+            return data
+        if self.offline:
+            self._log("Offline mode and no cached starter archive.")
+            return None
+        try:
+            return self.fetch(project_type, dependencies)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            if check:
+                raise
+            self._log(f"Could not download the Spring starter: {e}")
+            return None
+
+    def extract(self, data, dest, output=None):
+        """Extracts a starter archive into dest, or into an OutputTree, without shelling out to unzip."""
+        dest_root = os.path.realpath(dest)
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            for member in archive.infolist():
+                target = os.path.realpath(os.path.join(dest_root, member.filename))
+                if os.path.commonpath([dest_root, target]) != dest_root:
+                    raise ValueError(f"Refusing to extract {member.filename} outside {dest}")
+                # zipfile drops the permission bits, which mvnw needs to stay executable.
+                mode = member.external_attr >> 16
+                if output is not None:
+                    if not member.is_dir():
+                        output.write(os.path.join(dest, member.filename), archive.read(member), mode & 0o777 or None)
+                    continue
+                archive.extract(member, dest_root)
+                if mode and not member.is_dir():
+                    os.chmod(target, mode & 0o777)
+
+    def _object_path(self, digest):
+        return os.path.join(self.cache_dir, "objects", f"{digest}.zip")
+
+    def _index_path(self):
+        return os.path.join(self.cache_dir, "index.json")
+
+    def _read_index(self):
+        try:
+            with open(self._index_path(), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _atomic_write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _log(self, message):
+        print(f"[SpringStarterCache] {message}")
+
+
+def dependency_xml(dep):
+    """The <dependency> element for a starter dependency id, or None if it is unknown."""
+    if dep not in FALLBACK_DEPENDENCIES:
+        print(f"[SpringStarterCache] No fallback coordinates for '{dep}', skipping it.")
+        return None
+    group_id, artifact_id, scope, optional = FALLBACK_DEPENDENCIES[dep]
+    lines = [
+        "        <dependency>",
+        f"            <groupId>{group_id}</groupId>",
+        f"            <artifactId>{artifact_id}</artifactId>",
+    ]
+    if scope:
+        lines.append(f"            <scope>{scope}</scope>")
+    if optional:
+        lines.append("            <optional>true</optional>")
+    lines.append("        </dependency>")
+    return "\n".join(lines)
+
+
+def add_missing_dependencies(pom_content, dependencies):
+    """Adds the dependencies a pom.xml from an older starter does not declare yet."""
+    missing = []
+    for dep in dependencies:
+        coordinates = FALLBACK_DEPENDENCIES.get(dep)
+        if coordinates and f"<artifactId>{coordinates[1]}</artifactId>" not in pom_content:
+            missing.append(dependency_xml(dep))
+    if not missing:
+        return pom_content
+    head, tail = pom_content.split("</dependencies>", 1)
+    return head.rstrip(" ") + "\n".join(missing) + "\n    </dependencies>" + tail
+
+
+def set_java_version(pom_content, version=JAVA_VERSION):
+    """Points an existing pom.xml at the Java version the generated code and Dockerfile use."""
+    return re.sub(r"<java\.version>[^<]*</java\.version>", f"<java.version>{version}</java.version>", pom_content)
+
+
+def write_fallback_skeleton(dest, dependencies, output=None):
+    """Writes a minimal Maven project equivalent to the Initializr starter, to disk or an OutputTree."""
+    dependency_blocks = [block for block in map(dependency_xml, dependencies) if block]
+    dependencies_xml = "\n".join(dependency_blocks)
+
+    pom_content = f"""<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+         xsi:schemaLocation="http://maven.apache.org/POM/4.0.0 https://maven.apache.org/xsd/maven-4.0.0.xsd">
+    <modelVersion>4.0.0</modelVersion>
+    <parent>
+        <groupId>org.springframework.boot</groupId>
+        <artifactId>spring-boot-starter-parent</artifactId>
+        <version>{SPRING_BOOT_VERSION}</version>
+        <relativePath/>
+    </parent>
+    <groupId>com.example</groupId>
+    <artifactId>demo</artifactId>
+    <version>0.0.1-SNAPSHOT</version>
+    <name>demo</name>
+    <properties>
+        <java.version>{JAVA_VERSION}</java.version>
+    </properties>
+    <dependencies>
+{dependencies_xml}
+        <dependency>
+            <groupId>org.springframework.boot</groupId>
+            <artifactId>spring-boot-starter-test</artifactId>
+            <scope>test</scope>
+        </dependency>
+    </dependencies>
+    <build>
+        <plugins>
+            <plugin>
+                <groupId>org.springframework.boot</groupId>
+                <artifactId>spring-boot-maven-plugin</artifactId>
+            </plugin>
+        </plugins>
+    </build>
+</project>
+"""
+
+    application_content = """package com.example.demo;
+
+import org.springframework.boot.SpringApplication;
+import org.springframework.boot.autoconfigure.SpringBootApplication;
+
+@SpringBootApplication
+public class DemoApplication {
+
+    public static void main(String[] args) {
+        SpringApplication.run(DemoApplication.class, args);
+    }
+}
+"""
+
+    java_path = os.path.join(dest, "src", "main", "java", "com", "example", "demo")
+    resources_path = os.path.join(dest, "src", "main", "resources")
+    files = {
+        os.path.join(dest, "pom.xml"): pom_content,
+        os.path.join(java_path, "DemoApplication.java"): application_content,
+        os.path.join(resources_path, "application.properties"): "spring.application.name=demo\n",
+    }
+
+    for path, content in files.items():
+        if output is not None:
+            output.write(path, content)
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
@@ -1,13 +1,168 @@
-import subprocess
+import asyncio
+import collections
 import os
+import signal
+import subprocess
+import time
+from instrumentation import recorder
+
+try:
+    import resource
+except ImportError:
+    # Windows has no resource module; commands then report no child CPU time.
+    resource = None
+
+# Only the last lines of each stream are kept; everything is echoed as it arrives.
+OUTPUT_TAIL_LINES = 200
+CHUNK_SIZE = 64 * 1024
+STREAM_LIMIT = 1024 * 1024
+
+class CommandResult:
+    """Outcome of an external command run through run_cmd."""
+
+    def __init__(self, cmd, returncode, stdout, stderr, duration, timed_out=False, stdout_bytes=0, stderr_bytes=0):
+        self.cmd = cmd
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.duration = duration
+        self.timed_out = timed_out
+        self.stdout_bytes = stdout_bytes
+        self.stderr_bytes = stderr_bytes
+
+    @property
+    def ok(self):
+        return self.returncode == 0 and not self.timed_out
+
+    def __repr__(self):
+        return f"CommandResult({self.cmd!r}, returncode={self.returncode}, timed_out={self.timed_out})"
+
+class CommandError(Exception):
+    def __init__(self, result):
+        reason = f"timed out after {result.duration:.1f}s" if result.timed_out else f"exited with {result.returncode}"
+        super().__init__(f"Command {reason}: {result.cmd}\n{result.stderr}")
+        self.result = result
+
+async def _pump(stream, tail, echo):
+    total = 0
+    pending = b""
+
+    def emit(line):
+        text = line.decode(errors="replace")
+        tail.append(text)
+        if echo:
+            print(text)
+
+    while True:
+        chunk = await stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            emit(line)
+        if len(pending) > STREAM_LIMIT:
+            # A single very long line (e.g. an npm progress bar); flush it as is.
+            emit(pending)
+            pending = b""
+    if pending:
+        emit(pending)
+    return total
+
+def _new_process_group():
+    """Popen arguments that start the command in its own process group."""
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+def _kill(process):
+    # The command runs in its own session, so this also stops npm/gradle child processes.
+    # Windows has no process groups to signal; only the shell itself is killed there.
+    try:
+        if os.name == "nt":
+            process.kill()
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+def _children_cpu():
+    """CPU time used by finished child processes, or None where it is not available."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+async def run_cmd_async(cmd, cwd=None, env=None, timeout=None, check=False, echo=True):
+    """Runs a shell command, streaming its output line by line.
+
+    The command is killed after `timeout` seconds. Failures are reported and,
+    with check=True, raised as CommandError.
+    """
+    if env:
+        env = {**os.environ, **env}
+    stdout_tail = collections.deque(maxlen=OUTPUT_TAIL_LINES)
+    stderr_tail = collections.deque(maxlen=OUTPUT_TAIL_LINES)
+    timed_out = False
+
+    with recorder.span(cmd, category="command", cwd=cwd) as fields:
+        # Child CPU time is process-wide, so it is approximate when commands overlap.
+        children_before = _children_cpu()
+        start = time.perf_counter()
+        process = await asyncio.create_subprocess_shell(
+            cmd, cwd=cwd, env=env, **_new_process_group(),
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        )
+        pumps = asyncio.gather(
+            _pump(process.stdout, stdout_tail, echo),
+            _pump(process.stderr, stderr_tail, echo),
+        )
+        try:
+            stdout_bytes, stderr_bytes = await asyncio.wait_for(asyncio.shield(pumps), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            _kill(process)
+            stdout_bytes, stderr_bytes = await pumps
+        await process.wait()
+        duration = time.perf_counter() - start
+        children_after = _children_cpu()
+
+        fields["exit_code"] = process.returncode
+        fields["timed_out"] = timed_out
+        fields["stdout_bytes"] = stdout_bytes
+        fields["stderr_bytes"] = stderr_bytes
+        if children_before is not None:
+            fields["child_cpu"] = children_after - children_before
+
+    result = CommandResult(
+        cmd, process.returncode, "\n".join(stdout_tail), "\n".join(stderr_tail), duration,
+        timed_out=timed_out, stdout_bytes=stdout_bytes, stderr_bytes=stderr_bytes,
+    )
+    if not result.ok:
+        error = CommandError(result)
+        if check:
+            raise error
+        print(error)
+    return result
+
+def run_cmd(cmd, cwd=None, env=None, timeout=None, check=False, echo=True):
+    """Synchronous wrapper around run_cmd_async, safe to call from worker threads."""
+    return asyncio.run(run_cmd_async(cmd, cwd=cwd, env=env, timeout=timeout, check=check, echo=echo))
+
+async def run_cmds_async(commands, limit=4):
+    """Runs several commands concurrently, at most `limit` at a time.
+
+    Each command is a shell string or a dict of run_cmd_async keyword arguments.
+    Results are returned in the order of `commands`.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run_one(command):
+        kwargs = {"cmd": command} if isinstance(command, str) else command
+        async with semaphore:
+            return await run_cmd_async(**kwargs)
+
+    return await asyncio.gather(*(run_one(command) for command in commands))
 
-def run_cmd(cmd, cwd=None):
-    process = subprocess.Popen(cmd, cwd=cwd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    stdout, stderr = process.communicate()
-    if process.returncode != 0:
-        # FIXME TODO
-        # raise Exception(f"Command failed: {cmd}\n{stderr.decode()}")
-        print(f"Command failed: {cmd}\n{stderr.decode()}")
-    else:
-        print(stdout.decode())
-    return stdout.decode()
\ No newline at end of file
+def run_cmds(commands, limit=4):
+    return asyncio.run(run_cmds_async(commands, limit=limit))